@@ -3,32 +3,120 @@
 Cell class for pathfinder
 """
 
+import itertools
+
+import numpy as np
 import pygame
 
-class Cell:
-    def __init__(self, pos, status, constants, istarget=False):
-        self.pos = pos
-        self.status = status
-        self.istarget = istarget  # CRITICAL: Only one cell should have this True!
-        
+# Status -> colour key; the target cell is coloured by its istarget flag
+STATUS_COLOURS = {
+    'blocked': 'BLOCK_COL',
+    'start': 'START_COL',
+    'path': 'PATH_COL',
+    'active': 'ACTIVE_COL',
+    'closed': 'CLOSED_COL',
+    'empty': 'EMPTY_COL'
+}
+ERROR_COL = (255, 0, 255)  # Magenta for unknown statuses
+
+# Colour keys in the order of the codes in GridTable.codes; unknown
+# statuses get ERROR_CODE, just past the end
+PALETTE = ['EMPTY_COL', 'BLOCK_COL', 'START_COL', 'TARGET_COL', 'ACTIVE_COL', 'CLOSED_COL', 'PATH_COL']
+PALETTE_CODES = {status: PALETTE.index(key) for status, key in STATUS_COLOURS.items()}
+TARGET_CODE = PALETTE.index('TARGET_COL')
+ERROR_CODE = len(PALETTE)
+
+# Grid versions are drawn from one counter, so no two grids share a version
+GRID_VERSIONS = itertools.count()
+
+class GridTable:
+    """Geometry, colours and cell lookup shared by every cell of a grid.
+
+    version changes whenever Cell.update blocks or unblocks a cell, so
+    anything derived from the walls (cached paths) can tell it is stale.
+    dirty is None, or a list collecting the rect of every cell drawn
+    since the owner last emptied it. codes is None, or a (Y, X) uint8
+    array of PALETTE indices that cells are drawn into instead of the
+    surface (see gridrender.py).
+    """
+    __slots__ = ('tile_size', 'margin', 'X', 'Y', 'colors', 'status_colors', 'cells', 'version',
+                 'dirty', 'codes')
+    
+    def __init__(self, constants, cells=None):
         self.tile_size = constants['TILESIZE']
+        self.margin = constants['MARGIN']
         self.X = constants['X']
         self.Y = constants['Y']
         self.colors = constants['COLORS']
+        self.status_colors = {status: self.colors[key] for status, key in STATUS_COLOURS.items()}
+        self.cells = cells
+        self.version = next(GRID_VERSIONS)
+        self.dirty = None
+        self.codes = None
+
+def grid_version(cells):
+    """Wall version of a cell grid (its GridTable.version)"""
+    return next(iter(cells.values())).table.version
 
-        # Screen geometry object        
-        margin = constants['MARGIN']
-        realx = pos[0] * constants['TILESIZE']
-        realy = pos[1] * constants['TILESIZE']
-        self.rect = pygame.Rect(realx + margin, realy + margin, 
-                               self.tile_size - 2*margin, self.tile_size - 2*margin)
+# The 8 moves between neighbouring cells, in get_neighbour_coords order;
+# MOVES adds their cost as get_distance_to charges it. DIRECTIONS[7 - k]
+# is the reverse of DIRECTIONS[k].
+DIRECTIONS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if not (dx == 0 == dy)]
+MOVES = [(dx, dy, 14 if dx and dy else 10) for dx, dy in DIRECTIONS]
+
+class Cell:
+    __slots__ = ('pos', 'status', 'istarget', 'table', '_neighbours',
+                 'parent', 'f_cost', 'h_cost', 'g_cost')
+    
+    def __init__(self, pos, status, constants, istarget=False, table=None):
+        self.pos = pos
+        self.status = status
+        self.istarget = istarget  # CRITICAL: Only one cell should have this True!
         
-        self.neighbours = None
+        # Geometry and colours come from a table shared by the whole grid
+        self.table = table if table is not None else GridTable(constants)
+        
+        self._neighbours = None
         self.parent = None
         
         self.f_cost = float('inf')
         self.h_cost = float('inf')
         self.g_cost = float('inf')
+    
+    @property
+    def tile_size(self):
+        return self.table.tile_size
+    
+    @property
+    def X(self):
+        return self.table.X
+    
+    @property
+    def Y(self):
+        return self.table.Y
+    
+    @property
+    def colors(self):
+        return self.table.colors
+    
+    @property
+    def rect(self):
+        """Screen geometry object, computed when drawing"""
+        table = self.table
+        size = table.tile_size
+        return pygame.Rect(self.pos[0] * size + table.margin, self.pos[1] * size + table.margin,
+                           size - 2*table.margin, size - 2*table.margin)
+    
+    @property
+    def neighbours(self):
+        """Neighbouring cells, looked up in the grid on first use"""
+        if self._neighbours is None and self.table.cells is not None:
+            self.add_neighbours(self.table.cells)
+        return self._neighbours
+    
+    @neighbours.setter
+    def neighbours(self, cells):
+        self._neighbours = cells
         
     def add_neighbours(self, cell_list):
         """Add neighboring cells"""
@@ -42,12 +130,10 @@ class Cell:
     def get_neighbour_coords(self):
         """Get coordinates of neighboring cells (8-directional)"""
         vectors = []
-        for dx in (-1, 0, 1):
-            for dy in (-1, 0, 1):
-                if not (dx == 0 == dy):
-                    neighbour = (self.pos[0] + dx, self.pos[1] + dy)
-                    if self.in_bounds(neighbour):
-                        vectors.append(neighbour)
+        for dx, dy in DIRECTIONS:
+            neighbour = (self.pos[0] + dx, self.pos[1] + dy)
+            if self.in_bounds(neighbour):
+                vectors.append(neighbour)
         return vectors
     
     def in_bounds(self, pos):
@@ -55,41 +141,46 @@ class Cell:
         return 0 <= pos[0] < self.X and 0 <= pos[1] < self.Y
 
     def update(self, new_status, surf):
-        """Update cell status and redraw"""
+        """Update cell status and redraw (headless when surf is None)"""
         if self.status != new_status:
+            if self.status == 'blocked' or new_status == 'blocked':
+                self.table.version = next(GRID_VERSIONS)
             self.status = new_status
-            self.draw_cell(surf)
+            if surf is not None:
+                self.draw_cell(surf)
         return
     
     def draw_cell(self, surf):
         """Draw the cell with appropriate color"""
-        # FIXED: Only use TARGET_COL if istarget is True
-        if self.istarget:
-            col = self.colors['TARGET_COL']
-        elif self.status == 'blocked':
-            col = self.colors['BLOCK_COL']
-        elif self.status == 'start':
-            col = self.colors['START_COL']
-        elif self.status == 'path':
-            col = self.colors['PATH_COL']
-        elif self.status == 'active':
-            col = self.colors['ACTIVE_COL']
-        elif self.status == 'closed':
-            col = self.colors['CLOSED_COL']
-        elif self.status == 'empty':
-            col = self.colors['EMPTY_COL']
+        table = self.table
+        if table.codes is not None:
+            # Array rendering: record the colour, the renderer repaints the whole tile
+            code = TARGET_CODE if self.istarget else PALETTE_CODES.get(self.status, ERROR_CODE)
+            table.codes[self.pos[1], self.pos[0]] = code
+            size = table.tile_size
+            rect = pygame.Rect(self.pos[0] * size, self.pos[1] * size, size, size)
         else:
-            col = (255, 0, 255)  # Magenta for error
-        
-        pygame.draw.rect(surf, col, self.rect, border_radius=2)
+            rect = self.rect
+            # FIXED: Only use TARGET_COL if istarget is True
+            if self.istarget:
+                col = self.colors['TARGET_COL']
+            else:
+                col = table.status_colors.get(self.status, ERROR_COL)
+            pygame.draw.rect(surf, col, rect, border_radius=2)
+        if table.dirty is not None:
+            table.dirty.append(rect)
         
         return
         
-    def get_h(self, goal_pos):
-        """Calculate heuristic cost to goal (Manhattan distance)"""
+    def get_h(self, goal_pos, heuristic=None):
+        """Calculate heuristic cost to goal (octile distance unless
+        a heuristic(pos, goal_pos) function is given)"""
+        if heuristic is not None:
+            self.h_cost = heuristic(self.pos, goal_pos)
+            return self.h_cost
         dx = abs(goal_pos[0] - self.pos[0])
         dy = abs(goal_pos[1] - self.pos[1])
-        self.h_cost = 10 * (dx + dy)
+        self.h_cost = 10 * max(dx, dy) + 4 * min(dx, dy)
         return self.h_cost
         
     def get_distance_to(self, other_cell):
@@ -123,16 +214,16 @@ class Cell:
         self.g_cost = float('inf')
 
 def make_grid(constants, surface=None):
-    """Create a grid of cells"""
+    """Create a grid of cells (neighbours are linked lazily on first use)"""
     cell_list = {}
+    table = GridTable(constants, cell_list)
     for x in range(constants['X']):
         for y in range(constants['Y']):
-            cell_list[(x, y)] = Cell((x, y), 'empty', constants)
+            pos = (x, y)
+            cell_list[pos] = Cell(pos, 'empty', constants, table=table)
     
-    # Build graph data structure
-    for cell in cell_list.values():
-        cell.add_neighbours(cell_list)
-        if surface:
+    if surface:
+        for cell in cell_list.values():
             cell.draw_cell(surface)
     
     return cell_list
@@ -143,4 +234,39 @@ def decorate_grid(surface, cell_list, obstacle_list):
         for pos in obstacle_list:
             if pos in cell_list:
                 cell_list[pos].update('blocked', surface)
-    return cell_list
\ No newline at end of file
+    return cell_list
+
+def blocked_array(cells):
+    """(Y, X) uint8 array of the walls, 1 where a cell is blocked"""
+    if hasattr(cells, 'walkable'):
+        return (~cells.walkable()).astype(np.uint8)  # ArrayGrid
+    table = next(iter(cells.values())).table
+    blocked = np.zeros((table.Y, table.X), dtype=np.uint8)
+    for (x, y), cell in cells.items():
+        if cell.status == 'blocked':
+            blocked[y, x] = 1
+    return blocked
+
+def save_grid(cells, path, start_pos, goal_pos):
+    """Save the walls, start and goal of a grid to an .npz file"""
+    np.savez_compressed(path, blocked=blocked_array(cells),
+                        start=np.array(start_pos), goal=np.array(goal_pos))
+
+def load_grid(cells, path, surface=None):
+    """Put the walls saved by save_grid into cells; returns (start_pos, goal_pos).
+
+    Only walls change: other statuses are left to the caller. Raises
+    ValueError if the file was saved from a grid of another size.
+    """
+    with np.load(path) as data:
+        blocked, start, goal = data['blocked'], data['start'], data['goal']
+    table = next(iter(cells.values())).table
+    if blocked.shape != (table.Y, table.X):
+        raise ValueError(f"{path} holds a {blocked.shape[1]}x{blocked.shape[0]} grid, "
+                         f"not {table.X}x{table.Y}")
+    for (x, y), cell in cells.items():
+        if blocked[y, x]:
+            cell.update('blocked', surface)
+        elif cell.status == 'blocked':
+            cell.update('empty', surface)
+    return tuple(start.tolist()), tuple(goal.tolist())
\ No newline at end of file
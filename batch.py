@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Multiprocess batch queries for pathfinder
+"""
+
+import itertools
+
+import numpy as np
+
+from Cell_2D import blocked_array, make_grid
+from connectivity import ComponentIndex
+from hierarchical import ClusterGraph
+from jpsplus import JumpTable
+from main import SearchResult, constants, solve
+from sharedgrid import walls_pool, worker_state
+
+def _setup_worker(blocked, algorithm, use_components):
+    """Build this process's own grid from the shared walls.
+
+    Searches repaint cell statuses, so every worker copies the walls into
+    a private make_grid dict instead of searching the shared array.
+    """
+    height, width = blocked.shape
+    grid = make_grid(dict(constants, X=width, Y=height))
+    for y, x in zip(*np.nonzero(blocked)):
+        grid[(int(x), int(y))].status = 'blocked'
+
+    options = {}
+    if use_components:
+        options['components'] = ComponentIndex(grid, width, height)
+    if "HPA*" in algorithm:
+        options['hierarchy'] = ClusterGraph(grid, width, height, constants['HPA_CLUSTER_SIZE'])
+    if "JPS+" in algorithm:
+        options['jump_table'] = JumpTable(grid, width, height)
+    return {'grid': grid, 'options': options}
+
+def _solve_chunk(task):
+    """Solve a chunk of queries; results go back as plain tuples"""
+    queries, algorithm, heuristic, options = task
+    grid = worker_state['grid']
+    options = dict(worker_state['options'], **options)
+    return [tuple(solve(grid, start, goal, algorithm, heuristic, **options)) for start, goal in queries]
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def solve_batch(cells, queries, algorithm="A* Search", heuristic=None, processes=None,
+                chunk_size=64, components=True, **options):
+    """Solve many (start, goal) queries on one grid with a process pool.
+
+    cells is a make_grid dict or ArrayGrid; only its walls are used. They
+    are published once through shared memory, and each worker builds its
+    own grid from them (plus a ComponentIndex unless components is False,
+    a ClusterGraph for HPA* and a JumpTable for JPS+), so tasks carry
+    only positions. heuristic must be a HEURISTICS name or a picklable
+    function; options go to solve(). Yields a SearchResult per query, in
+    input order.
+    """
+    with walls_pool(blocked_array(cells), _setup_worker, (algorithm, components), processes) as pool:
+        tasks = ((chunk, algorithm, heuristic, options) for chunk in _chunks(queries, chunk_size))
+        for results in pool.imap(_solve_chunk, tasks):
+            for result in results:
+                yield SearchResult(*result)
@@ -0,0 +1,550 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for pathfinder
+
+Usage: python benchmark.py [name ...]   (no name runs everything)
+"""
+
+import contextlib
+import gc
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from Cell_2D import blocked_array, make_grid
+from grid_array import make_array_grid
+from heuristics import HEURISTICS
+from hierarchical import ClusterGraph
+from connectivity import ComponentIndex
+from incremental import DStarLite
+from cache import PathCache
+from batch import solve_batch
+from flowfield import FlowField
+from landmarks import Landmarks
+from jpsplus import JumpTable
+from jumpscan import JumpScanner
+from wavefront import distance_map
+from goalbounds import GoalBounds
+from scheduler import SPEED_LEVELS, StepScheduler
+from main import MAZE_TYPES, MazeGenerator, PathfindingAlgorithms, SearchSession, constants, solve
+
+def grid_constants(width, height):
+    """Copy of the visualizer constants for a width x height grid"""
+    return dict(constants, X=width, Y=height)
+
+def measure(build):
+    """Return (seconds, bytes) to build an object; memory is what stays allocated"""
+    gc.collect()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, allocated
+
+def bench_grid(sizes=(100, 1000, 2000)):
+    """Memory and construction time of make_grid vs make_array_grid"""
+    print("Grid construction (time without tracing, memory still allocated)")
+    print(f"{'size':>11} {'backend':>8} {'time':>9} {'memory':>10} {'per cell':>9}")
+    for size in sizes:
+        c = grid_constants(size, size)
+        for name, build in (("cells", lambda: make_grid(c)), ("array", lambda: make_array_grid(c))):
+            elapsed, allocated = measure(build)
+            print(f"{size:>5}x{size:<5} {name:>8} {elapsed:>8.2f}s {allocated / 2**20:>8.1f}MB "
+                  f"{allocated / (size * size):>7.0f}B")
+
+def open_grid(size):
+    return make_grid(grid_constants(size, size))
+
+def random_obstacle_grid(size, density=0.3, seed=1):
+    """The "Random Obstacles" maze on a size x size grid"""
+    random.seed(seed)
+    grid = make_grid(grid_constants(size, size))
+    MazeGenerator.random_obstacles(grid, None, None, size, size, None, density)
+    return grid
+
+def prims_maze_grid(size, seed=1):
+    """The "Prim's Algorithm" maze on a size x size grid"""
+    random.seed(seed)
+    grid = make_grid(grid_constants(size, size))
+    MazeGenerator.prims_algorithm(grid, None, None, size, size, None)
+    return grid
+
+def cellular_grid(size, seed=1):
+    """The "Cellular Automata" maze on a size x size grid"""
+    random.seed(seed)
+    grid = make_grid(grid_constants(size, size))
+    MazeGenerator.cellular_automata(grid, None, None, size, size, None)
+    return grid
+
+def maze_grid(maze_type, size, seed=1):
+    """A MAZE_TYPES maze on a size x size grid, as generate_maze builds it"""
+    random.seed(seed)
+    grid = make_grid(grid_constants(size, size))
+    args = (grid, None, None, size, size, None)
+    if maze_type == "Recursive Division":
+        MazeGenerator.recursive_division(*args)
+    elif maze_type == "Prim's Algorithm":
+        MazeGenerator.prims_algorithm(*args)
+    elif maze_type == "Cellular Automata":
+        MazeGenerator.cellular_automata(*args, 4)
+    elif maze_type == "Spiral Maze":
+        MazeGenerator.spiral_maze(*args)
+    else:
+        # Random Obstacles, and the visualizer's fallback for the rest
+        MazeGenerator.random_obstacles(*args, 0.3)
+    return grid
+
+def random_queries(grid, count, seed=2):
+    """Random (start, goal) pairs of walkable cells"""
+    rng = random.Random(seed)
+    free = [pos for pos, cell in grid.items() if cell.status != 'blocked']
+    return [tuple(rng.sample(free, 2)) for _ in range(count)]
+
+def connected_queries(grid, count, seed=2):
+    """Random (start, goal) pairs inside the largest component"""
+    table = next(iter(grid.values())).table
+    index = ComponentIndex(grid, table.X, table.Y)
+    free = [pos for pos, cell in grid.items() if cell.status != 'blocked']
+    sizes = {}
+    for pos in free:
+        sizes[index.component(pos)] = sizes.get(index.component(pos), 0) + 1
+    largest = max(sizes, key=sizes.get)
+    free = [pos for pos in free if index.component(pos) == largest]
+    rng = random.Random(seed)
+    return [tuple(rng.sample(free, 2)) for _ in range(count)]
+
+def compare(grid, queries, algorithms, heuristic=None, **options):
+    """Print mean expansions and time per query for each algorithm.
+
+    An entry of algorithms may also be a (label, algorithm, heuristic) tuple,
+    optionally followed by a dict of extra solve() options; options go to
+    every solve().
+    """
+    baseline = None
+    for entry in algorithms:
+        if not isinstance(entry, tuple):
+            entry = (entry, entry, heuristic)
+        label, algorithm, h, *extra = entry
+        entry_options = dict(options, **extra[0]) if extra else options
+        expanded = elapsed = found = 0
+        for start, goal in queries:
+            result = solve(grid, start, goal, algorithm, h, **entry_options)
+            expanded += result.expanded
+            elapsed += result.time
+            found += bool(result.path)
+        if baseline is None:
+            baseline = (expanded, elapsed)
+        print(f"  {label:<28} expanded {expanded / len(queries):>9.1f} "
+              f"({expanded / max(1, baseline[0]):>5.2f}x)  time {elapsed * 1000 / len(queries):>8.2f}ms "
+              f"({elapsed / max(1e-9, baseline[1]):>5.2f}x)  found {found}/{len(queries)}")
+
+def bench_jps(size=200, count=50):
+    """Jump Point Search vs A* on open and Random Obstacles grids"""
+    for name, grid in (("open", open_grid(size)), ("Random Obstacles", random_obstacle_grid(size))):
+        elapsed, allocated = measure(lambda: JumpScanner(blocked_array(grid)))
+        print(f"Jump scanner: {name} {size}x{size}, built in {elapsed * 1000:.1f}ms "
+              f"({allocated / 2**20:.1f}MB), once per wall version")
+        queries = random_queries(grid, count)
+        for heuristic in ("Manhattan", "Octile"):
+            print(f"JPS vs A*: {name} {size}x{size}, {heuristic} heuristic, {count} queries")
+            compare(grid, queries, ["A* Search", "Jump Point Search"], heuristic)
+
+def bench_bidirectional(size=200, count=50):
+    """Bidirectional A* vs A* (both octile) on open, Random Obstacles and Prim's grids"""
+    for name, grid in (("open", open_grid(size)), ("Random Obstacles", random_obstacle_grid(size)),
+                       ("Prim's", prims_maze_grid(size))):
+        queries = random_queries(grid, count)
+        print(f"Bidirectional vs A*: {name} {size}x{size}, octile heuristic, {count} queries")
+        compare(grid, queries, ["A* Search", "Bidirectional Search"], "Octile")
+
+def bench_dial(size=200, count=20):
+    """Dial's bucket queue vs heap-based Dijkstra on open and Random Obstacles grids"""
+    for name, grid in (("open", open_grid(size)), ("Random Obstacles", random_obstacle_grid(size))):
+        queries = random_queries(grid, count)
+        print(f"Dial's vs Dijkstra: {name} {size}x{size}, {count} queries")
+        compare(grid, queries, ["Dijkstra's Algorithm", "Dial's Algorithm"])
+
+def bench_heuristics(size=200, count=50):
+    """A* with each registry heuristic (tabled) against octile computed per call"""
+    for name, grid in (("open", open_grid(size)), ("Random Obstacles", random_obstacle_grid(size))):
+        queries = random_queries(grid, count)
+        print(f"Heuristics: {name} {size}x{size}, A*, {count} queries")
+        compare(grid, queries, [("Octile, per call", "A* Search", PathfindingAlgorithms.octile_cost)] +
+                [(heuristic, "A* Search", heuristic) for heuristic in HEURISTICS])
+
+def bench_hpa(size=400, count=20, cluster_size=10):
+    """HPA* vs A* on a large Random Obstacles grid: build, update and query cost"""
+    grid = random_obstacle_grid(size)
+    elapsed, allocated = measure(lambda: ClusterGraph(grid, size, size, cluster_size))
+    hierarchy = ClusterGraph(grid, size, size, cluster_size)
+    nodes = sum(len(nodes) for nodes in hierarchy.nodes.values())
+    print(f"HPA*: Random Obstacles {size}x{size}, {cluster_size}x{cluster_size} clusters, "
+          f"{nodes} entrance nodes, built in {elapsed:.2f}s ({allocated / 2**20:.1f}MB)")
+
+    # Toggle single cells as handle_events does, restoring them afterwards
+    rng = random.Random(3)
+    toggled = [(rng.randrange(size), rng.randrange(size)) for _ in range(100)]
+    start = time.perf_counter()
+    for _ in range(2):
+        for pos in toggled:
+            cell = grid[pos]
+            cell.status = 'empty' if cell.status == 'blocked' else 'blocked'
+            hierarchy.update_cell(pos)
+    print(f"  single-cell update {(time.perf_counter() - start) * 1000 / 200:.2f}ms")
+
+    queries = random_queries(grid, count)
+    compare(grid, queries, ["A* Search", "HPA* Search"], hierarchy=hierarchy)
+    ratios = [solve(grid, s, g, "HPA* Search", hierarchy=hierarchy).cost / solve(grid, s, g).cost
+              for s, g in queries]
+    print(f"  HPA* path cost vs A*: mean {sum(ratios) / len(ratios):.3f}x, worst {max(ratios):.3f}x")
+
+def bench_components(size=200, count=40):
+    """Unreachable-goal detection with a ComponentIndex vs plain A*"""
+    for name, grid in (("Random Obstacles", random_obstacle_grid(size)), ("Cellular Automata", cellular_grid(size))):
+        elapsed, _ = measure(lambda: ComponentIndex(grid, size, size))
+        index = ComponentIndex(grid, size, size)
+        queries = random_queries(grid, count)
+        unreachable = sum(not index.connected(s, g) for s, g in queries)
+        print(f"Components: {name} {size}x{size}, {index.count()} components, built in "
+              f"{elapsed * 1000:.0f}ms; {unreachable}/{count} queries unreachable")
+
+        rng = random.Random(3)
+        free = [pos for pos, cell in grid.items() if cell.status != 'blocked']
+        toggled = rng.sample(free, 200)
+        start = time.perf_counter()
+        for status in ('blocked', 'empty'):
+            for pos in toggled:
+                grid[pos].status = status
+                index.update_cell(pos)
+        print(f"  block/unblock update {(time.perf_counter() - start) * 1000 / 400:.3f}ms")
+
+        compare(grid, queries, ["A* Search",
+                                ("A* Search + components", "A* Search", None, {'components': index})])
+
+def bench_dstar(size=200, edits=30):
+    """D* Lite replans vs fresh A* after blocking a cell on the current path"""
+    grid = random_obstacle_grid(size)
+    (start, goal), = random_queries(grid, 1, seed=5)
+    planner = DStarLite(grid, start, goal)
+    t0 = time.perf_counter()
+    path = planner.plan()
+    print(f"D* Lite: Random Obstacles {size}x{size}, initial plan {(time.perf_counter() - t0) * 1000:.1f}ms, "
+          f"{planner.expanded} expanded; then {edits} edits")
+
+    rng = random.Random(4)
+    replan_time = replan_expanded = astar_time = astar_expanded = 0
+    for _ in range(edits):
+        pos = rng.choice(path[1:-1])
+        grid[pos].status = 'blocked'
+        before = planner.expanded
+        t0 = time.perf_counter()
+        planner.update_cell(pos)
+        path = planner.plan()
+        replan_time += time.perf_counter() - t0
+        replan_expanded += planner.expanded - before
+        result = solve(grid, start, goal)
+        astar_time += result.time
+        astar_expanded += result.expanded
+        assert result.cost == sum(grid[a].get_distance_to(grid[b]) for a, b in zip(path, path[1:]))
+    print(f"  {'A* from scratch':<28} expanded {astar_expanded / edits:>9.1f}  time {astar_time * 1000 / edits:>8.2f}ms")
+    print(f"  {'D* Lite replan':<28} expanded {replan_expanded / edits:>9.1f}  time {replan_time * 1000 / edits:>8.2f}ms")
+
+def bench_cache(size=200, pool=40, count=400, edit_every=100):
+    """Repeated queries through a PathCache vs solving each one"""
+    grid = random_obstacle_grid(size)
+    rng = random.Random(6)
+    pairs = random_queries(grid, pool)
+    workload = [rng.choice(pairs) for _ in range(count)]
+    free = [pos for pos, cell in grid.items() if cell.status != 'blocked'
+            and pos not in {p for pair in pairs for p in pair}]
+    edits = rng.sample(free, count // edit_every)
+    print(f"Path cache: Random Obstacles {size}x{size}, {count} A* queries over {pool} pairs, "
+          f"a wall drawn every {edit_every}")
+
+    for label, budget in (("no cache", None), ("cache 4MB", 4 * 2**20), ("cache 64KB", 64 * 2**10)):
+        cache = PathCache(budget) if budget else None
+        for pos in edits:
+            grid[pos].update('empty', None)
+        t0 = time.perf_counter()
+        for i, (start, goal) in enumerate(workload):
+            if i and i % edit_every == 0:
+                grid[edits[i // edit_every - 1]].update('blocked', None)
+            solve(grid, start, goal, cache=cache)
+        elapsed = time.perf_counter() - t0
+        rate = f"hit rate {cache.hit_rate():.0%}, {len(cache)} entries, {cache.bytes / 1024:.0f}KB" if cache else ""
+        print(f"  {label:<28} time {elapsed * 1000 / count:>8.2f}ms per query  {rate}")
+
+def bench_batch(size=200, count=2000):
+    """Throughput of solve_batch with 1..cpu_count processes vs a plain loop"""
+    grid = random_obstacle_grid(size)
+    queries = random_queries(grid, count)
+    print(f"Batch: Random Obstacles {size}x{size}, {count} A* queries, {os.cpu_count()} CPUs")
+
+    t0 = time.perf_counter()
+    serial = [solve(grid, start, goal).cost for start, goal in queries]
+    baseline = time.perf_counter() - t0
+    print(f"  {'serial solve()':<28} {count / baseline:>8.0f} queries/s")
+    for processes in sorted({1, 2, os.cpu_count()}):
+        t0 = time.perf_counter()
+        costs = [result.cost for result in solve_batch(grid, queries, processes=processes)]
+        elapsed = time.perf_counter() - t0
+        assert costs == serial
+        print(f"  {f'solve_batch, {processes} processes':<28} {count / elapsed:>8.0f} queries/s "
+              f"({baseline / elapsed:>5.2f}x)")
+
+def bench_flowfield(size=200, agents=(10, 100, 1000)):
+    """One flow field shared by many agents vs one A* per agent"""
+    grid = random_obstacle_grid(size)
+    free = [pos for pos, cell in grid.items() if cell.status != 'blocked']
+    rng = random.Random(7)
+    goal = rng.choice(free)
+    t0 = time.perf_counter()
+    field = FlowField(grid, goal, size, size)
+    build = time.perf_counter() - t0
+    print(f"Flow field: Random Obstacles {size}x{size}, built in {build * 1000:.0f}ms")
+    for count in agents:
+        starts = [rng.choice(free) for _ in range(count)]
+        t0 = time.perf_counter()
+        paths = [field.path(start) for start in starts]
+        read = time.perf_counter() - t0
+        astar = 0
+        for start, path in zip(starts, paths):
+            result = solve(grid, start, goal)
+            astar += result.time
+            assert result.cost == field.cost(start)
+        print(f"  {count:>5} agents   A* {astar * 1000:>9.1f}ms   flow field {(build + read) * 1000:>8.1f}ms "
+              f"(build + {read * 1000:.1f}ms of path reads)")
+
+def bench_alt(size=100, count=30, landmarks=8):
+    """ALT landmarks vs octile A* on every MAZE_TYPES entry"""
+    print(f"ALT: {landmarks} landmarks, {size}x{size} grids, {count} queries each")
+    for maze_type in MAZE_TYPES:
+        grid = maze_grid(maze_type, size)
+        t0 = time.perf_counter()
+        alt = Landmarks(grid, size, size, landmarks)
+        build = time.perf_counter() - t0
+        print(f"{maze_type}: tables built in {build * 1000:.0f}ms")
+        compare(grid, connected_queries(grid, count), ["A* Search", ("A* Search + ALT", "A* Search", alt)])
+
+def bench_jpsplus(size=200, count=50, edits=20):
+    """JPS+ table lookups vs online jump scans"""
+    for name, grid in (("Random Obstacles", random_obstacle_grid(size)), ("Prim's Algorithm", prims_maze_grid(size))):
+        t0 = time.perf_counter()
+        table = JumpTable(grid, size, size)
+        build = time.perf_counter() - t0
+        rng = random.Random(8)
+        t0 = time.perf_counter()
+        for _ in range(edits):
+            pos = (rng.randrange(size), rng.randrange(size))
+            for status in ('empty', 'blocked') if grid[pos].status == 'blocked' else ('blocked', 'empty'):
+                grid[pos].status = status
+                table.update_cell(pos)
+        update = (time.perf_counter() - t0) / (2 * edits)
+        print(f"JPS+: {name} {size}x{size}, table {len(table.distances) * 2 / 2**20:.1f}MB built in "
+              f"{build * 1000:.0f}ms, single-cell update {update * 1000:.1f}ms")
+        compare(grid, random_queries(grid, count), ["Jump Point Search",
+                                                    ("JPS+ Search", "JPS+ Search", None, {'jump_table': table})])
+
+def bench_wavefront(size=200, count=20, map_sizes=(200, 1000)):
+    """Vectorized wavefront BFS vs one Python-level expansion at a time"""
+    grid = random_obstacle_grid(size)
+    print(f"Wavefront BFS: Random Obstacles {size}x{size}, {count} queries")
+    compare(grid, random_queries(grid, count), ["Breadth-First Search", "Wavefront BFS"])
+    print("Whole-grid distance maps, Random Obstacles")
+    for map_size in map_sizes:
+        grid = random_obstacle_grid(map_size)
+        start = next(pos for pos, cell in grid.items() if cell.status != 'blocked')
+        t0 = time.perf_counter()
+        layers = distance_map(grid, start, map_size, map_size)
+        elapsed = time.perf_counter() - t0
+        print(f"  {map_size:>5}x{map_size:<5} {elapsed * 1000:>8.1f}ms  {layers.max() + 1} layers, "
+              f"{(layers >= 0).sum()} cells reached")
+
+def bench_goalbounds(size=64, count=100, processes=None):
+    """A* with goal bounding vs plain A* (precompute on every core)"""
+    for name, grid in (("Random Obstacles", random_obstacle_grid(size)), ("Prim's Algorithm", prims_maze_grid(size))):
+        t0 = time.perf_counter()
+        bounds = GoalBounds(grid, size, size, processes=processes)
+        build = time.perf_counter() - t0
+        path = "bench.bounds.npz"
+        bounds.save(path)
+        stored = os.path.getsize(path)
+        os.remove(path)
+        print(f"Goal bounds: {name} {size}x{size}, {os.cpu_count()} processes, built in {build:.1f}s, "
+              f"{bounds.boxes.nbytes / 1024:.0f}KB ({stored / 1024:.0f}KB on disk)")
+        compare(grid, random_queries(grid, count), ["A* Search",
+                                                    ("A* Search + goal bounds", "A* Search", None, {'goal_bounds': bounds})])
+
+def render_frames(mode, width, height, tile, frames, algorithm):
+    """Mean seconds to present a frame of a search in one rendering mode.
+
+    Modes: "full" redraws every cell and flips, "dirty" presents dirty
+    rects of rect-drawn cells, "surfarray" dirty rects painted by
+    ArrayRenderer.
+    """
+    import pygame
+    from main import ALGORITHMS, PathfindingVisualizer
+
+    saved = dict(constants)
+    constants.update(X=width, Y=height, TILESIZE=tile, GOALPOS=(width - 2, height - 2),
+                     GRID_RENDERER='surfarray' if mode == "surfarray" else 'rects')
+    try:
+        random.seed(1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            visualizer = PathfindingVisualizer()
+            visualizer.generate_maze()
+            visualizer.draw_grid()
+            visualizer.current_algo_category_num = 0
+            visualizer.current_algorithm = ALGORITHMS["Basic"].index(algorithm)
+            visualizer.start_search()
+            elapsed = 0
+            for _ in range(frames):
+                visualizer.session.step()
+                visualizer.sidebar_dirty = True  # Stats change every step
+                t0 = time.perf_counter()
+                if mode == "full":
+                    for cell in visualizer.cells.values():
+                        cell.draw_cell(visualizer.grid_surf)
+                    visualizer.grid_table.dirty.clear()
+                    visualizer.screen.blit(visualizer.grid_surf, (visualizer.sidebar_width, 0))
+                    visualizer.draw_sidebar()
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(visualizer.draw_grid() + visualizer.draw_sidebar())
+                elapsed += time.perf_counter() - t0
+        pygame.quit()
+    finally:
+        constants.clear()
+        constants.update(saved)
+    return elapsed / frames
+
+def bench_render(grids=((200, 150, 5, 300, ("full", "dirty", "surfarray")),
+                        (1000, 1000, 1, 20, ("full", "surfarray")))):
+    """Frame time of each rendering mode during a Wavefront BFS (a layer of cells per frame)"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    labels = {"full": "redraw every cell + flip", "dirty": "dirty rects", "surfarray": "dirty rects, surfarray"}
+    for width, height, tile, frames, modes in grids:
+        print(f"Rendering: {width}x{height} grid, {tile}px tiles, {frames} Wavefront BFS frames")
+        baseline = None
+        for mode in modes:
+            seconds = render_frames(mode, width, height, tile, frames, "Wavefront BFS")
+            baseline = baseline or seconds
+            print(f"  {labels[mode]:<28} {seconds * 1000:>8.2f}ms per frame ({seconds / baseline:>5.2f}x)")
+
+def bench_sidebar(frames=300):
+    """Sidebar draw time per tab, with the stats changing every frame"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from main import PathfindingVisualizer
+
+    visualizer = PathfindingVisualizer()
+    print(f"Sidebar: {frames} frames per tab")
+    for tab, name in enumerate(visualizer.tabs):
+        visualizer.current_tab = tab
+        t0 = time.perf_counter()
+        for i in range(frames):
+            visualizer.stats['visited'] = i
+            visualizer.sidebar_dirty = True
+            visualizer.draw_sidebar()
+        print(f"  {name:<28} {(time.perf_counter() - t0) * 1000 / frames:>8.2f}ms per frame")
+    pygame.quit()
+
+def bench_scheduler(size=200, fps=60, seconds=1.0):
+    """Expansions per second at each speed level, stepping once per 1/fps frame"""
+    start, goal = random_queries(random_obstacle_grid(size), 1)[0]
+    print(f"Scheduler: Dijkstra on Random Obstacles {size}x{size}, {fps} frames/s, up to {seconds:.0f}s per level")
+    for label, mode, value in SPEED_LEVELS:
+        grid = random_obstacle_grid(size)
+        session = SearchSession(grid, start, goal, "Dijkstra's Algorithm")
+        scheduler = StepScheduler(mode, value)
+        frames = 0
+        t0 = time.perf_counter()
+        while not session.finished and time.perf_counter() - t0 < seconds:
+            frame_start = time.perf_counter()
+            scheduler.run(session.step)
+            frames += 1
+            time.sleep(max(0, 1 / fps - (time.perf_counter() - frame_start)))  # The rest of the frame
+        elapsed = time.perf_counter() - t0
+        print(f"  {label:<20} {session.expanded / elapsed:>9.0f} expansions/s over {frames:>3} frames"
+              f"{'  (finished)' if session.finished else ''}")
+
+def bench_worker(width=200, height=150, tile=5, fps=60, algorithm="Dijkstra's Algorithm"):
+    """Main-loop time per frame with the search in-process vs in a background worker"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from main import ALGORITHMS, PathfindingVisualizer
+
+    print(f"Search worker: {algorithm} on Random Obstacles {width}x{height}, speed "
+          f"{SPEED_LEVELS[-2][0]}, {os.cpu_count()} CPUs")
+    saved = dict(constants)
+    try:
+        for worker in (False, True):
+            constants.update(X=width, Y=height, TILESIZE=tile, GOALPOS=(width - 2, height - 2),
+                             SEARCH_SPEED=len(SPEED_LEVELS) - 2, SEARCH_WORKER=worker)
+            random.seed(1)
+            with contextlib.redirect_stdout(io.StringIO()):
+                visualizer = PathfindingVisualizer()
+                visualizer.generate_maze()
+                category = next(i for i, names in enumerate(ALGORITHMS.values()) if algorithm in names)
+                visualizer.current_algo_category_num = category
+                visualizer.current_algorithm = list(ALGORITHMS.values())[category].index(algorithm)
+                frames, busy, worst = 0, 0, 0
+                t0 = time.perf_counter()
+                visualizer.start_search()
+                while not visualizer.finished:
+                    frame_start = time.perf_counter()
+                    visualizer.handle_events()
+                    visualizer.update_search()
+                    pygame.display.update(visualizer.draw_grid() + visualizer.draw_sidebar())
+                    spent = time.perf_counter() - frame_start
+                    frames, busy, worst = frames + 1, busy + spent, max(worst, spent)
+                    time.sleep(max(0, 1 / fps - spent))
+                elapsed = time.perf_counter() - t0
+                expanded = visualizer.stats['visited']
+            pygame.quit()
+            label = "background worker" if worker else "in-process"
+            print(f"  {label:<20} {expanded} expanded in {elapsed:.2f}s, {frames} frames, main loop "
+                  f"{busy * 1000 / frames:.1f}ms per frame (worst {worst * 1000:.1f}ms)")
+    finally:
+        constants.clear()
+        constants.update(saved)
+
+BENCHMARKS = {
+    'grid': bench_grid,
+    'jps': bench_jps,
+    'bidirectional': bench_bidirectional,
+    'dial': bench_dial,
+    'heuristics': bench_heuristics,
+    'hpa': bench_hpa,
+    'components': bench_components,
+    'dstar': bench_dstar,
+    'cache': bench_cache,
+    'batch': bench_batch,
+    'flowfield': bench_flowfield,
+    'alt': bench_alt,
+    'jpsplus': bench_jpsplus,
+    'wavefront': bench_wavefront,
+    'goalbounds': bench_goalbounds,
+    'render': bench_render,
+    'sidebar': bench_sidebar,
+    'scheduler': bench_scheduler,
+    'worker': bench_worker,
+}
+
+def main(names):
+    for name in names or BENCHMARKS:
+        BENCHMARKS[name]()
+        print()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Path query cache for pathfinder
+"""
+
+import sys
+from collections import OrderedDict
+
+from heuristics import get_heuristic
+
+# Rough size of one entry besides its path: key tuple, result tuple, dict slot
+ENTRY_OVERHEAD = 400
+POSITION_SIZE = sys.getsizeof((0, 0)) + 8  # One path position and its list slot
+
+def entry_size(result):
+    """Approximate memory held by a cached result, in bytes"""
+    return ENTRY_OVERHEAD + POSITION_SIZE * len(result.path)
+
+class PathCache:
+    """Search results keyed by grid version, algorithm, heuristic and endpoints.
+
+    A changed grid gets a new version, so stale entries are never hit;
+    they just age out. Entries are evicted least recently used first
+    once their estimated size passes max_bytes.
+    """
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (result, size), oldest first
+
+    @staticmethod
+    def key(cells, algorithm, heuristic, start, goal):
+        """Cache key for a query on cells as they are now"""
+        # Registry heuristics are keyed by name, so None, 'Octile' and
+        # HEURISTICS['Octile'] share entries
+        heuristic = get_heuristic(heuristic)
+        heuristic = getattr(heuristic, 'name', heuristic)
+        return (cells[start].table.version, algorithm, heuristic, start, goal)
+
+    def get(self, key):
+        """The cached result for key, or None (counted as a hit or a miss)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, result):
+        """Store a result, evicting old entries to stay within max_bytes"""
+        size = entry_size(result)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (result, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self.bytes -= old_size
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def hit_rate(self):
+        """Fraction of lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Connected-component index for pathfinder
+"""
+
+from array import array
+from collections import deque
+
+from Cell_2D import DIRECTIONS, blocked_array
+
+# The 8 neighbours in ring order; ring neighbours and the orthogonal pairs
+# N-E, E-S, S-W, W-N are adjacent to each other
+RING = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+RING_LINKS = [(i, (i + 1) % 8) for i in range(8)] + [(0, 2), (2, 4), (4, 6), (6, 0)]
+
+class ComponentIndex:
+    """Component labels of the walkable cells, kept up to date on edits.
+
+    labels holds one entry per cell (index y * width + x): -1 for blocked
+    cells, otherwise a label whose union-find root names the component.
+    Unblocking a cell unions the components around it. Blocking one
+    checks whether its neighbours are still joined around it; if not,
+    breadth-first searches grow from each side in turn and the first side
+    to run out is the cut-off part, which alone gets a new label.
+    """
+    def __init__(self, cells, width, height):
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.labels = array('i', [-1]) * (width * height)
+        self._parent = array('i')  # Union-find over labels
+        self.rebuild()
+
+    def rebuild(self):
+        """Label every cell from scratch"""
+        width, height, labels = self.width, self.height, self.labels
+        walkable = (blocked_array(self.cells) == 0).ravel().tolist()
+        for i in range(width * height):
+            labels[i] = -1
+        self._parent = array('i')
+
+        for i in range(width * height):
+            if not walkable[i] or labels[i] >= 0:
+                continue
+            label = self._new_label()
+            labels[i] = label
+            queue = deque([i])
+            while queue:
+                j = queue.popleft()
+                x, y = j % width, j // width
+                for dx, dy in DIRECTIONS:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height:
+                        k = ny * width + nx
+                        if walkable[k] and labels[k] < 0:
+                            labels[k] = label
+                            queue.append(k)
+
+    def _new_label(self):
+        self._parent.append(len(self._parent))
+        return len(self._parent) - 1
+
+    def _find(self, label):
+        parent = self._parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def component(self, pos):
+        """Component id of the cell at pos, or None if it is blocked"""
+        label = self.labels[pos[1] * self.width + pos[0]]
+        return None if label < 0 else self._find(label)
+
+    def connected(self, a, b):
+        """True if a path can exist between positions a and b"""
+        component = self.component(a)
+        return component is not None and component == self.component(b)
+
+    def count(self):
+        """Number of components"""
+        return len({self._find(label) for label in self.labels if label >= 0})
+
+    def update_cell(self, pos):
+        """Bring the index in line after the cell at pos changed status"""
+        blocked = self.cells[pos].status == 'blocked'
+        if blocked and self.labels[pos[1] * self.width + pos[0]] >= 0:
+            self.block(pos)
+        elif not blocked and self.labels[pos[1] * self.width + pos[0]] < 0:
+            self.unblock(pos)
+
+    def _neighbours(self, pos):
+        """Indices of the walkable 8-neighbours of pos"""
+        x, y = pos
+        width, height, labels = self.width, self.height, self.labels
+        return [(y + dy) * width + x + dx for dx, dy in DIRECTIONS
+                if 0 <= x + dx < width and 0 <= y + dy < height
+                and labels[(y + dy) * width + x + dx] >= 0]
+
+    def unblock(self, pos):
+        """Join the cell at pos and the components around it"""
+        roots = {self._find(self.labels[i]) for i in self._neighbours(pos)}
+        label = roots.pop() if roots else self._new_label()
+        for root in roots:
+            self._parent[root] = label
+        self.labels[pos[1] * self.width + pos[0]] = label
+
+    def block(self, pos):
+        """Remove the cell at pos, splitting its component if it was a cut"""
+        x, y = pos
+        width, height, labels = self.width, self.height, self.labels
+        labels[y * width + x] = -1
+
+        # Sides: walkable ring cells joined without passing through pos
+        ring = [(x + dx, y + dy) for dx, dy in RING]
+        open_ring = [0 <= rx < width and 0 <= ry < height and labels[ry * width + rx] >= 0
+                     for rx, ry in ring]
+        side = list(range(8))
+        def find(i):
+            while side[i] != i:
+                i = side[i]
+            return i
+        for i, j in RING_LINKS:
+            if open_ring[i] and open_ring[j]:
+                side[find(i)] = find(j)
+        starts = {}
+        for i in range(8):
+            if open_ring[i]:
+                starts.setdefault(find(i), ring[i][1] * width + ring[i][0])
+        if len(starts) < 2:
+            return
+
+        # Grow every side one cell at a time until all but one are merged or sealed off
+        owner = {}  # cell index -> side
+        merged = {}  # side -> side it joined
+        frontiers = {}
+        regions = {}
+        for s, i in starts.items():
+            owner[i] = s
+            frontiers[s] = deque([i])
+            regions[s] = [i]
+        def root(s):
+            while s in merged:
+                s = merged[s]
+            return s
+        while len(frontiers) > 1:
+            for s in list(frontiers):
+                s = root(s)
+                if s not in frontiers:
+                    continue
+                if not frontiers[s]:
+                    # Sealed off: this side is a component of its own
+                    label = self._new_label()
+                    for i in regions[s]:
+                        labels[i] = label
+                    del frontiers[s]
+                    if len(frontiers) == 1:
+                        break
+                    continue
+                i = frontiers[s].popleft()
+                cx, cy = i % width, i // width
+                for dx, dy in DIRECTIONS:
+                    nx, ny = cx + dx, cy + dy
+                    if not (0 <= nx < width and 0 <= ny < height):
+                        continue
+                    k = ny * width + nx
+                    if labels[k] < 0:
+                        continue
+                    current = root(s)
+                    other = owner.get(k)
+                    if other is None:
+                        owner[k] = current
+                        frontiers[current].append(k)
+                        regions[current].append(k)
+                        continue
+                    other = root(other)
+                    if other != current:
+                        # Joined: fold the smaller side into the larger
+                        if len(regions[current]) < len(regions[other]):
+                            current, other = other, current
+                        frontiers[current].extend(frontiers.pop(other))
+                        regions[current].extend(regions.pop(other))
+                        merged[other] = current
+                if len(frontiers) == 1:
+                    break
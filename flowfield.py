@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Flow fields (one-to-all distances to a shared goal) for pathfinder
+"""
+
+import heapq
+
+import numpy as np
+
+from Cell_2D import MOVES, blocked_array, grid_version
+
+INF = float('inf')
+
+class FlowField:
+    """Distance to goal and next move for every cell, from one reverse Dijkstra.
+
+    distance is a (height, width) array of path costs to goal (inf where
+    the goal can't be reached) and direction the index into MOVES of the
+    first step from each cell (-1 at the goal and on unreachable cells).
+    Any number of agents sharing the goal then read their path off the
+    field with path(). version is the grid version the field was built
+    for; stale() tells when the walls have changed since.
+    """
+    def __init__(self, cells, goal, width, height):
+        self.cells = cells
+        self.goal = goal
+        self.width = width
+        self.height = height
+        self.version = grid_version(cells)
+        walkable = (blocked_array(cells) == 0).ravel().tolist()
+
+        # Costs are symmetric, so searching out from the goal gives every
+        # cell's distance to it; a cell's step is the reverse of the move
+        # that reached it
+        dist = [INF] * (width * height)
+        step = [-1] * (width * height)
+        origin = goal[1] * width + goal[0]
+        dist[origin] = 0
+        heap = [(0, origin)]
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > dist[i]:
+                continue
+            x, y = i % width, i // width
+            for k, (dx, dy, cost) in enumerate(MOVES):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    j = ny * width + nx
+                    if walkable[j] and d + cost < dist[j]:
+                        dist[j] = d + cost
+                        step[j] = 7 - k
+                        heapq.heappush(heap, (d + cost, j))
+
+        self._dist = dist
+        self._step = step
+        self.distance = np.array(dist).reshape(height, width)
+        self.direction = np.array(step, dtype=np.int8).reshape(height, width)
+
+    def stale(self):
+        """True if cells were blocked or unblocked after the field was built"""
+        return grid_version(self.cells) != self.version
+
+    def cost(self, pos):
+        return self._dist[pos[1] * self.width + pos[0]]
+
+    def next_step(self, pos):
+        """The neighbour to move to from pos, or None at the goal or if unreachable"""
+        k = self._step[pos[1] * self.width + pos[0]]
+        if k < 0:
+            return None
+        dx, dy, _ = MOVES[k]
+        return (pos[0] + dx, pos[1] + dy)
+
+    def path(self, start):
+        """Positions from start to the goal, or [] if the goal can't be reached"""
+        if self.cost(start) == INF:
+            return []
+        path = [start]
+        pos = self.next_step(start)
+        while pos is not None:
+            path.append(pos)
+            pos = self.next_step(pos)
+        return path
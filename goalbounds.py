@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Goal bounding for pathfinder
+
+Usage: python goalbounds.py [grid.npz] [processes]
+    Precompute the bounds of a grid saved by the visualizer (S key),
+    using every core unless processes is given.
+"""
+
+import heapq
+import os
+import sys
+import zlib
+from array import array
+
+import numpy as np
+
+from Cell_2D import DIRECTIONS, blocked_array, grid_version
+from landmarks import walls_checksum
+from sharedgrid import walls_pool, worker_state
+
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+
+def bounds_path(grid_path):
+    """File the goal bounds of a grid saved at grid_path are kept in"""
+    root, _ = os.path.splitext(grid_path)
+    return root + '.bounds.npz'
+
+def _setup_worker(blocked):
+    """Build this process's neighbour lists from the shared walls"""
+    height, width = blocked.shape
+    walkable = (blocked == 0).ravel().tolist()
+    neighbours = [[] for _ in range(width * height)]
+    for i in range(width * height):
+        if not walkable[i]:
+            continue
+        x, y = i % width, i // width
+        for k, (dx, dy) in enumerate(DIRECTIONS):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and walkable[ny * width + nx]:
+                neighbours[i].append((ny * width + nx, 14 if dx and dy else 10, k))
+    return {'neighbours': neighbours, 'width': width, 'height': height}
+
+def _source_bounds(source):
+    """(8, 4) boxes of one cell: Dijkstra from it, labelling cells by first move"""
+    neighbours, width = worker_state['neighbours'], worker_state['width']
+    size = len(neighbours)
+    dist = [float('inf')] * size
+    first = [-1] * size
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, i = heapq.heappop(heap)
+        if d > dist[i]:
+            continue
+        move = first[i]
+        for j, cost, k in neighbours[i]:
+            if d + cost < dist[j]:
+                dist[j] = d + cost
+                first[j] = k if i == source else move
+                heapq.heappush(heap, (d + cost, j))
+
+    first = np.array(first, dtype=np.int8)
+    xs = np.arange(size) % width
+    ys = np.arange(size) // width
+    boxes = np.array([[width, worker_state['height'], -1, -1]] * 8, dtype=np.int16)
+    for k in np.unique(first[first >= 0]):
+        mask = first == k
+        boxes[k] = xs[mask].min(), ys[mask].min(), xs[mask].max(), ys[mask].max()
+    return boxes
+
+def _solve_chunk(sources):
+    return sources, np.stack([_source_bounds(i) for i in sources]).tobytes()
+
+def compute_bounds(blocked, processes=None, chunk_size=32):
+    """(height, width, 8, 4) int16 goal bounding boxes of a walls array.
+
+    blocked is a (height, width) array, nonzero where a cell is blocked.
+    Box k of a cell is (min_x, min_y, max_x, max_y) of every goal whose
+    shortest path from that cell starts with DIRECTIONS[k]; empty boxes
+    have min > max. Every walkable cell needs a Dijkstra over the whole
+    grid, so the sources are spread over a process pool.
+    """
+    height, width = blocked.shape
+    boxes = np.empty((height * width, 8, 4), dtype=np.int16)
+    boxes[:] = (width, height, -1, -1)
+    sources = np.flatnonzero(blocked.ravel() == 0).tolist()
+    chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+
+    with walls_pool(blocked, _setup_worker, processes=processes) as pool:
+        for chunk, data in pool.imap_unordered(_solve_chunk, chunks):
+            boxes[chunk] = np.frombuffer(data, dtype=np.int16).reshape(-1, 8, 4)
+    return boxes.reshape(height, width, 8, 4)
+
+def save_bounds(path, boxes, checksum):
+    np.savez_compressed(path, boxes=boxes, checksum=checksum)
+
+class GoalBounds:
+    """Goal bounding boxes of every cell and move, for pruning best-first searches.
+
+    allows(pos, next_pos, goal_pos) is False when no goal of the step's
+    box is goal_pos, so no shortest path to it starts with that step.
+    Each box comes from its own cell's shortest-path tree, so following
+    allowed steps always keeps at least one optimal path and pruned
+    searches return optimal costs. The boxes are only valid for the
+    walls they were computed on: stale() tells when they no longer are.
+    """
+    def __init__(self, cells, width, height, boxes=None, processes=None):
+        self.cells = cells
+        self.width = width
+        self.height = height
+        if boxes is None:
+            boxes = compute_bounds(blocked_array(cells), processes)
+        self.boxes = boxes  # (height, width, 8, 4)
+        self._flat = array('h', boxes.astype(np.int16).tobytes())
+        self.version = grid_version(cells)
+
+    def stale(self):
+        """True if cells were blocked or unblocked after the boxes were computed"""
+        return grid_version(self.cells) != self.version
+
+    def allows(self, pos, next_pos, goal_pos):
+        x, y = pos
+        k = DIRECTION_INDEX[(next_pos[0] - x, next_pos[1] - y)]
+        i = ((y * self.width + x) * 8 + k) * 4
+        box = self._flat
+        return box[i] <= goal_pos[0] <= box[i + 2] and box[i + 1] <= goal_pos[1] <= box[i + 3]
+
+    def save(self, path):
+        """Save the boxes, tagged with the walls they were computed on"""
+        save_bounds(path, self.boxes, walls_checksum(self.cells))
+
+    @classmethod
+    def load(cls, path, cells, width, height):
+        """Boxes saved by save() or the command line, or None if missing or saved for other walls"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data['checksum']) != walls_checksum(cells) or \
+                    data['boxes'].shape[:2] != (height, width):
+                return None
+            boxes = data['boxes']
+        return cls(cells, width, height, boxes=boxes)
+
+def main(args):
+    grid_path = args[0] if args else 'grid.npz'
+    processes = int(args[1]) if len(args) > 1 else None
+    with np.load(grid_path) as data:
+        blocked = data['blocked']
+    boxes = compute_bounds(blocked, processes)
+    save_bounds(bounds_path(grid_path), boxes, zlib.crc32(blocked.astype(np.uint8).tobytes()))
+    print(f"Wrote {bounds_path(grid_path)}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Struct-of-arrays grid backend for pathfinder
+"""
+
+import numpy as np
+
+from Cell_2D import DIRECTIONS, Cell, GridTable
+
+# Cell statuses stored as small integer codes
+STATUSES = ('empty', 'blocked', 'start', 'target', 'active', 'closed', 'path')
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+BLOCKED = STATUS_CODES['blocked']
+
+class ArrayGrid:
+    """Grid state held in flat NumPy arrays indexed by ``y * X + x``.
+
+    status, g, h, f and parent replace the per-Cell attributes. The grid
+    behaves like the ``{(x, y): Cell}`` dict built by make_grid: indexing
+    it returns a CellView backed by the arrays, so the step functions,
+    maze generators and the visualizer run on it unchanged.
+    """
+    def __init__(self, constants, status=None):
+        self.X = constants['X']
+        self.Y = constants['Y']
+        self.size = self.X * self.Y
+        self.table = GridTable(constants)  # Shared geometry and colours
+
+        if status is None:
+            status = np.zeros(self.size, dtype=np.uint8)
+        self.status = status
+        self.g = np.full(self.size, np.inf)
+        self.h = np.full(self.size, np.inf)
+        self.f = np.full(self.size, np.inf)
+        self.parent = np.full(self.size, -1, dtype=np.int32)
+        self.target = -1  # Index of the single target cell
+
+    def index(self, pos):
+        return pos[1] * self.X + pos[0]
+
+    def pos(self, index):
+        return (index % self.X, index // self.X)
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.X and 0 <= pos[1] < self.Y
+
+    def neighbour_indices(self, index):
+        """Indices of the (up to 8) in-bounds neighbours of a cell"""
+        x, y = index % self.X, index // self.X
+        X, Y = self.X, self.Y
+        return [(y + dy) * X + x + dx for dx, dy in DIRECTIONS
+                if 0 <= x + dx < X and 0 <= y + dy < Y]
+
+    def walkable(self):
+        """Boolean (Y, X) array, True where the cell is not blocked"""
+        return (self.status != BLOCKED).reshape(self.Y, self.X)
+
+    def reset(self):
+        """Reset search costs and parents of every cell at once"""
+        self.g.fill(np.inf)
+        self.h.fill(np.inf)
+        self.f.fill(np.inf)
+        self.parent.fill(-1)
+
+    # Mapping interface, matching the make_grid dict
+    def __getitem__(self, pos):
+        if not self.in_bounds(pos):
+            raise KeyError(pos)
+        return CellView(self, pos[1] * self.X + pos[0])
+
+    def get(self, pos, default=None):
+        return self[pos] if self.in_bounds(pos) else default
+
+    def __contains__(self, pos):
+        return self.in_bounds(pos)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return ((x, y) for x in range(self.X) for y in range(self.Y))
+
+    keys = __iter__
+
+    def values(self):
+        return (CellView(self, y * self.X + x) for x in range(self.X) for y in range(self.Y))
+
+    def items(self):
+        return (((x, y), CellView(self, y * self.X + x))
+                for x in range(self.X) for y in range(self.Y))
+
+class CellView:
+    """Cell-compatible view of one entry of an ArrayGrid.
+
+    Views are created on demand and compare equal when they refer to the
+    same index, so they can be used in open and closed sets.
+    """
+    __slots__ = ('grid', 'index', 'pos')
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+        self.pos = (index % grid.X, index // grid.X)
+
+    def __eq__(self, other):
+        return (isinstance(other, CellView) and self.index == other.index
+                and self.grid is other.grid)
+
+    def __hash__(self):
+        return self.index
+
+    def __repr__(self):
+        return f"CellView({self.pos}, {self.status!r})"
+
+    @property
+    def status(self):
+        return STATUSES[self.grid.status[self.index]]
+
+    @status.setter
+    def status(self, value):
+        self.grid.status[self.index] = STATUS_CODES[value]
+
+    @property
+    def istarget(self):
+        return self.grid.target == self.index
+
+    @istarget.setter
+    def istarget(self, value):
+        if value:
+            self.grid.target = self.index
+        elif self.grid.target == self.index:
+            self.grid.target = -1
+
+    @property
+    def g_cost(self):
+        return float(self.grid.g[self.index])
+
+    @g_cost.setter
+    def g_cost(self, value):
+        self.grid.g[self.index] = value
+
+    @property
+    def h_cost(self):
+        return float(self.grid.h[self.index])
+
+    @h_cost.setter
+    def h_cost(self, value):
+        self.grid.h[self.index] = value
+
+    @property
+    def f_cost(self):
+        return float(self.grid.f[self.index])
+
+    @f_cost.setter
+    def f_cost(self, value):
+        self.grid.f[self.index] = value
+
+    @property
+    def parent(self):
+        parent = self.grid.parent[self.index]
+        return None if parent < 0 else CellView(self.grid, int(parent))
+
+    @parent.setter
+    def parent(self, cell):
+        self.grid.parent[self.index] = -1 if cell is None else cell.index
+
+    @property
+    def neighbours(self):
+        grid = self.grid
+        return [CellView(grid, j) for j in grid.neighbour_indices(self.index)]
+
+    @property
+    def table(self):
+        return self.grid.table
+
+    def add_neighbours(self, cell_list):
+        """Neighbours are derived from the grid; nothing to store"""
+        return
+
+    # Behaviour is shared with Cell
+    X = Cell.X
+    Y = Cell.Y
+    tile_size = Cell.tile_size
+    colors = Cell.colors
+    rect = Cell.rect
+    get_neighbour_coords = Cell.get_neighbour_coords
+    in_bounds = Cell.in_bounds
+    update = Cell.update
+    draw_cell = Cell.draw_cell
+    get_h = Cell.get_h
+    get_distance_to = Cell.get_distance_to
+    get_g = Cell.get_g
+    get_f = Cell.get_f
+    reset = Cell.reset
+
+def make_array_grid(constants, surface=None):
+    """Create an ArrayGrid, the array-backed counterpart of make_grid"""
+    grid = ArrayGrid(constants)
+    if surface:
+        for cell in grid.values():
+            cell.draw_cell(surface)
+    return grid
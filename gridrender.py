@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Array-to-surface grid rendering for pathfinder
+"""
+
+import numpy as np
+import pygame
+
+from Cell_2D import ERROR_COL, PALETTE
+
+# Marks the see-through cell interiors of the overlay; any colour other
+# than the background and grid lines will do
+OVERLAY_KEY = (1, 2, 3)
+
+class ArrayRenderer:
+    """Draws a grid's cells from a status-code array, a region per blit.
+
+    Switching it on gives the grid table a codes array, which Cell.draw_cell
+    then writes PALETTE indices into instead of drawing rects. draw()
+    maps a region of the array through the palette to RGB, makes it a
+    surface with pygame.surfarray, scales it up by the tile size and
+    covers it with an overlay of the margins and grid lines, prepared
+    once. Tiles too small to have a margin get no overlay.
+    """
+    def __init__(self, table, background, line_color):
+        self.table = table
+        table.codes = np.zeros((table.Y, table.X), dtype=np.uint8)
+        self.palette = np.array([table.colors[key] for key in PALETTE] + [ERROR_COL], dtype=np.uint8)
+        self.overlay = None
+        if table.tile_size > 2 * table.margin + 1:
+            self.overlay = self.make_overlay(background, line_color)
+
+    def make_overlay(self, background, line_color):
+        """Background, grid lines and rounded cell corners, as Cell.draw_cell leaves them"""
+        table = self.table
+        size = table.tile_size
+        width, height = table.X * size, table.Y * size
+        overlay = pygame.Surface((width, height))
+        overlay.fill(background)
+        for x in range(table.X + 1):
+            pygame.draw.line(overlay, line_color, (x * size, 0), (x * size, height))
+        for y in range(table.Y + 1):
+            pygame.draw.line(overlay, line_color, (0, y * size), (width, y * size))
+        inner = size - 2 * table.margin
+        for x in range(table.X):
+            for y in range(table.Y):
+                rect = (x * size + table.margin, y * size + table.margin, inner, inner)
+                pygame.draw.rect(overlay, OVERLAY_KEY, rect, border_radius=2)
+        overlay.set_colorkey(OVERLAY_KEY)
+        return overlay
+
+    def draw(self, surface, rect=None):
+        """Paint the cells under rect (in pixels; the whole grid if None); returns the area painted"""
+        table = self.table
+        size = table.tile_size
+        if rect is None:
+            x0, y0, x1, y1 = 0, 0, table.X, table.Y
+        else:
+            x0, y0 = max(0, rect.left // size), max(0, rect.top // size)
+            x1 = min(table.X, (rect.right - 1) // size + 1)
+            y1 = min(table.Y, (rect.bottom - 1) // size + 1)
+        area = pygame.Rect(x0 * size, y0 * size, (x1 - x0) * size, (y1 - y0) * size)
+        if not area.size[0] or not area.size[1]:
+            return area
+
+        # surfarray is indexed [x, y]
+        rgb = self.palette[table.codes[y0:y1, x0:x1].T]
+        cells = pygame.surfarray.make_surface(rgb)
+        surface.blit(pygame.transform.scale(cells, area.size), area)
+        if self.overlay is not None:
+            surface.blit(self.overlay, area, area)
+        return area
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Heuristic registry for pathfinder
+"""
+
+import numpy as np
+
+class Heuristic:
+    """A distance estimate built from a cost(dx, dy) formula.
+
+    cost only uses arithmetic and abs(), so the same formula scores one
+    cell from ints or a whole grid from NumPy arrays. Calling the
+    heuristic as heuristic(pos, goal_pos) matches the functions get_h
+    accepts; table() fills a goal-distance table in one vectorized pass.
+    """
+    def __init__(self, name, label, cost, admissible=True):
+        self.name = name
+        self.label = label  # Short name for the sidebar buttons
+        self.cost = cost
+        self.admissible = admissible  # Never overestimates 10/14 move costs
+
+    def __call__(self, pos, goal_pos):
+        return self.cost(abs(pos[0] - goal_pos[0]), abs(pos[1] - goal_pos[1]))
+
+    def table(self, goal_pos, width, height):
+        """(height, width) array of the estimate from every cell to goal_pos"""
+        dx = np.abs(np.arange(width) - goal_pos[0])[np.newaxis, :]
+        dy = np.abs(np.arange(height) - goal_pos[1])[:, np.newaxis]
+        return np.broadcast_to(self.cost(dx, dy), (height, width))
+
+    def lookup(self, width, height):
+        """heuristic(pos, goal_pos) function for one search on a width x height grid"""
+        return GoalTables(self, width, height)
+
+    def __repr__(self):
+        return f"Heuristic({self.name!r})"
+
+# min(dx, dy) and max(dx, dy) written as (dx + dy -/+ |dx - dy|) / 2
+HEURISTICS = {
+    'Manhattan': Heuristic('Manhattan', "Man", lambda dx, dy: 10 * (dx + dy), admissible=False),
+    'Octile': Heuristic('Octile', "Oct", lambda dx, dy: 7 * (dx + dy) + 3 * abs(dx - dy)),
+    # Straight-line distance at 14 per diagonal: at most octile, so admissible
+    'Euclidean': Heuristic('Euclidean', "Euc", lambda dx, dy: 7 * (2 * (dx * dx + dy * dy)) ** 0.5),
+    'Chebyshev': Heuristic('Chebyshev', "Cheb", lambda dx, dy: 5 * (dx + dy + abs(dx - dy))),
+    'Zero': Heuristic('Zero', "Zero", lambda dx, dy: 0 * dx),
+}
+DEFAULT_HEURISTIC = 'Octile'
+
+class GoalTables:
+    """heuristic(pos, goal_pos) answered from precomputed goal tables.
+
+    A table is computed with NumPy the first time a goal is asked for
+    (bidirectional search asks for two). Rows are converted to lists when
+    first read, so lookups stay plain Python indexing without holding a
+    list of boxed numbers for the whole grid.
+    """
+    def __init__(self, heuristic, width, height):
+        self.heuristic = heuristic
+        self.width = width
+        self.height = height
+        self._arrays = {}  # goal_pos -> (height, width) array
+        self._rows = {}  # goal_pos -> list of converted rows (None until read)
+
+    def __call__(self, pos, goal_pos):
+        rows = self._rows.get(goal_pos)
+        if rows is None:
+            rows = self.add_goal(goal_pos)
+        row = rows[pos[1]]
+        if row is None:
+            row = rows[pos[1]] = self._arrays[goal_pos][pos[1]].tolist()
+        return row[pos[0]]
+
+    def add_goal(self, goal_pos):
+        """Compute the table for goal_pos; returns its row list"""
+        self._arrays[goal_pos] = self.heuristic.table(goal_pos, self.width, self.height)
+        rows = self._rows[goal_pos] = [None] * self.height
+        return rows
+
+    def table(self, goal_pos):
+        """The full (height, width) array for goal_pos"""
+        if goal_pos not in self._arrays:
+            self.add_goal(goal_pos)
+        return self._arrays[goal_pos]
+
+def get_heuristic(heuristic=None):
+    """Look up a Heuristic by name; None gives the default.
+
+    Heuristic objects and plain heuristic(pos, goal_pos) functions are
+    returned unchanged.
+    """
+    if heuristic is None:
+        heuristic = DEFAULT_HEURISTIC
+    if isinstance(heuristic, str):
+        return HEURISTICS[heuristic]
+    return heuristic
+
+def goal_lookup(heuristic, width, height):
+    """heuristic(pos, goal_pos) function for a search on a width x height grid.
+
+    Heuristic objects give their lookup() (GoalTables for the registry
+    heuristics); plain functions are used as they are.
+    """
+    heuristic = get_heuristic(heuristic)
+    if isinstance(heuristic, Heuristic):
+        return heuristic.lookup(width, height)
+    return heuristic
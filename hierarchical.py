@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Hierarchical pathfinding (HPA*) abstraction for pathfinder
+"""
+
+import heapq
+from collections import defaultdict
+
+from Cell_2D import DIRECTIONS, MOVES
+
+
+# Border runs at least this long get an entrance at each end instead of one in the middle
+ENTRANCE_SPLIT = 6
+
+class ClusterGraph:
+    """Abstract graph of cluster entrances over a cell grid.
+
+    The grid is cut into cluster_size x cluster_size clusters. Wherever
+    walkable cells of two touching clusters are adjacent (diagonals and
+    cluster corners included) the crossings are grouped into runs and one
+    or two crossings per run become entrances: a node on each side joined
+    by an inter-cluster edge. Intra-cluster edges hold the shortest
+    distance between the nodes of one cluster, moving only inside it.
+    update_cell() rebuilds just the clusters one changed cell can affect.
+    """
+    def __init__(self, cells, width, height, cluster_size=10):
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.cluster_size = cluster_size
+        self.columns = -(-width // cluster_size)
+        self.rows = -(-height // cluster_size)
+
+        self.borders = {}  # (cluster, cluster) -> [(a, b)] entrance crossings
+        self.crossings = defaultdict(dict)  # pos -> {pos across a border: cost}
+        self.nodes = {}  # cluster -> set of node positions
+        self.intra = {}  # cluster -> {node: {node: cost}}
+
+        clusters = [(cx, cy) for cx in range(self.columns) for cy in range(self.rows)]
+        for cluster in clusters:
+            for other in self.adjacent_clusters(cluster):
+                if cluster < other:
+                    self._build_border(cluster, other)
+        for cluster in clusters:
+            self._collect_nodes(cluster)
+            self._build_intra(cluster)
+
+    def cluster_of(self, pos):
+        return (pos[0] // self.cluster_size, pos[1] // self.cluster_size)
+
+    def bounds(self, cluster):
+        """(x0, y0, x1, y1) of a cluster, end exclusive"""
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        return x0, y0, min(x0 + size, self.width), min(y0 + size, self.height)
+
+    def adjacent_clusters(self, cluster):
+        cx, cy = cluster
+        return [(cx + dx, cy + dy) for dx, dy in DIRECTIONS
+                if 0 <= cx + dx < self.columns and 0 <= cy + dy < self.rows]
+
+    def walkable(self, pos):
+        return self.cells[pos].status != 'blocked'
+
+    def edges(self, pos):
+        """(neighbour, cost) pairs of an abstract node"""
+        cluster = self.intra[self.cluster_of(pos)]
+        yield from cluster.get(pos, {}).items()
+        yield from self.crossings.get(pos, {}).items()
+
+    def update_cell(self, pos):
+        """Rebuild after the cell at pos was blocked or unblocked"""
+        cluster = self.cluster_of(pos)
+        changed = {cluster}
+        for other in self.adjacent_clusters(cluster):
+            x0, y0, x1, y1 = self.bounds(other)
+            if x0 - 1 <= pos[0] <= x1 and y0 - 1 <= pos[1] <= y1:
+                self._build_border(min(cluster, other), max(cluster, other))
+                changed.add(other)
+        for cluster in changed:
+            self._collect_nodes(cluster)
+            self._build_intra(cluster)
+
+    def query(self, start, goal):
+        """A HierarchicalQuery joining start and goal to the graph"""
+        return HierarchicalQuery(self, start, goal)
+
+    def local_graph(self, cluster):
+        """Walkable cells of a cluster and their in-cluster moves.
+
+        Returns {pos: [(neighbour pos, cost)]}, read once from the cells so
+        the searches inside a cluster don't touch the grid again.
+        """
+        x0, y0, x1, y1 = self.bounds(cluster)
+        open_cells = {(x, y) for x in range(x0, x1) for y in range(y0, y1)
+                      if self.walkable((x, y))}
+        return {(x, y): [((x + dx, y + dy), cost) for dx, dy, cost in MOVES
+                         if (x + dx, y + dy) in open_cells]
+                for x, y in open_cells}
+
+    def local_search(self, origin, cluster, goal=None, local=None):
+        """Dijkstra from origin inside one cluster; stops early at goal.
+
+        local is the cluster's local_graph(), if already built. Returns
+        (dist, parent) dicts over the settled cells.
+        """
+        if local is None:
+            local = self.local_graph(cluster)
+        dist = {origin: 0}
+        parent = {origin: None}
+        settled = {}
+        heap = [(0, origin)]
+        while heap:
+            d, pos = heapq.heappop(heap)
+            if pos in settled:
+                continue
+            settled[pos] = d
+            if pos == goal:
+                break
+            for npos, cost in local.get(pos, ()):
+                nd = d + cost
+                if nd < dist.get(npos, float('inf')):
+                    dist[npos] = nd
+                    parent[npos] = pos
+                    heapq.heappush(heap, (nd, npos))
+        return settled, parent
+
+    def _build_border(self, cluster, other):
+        """Choose the entrances between two touching clusters (cluster < other)"""
+        for a, b in self.borders.get((cluster, other), ()):
+            del self.crossings[a][b]
+            del self.crossings[b][a]
+
+        # Every walkable crossing from cluster into other
+        cx0, cy0, cx1, cy1 = self.bounds(cluster)
+        ox0, oy0, ox1, oy1 = self.bounds(other)
+        pairs = []
+        for ax in range(max(cx0, ox0 - 1), min(cx1, ox1 + 1)):
+            for ay in range(max(cy0, oy0 - 1), min(cy1, oy1 + 1)):
+                if not self.walkable((ax, ay)):
+                    continue
+                for bx in range(max(ax - 1, ox0), min(ax + 2, ox1)):
+                    for by in range(max(ay - 1, oy0), min(ay + 2, oy1)):
+                        if self.walkable((bx, by)):
+                            pairs.append(((ax, ay), (bx, by)))
+
+        # Runs: crossings whose cells are adjacent on both sides
+        group = list(range(len(pairs)))
+        def find(i):
+            while group[i] != i:
+                group[i] = group[group[i]]
+                i = group[i]
+            return i
+        by_a = defaultdict(list)
+        for i, (a, _) in enumerate(pairs):
+            by_a[a].append(i)
+        for i, (a, b) in enumerate(pairs):
+            for dx, dy, _ in MOVES + [(0, 0, 0)]:
+                for j in by_a.get((a[0] + dx, a[1] + dy), ()):
+                    other_b = pairs[j][1]
+                    if abs(other_b[0] - b[0]) <= 1 and abs(other_b[1] - b[1]) <= 1:
+                        group[find(i)] = find(j)
+        runs = defaultdict(list)
+        for i, pair in enumerate(pairs):
+            runs[find(i)].append(pair)
+
+        entrances = []
+        for run in runs.values():
+            run.sort()
+            if len(run) < ENTRANCE_SPLIT:
+                entrances.append(run[len(run) // 2])
+            else:
+                entrances.extend((run[0], run[-1]))
+        for a, b in entrances:
+            cost = 14 if a[0] != b[0] and a[1] != b[1] else 10
+            self.crossings[a][b] = cost
+            self.crossings[b][a] = cost
+        self.borders[(cluster, other)] = entrances
+
+    def _collect_nodes(self, cluster):
+        nodes = set()
+        for other in self.adjacent_clusters(cluster):
+            key = (min(cluster, other), max(cluster, other))
+            for a, b in self.borders.get(key, ()):
+                nodes.add(a if self.cluster_of(a) == cluster else b)
+        self.nodes[cluster] = nodes
+
+    def _build_intra(self, cluster):
+        """Shortest in-cluster distances between the nodes of a cluster"""
+        nodes = self.nodes[cluster]
+        local = self.local_graph(cluster)
+        edges = {}
+        for node in nodes:
+            dist, _ = self.local_search(node, cluster, local=local)
+            edges[node] = {other: dist[other] for other in nodes
+                           if other != node and other in dist}
+        self.intra[cluster] = edges
+
+class HierarchicalQuery:
+    """The abstract graph plus temporary edges from start and to goal.
+
+    expanded counts the cells settled by local searches (connecting the
+    endpoints and refining the path).
+    """
+    def __init__(self, graph, start, goal):
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.extra = defaultdict(dict)
+        self.expanded = 0
+
+        for endpoint in (start, goal):
+            cluster = graph.cluster_of(endpoint)
+            dist, _ = graph.local_search(endpoint, cluster)
+            self.expanded += len(dist)
+            for node in graph.nodes[cluster]:
+                if node != endpoint and node in dist:
+                    self._link(endpoint, node, dist[node])
+            if endpoint == start and goal in dist and goal != start:
+                self._link(start, goal, dist[goal])
+
+    def _link(self, a, b, cost):
+        self.extra[a][b] = cost
+        self.extra[b][a] = cost
+
+    def edges(self, pos):
+        """(neighbour, cost) pairs of pos, including the temporary edges"""
+        yield from self.graph.edges(pos)
+        yield from self.extra.get(pos, {}).items()
+
+    def refine(self, nodes):
+        """Expand a list of abstract node positions into a cell path"""
+        graph = self.graph
+        path = [nodes[0]]
+        for a, b in zip(nodes, nodes[1:]):
+            cluster = graph.cluster_of(a)
+            if graph.cluster_of(b) != cluster:
+                path.append(b)  # Inter-cluster edge: one move
+                continue
+            dist, parent = graph.local_search(a, cluster, goal=b)
+            self.expanded += len(dist)
+            segment = []
+            pos = b
+            while pos != a:
+                segment.append(pos)
+                pos = parent[pos]
+            path.extend(reversed(segment))
+        return path
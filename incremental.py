@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental replanning (D* Lite) for pathfinder
+"""
+
+import heapq
+import itertools
+
+from Cell_2D import MOVES
+from heuristics import HEURISTICS
+
+INF = float('inf')
+
+class DStarLite:
+    """D* Lite planner that keeps its g and rhs values between edits.
+
+    Searches backwards from the goal, so g(pos) is the cost from pos to
+    the goal and rhs(pos) its one-step lookahead. After update_cell() only
+    cells whose g and rhs disagree are queued again, and step() repairs
+    them one expansion at a time. heuristic(pos, goal_pos) must be
+    consistent (octile by default); it is called towards the start.
+    move_start() lets the start move between plans.
+    """
+    def __init__(self, cells, start, goal, heuristic=None):
+        self.cells = cells
+        self.start = start
+        self.goal = goal
+        self.heuristic = heuristic or HEURISTICS['Octile']
+        self.km = 0  # Key offset accumulated by start moves
+        self.g = {}
+        self.rhs = {goal: 0}
+        self._queue = []
+        self._entries = {}  # pos -> counter of its live queue entry
+        self._counter = itertools.count()
+        self._neighbours = {}  # pos -> cached neighbours(pos), dropped on edits
+        self.expanded = 0
+        self._push(goal)
+
+    # Costs and keys
+    def walkable(self, pos):
+        cell = self.cells.get(pos)
+        return cell is not None and cell.status != 'blocked'
+
+    def neighbours(self, pos):
+        """(neighbour, cost) pairs of walkable cells next to a walkable pos"""
+        result = self._neighbours.get(pos)
+        if result is None:
+            x, y = pos
+            result = [] if not self.walkable(pos) else [
+                ((x + dx, y + dy), cost) for dx, dy, cost in MOVES
+                if self.walkable((x + dx, y + dy))]
+            self._neighbours[pos] = result
+        return result
+
+    def key(self, pos):
+        best = min(self.g.get(pos, INF), self.rhs.get(pos, INF))
+        return (best + self.heuristic(pos, self.start) + self.km, best)
+
+    # Queue with lazy removal
+    def _push(self, pos):
+        count = next(self._counter)
+        self._entries[pos] = count
+        heapq.heappush(self._queue, (self.key(pos), count, pos))
+
+    def _top(self):
+        queue = self._queue
+        while queue and self._entries.get(queue[0][2]) != queue[0][1]:
+            heapq.heappop(queue)
+        return queue[0] if queue else None
+
+    def _update(self, pos):
+        """Requeue pos if it is inconsistent, drop it otherwise"""
+        if pos != self.goal:
+            self.rhs[pos] = min((cost + self.g.get(other, INF) for other, cost in self.neighbours(pos)),
+                                default=INF)
+        if self.g.get(pos, INF) != self.rhs.get(pos, INF):
+            self._push(pos)
+        else:
+            self._entries.pop(pos, None)
+
+    # Planning
+    def consistent(self):
+        """True once the start's cost is final for the current map"""
+        top = self._top()
+        return (top is None or top[0] >= self.key(self.start)) and \
+            self.rhs.get(self.start, INF) == self.g.get(self.start, INF)
+
+    def step(self):
+        """Process one queued cell; returns it, or None when planning is done"""
+        if self.consistent():
+            return None
+        key, _, pos = self._top()
+        new_key = self.key(pos)
+        if key < new_key:
+            self._push(pos)  # Key grew since it was queued
+            return pos
+        del self._entries[pos]
+        heapq.heappop(self._queue)
+        self.expanded += 1
+        g, rhs = self.g.get(pos, INF), self.rhs.get(pos, INF)
+        if g > rhs:
+            self.g[pos] = rhs  # Overconsistent: settle it
+            for other, _ in self.neighbours(pos):
+                self._update(other)
+        else:
+            self.g[pos] = INF  # Underconsistent: raise it and re-derive
+            self._update(pos)
+            for other, _ in self.neighbours(pos):
+                self._update(other)
+        return pos
+
+    def plan(self):
+        """Run step() until consistent; returns path()"""
+        while self.step() is not None:
+            pass
+        return self.path()
+
+    def path(self):
+        """Positions from start to goal following g, or [] if unreachable"""
+        if self.g.get(self.start, INF) == INF:
+            return []
+        path = [self.start]
+        pos = self.start
+        while pos != self.goal and len(path) <= len(self.cells):
+            pos = min(self.neighbours(pos), key=lambda n: n[1] + self.g.get(n[0], INF))[0]
+            path.append(pos)
+        return path
+
+    # Changes
+    def update_cell(self, pos):
+        """Call after the cell at pos was blocked or unblocked"""
+        x, y = pos
+        around = [(x + dx, y + dy) for dx, dy, _ in MOVES if (x + dx, y + dy) in self.cells]
+        for other in [pos] + around:
+            self._neighbours.pop(other, None)
+        self._update(pos)
+        for other in around:
+            self._update(other)
+
+    def move_start(self, start):
+        """Plan from a new start without discarding the search"""
+        self.km += self.heuristic(start, self.start)
+        self.start = start
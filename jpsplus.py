@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+JPS+ jump-distance tables for pathfinder
+"""
+
+import heapq
+from array import array
+
+from Cell_2D import DIRECTIONS
+
+# A cell's table entries are in DIRECTIONS order
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+DIAGONAL = [d for d in DIRECTIONS if d[0] and d[1]]
+
+class JumpTable:
+    """Precomputed jump distances for Jump Point Search.
+
+    distances holds 8 int16 entries per cell (index (y * width + x) * 8 +
+    direction). For a ray from a walkable cell, a positive entry n means
+    the n-th cell along it is a jump point whatever the goal; otherwise
+    the ray crosses -n free cells before a wall or the grid edge. The goal
+    is the only jump point that depends on the query, and jump() checks
+    for it, so jump() returns exactly what PathfindingAlgorithms.jps_jump
+    would. update_cell() recomputes the rows and columns next to an
+    edited cell and repairs the diagonal rays that lead into them.
+    distances may be given, from a table built on the same walls.
+    """
+    def __init__(self, cells, width, height, distances=None):
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.free = bytearray(width * height)
+        if distances is None:
+            self.distances = array('h', bytes(2 * 8 * width * height))
+            self.rebuild()
+        else:
+            self.distances = array('h', distances)
+            self._read_walls()
+
+    def _read_walls(self):
+        width = self.width
+        for (x, y), cell in self.cells.items():
+            self.free[y * width + x] = cell.status != 'blocked'
+
+    def rebuild(self):
+        """Recompute every entry from the cells"""
+        width = self.width
+        self._read_walls()
+        for y in range(self.height):
+            self._scan_row(y)
+        for x in range(width):
+            self._scan_column(x)
+        for dx, dy in DIAGONAL:
+            k = DIRECTION_INDEX[(dx, dy)]
+            xs = range(width - 1, -1, -1) if dx > 0 else range(width)
+            ys = range(self.height - 1, -1, -1) if dy > 0 else range(self.height)
+            # Downstream cells first, so each ray extends a finished one
+            for y in ys:
+                for x in xs:
+                    self.distances[(y * width + x) * 8 + k] = self._diagonal(x, y, dx, dy)
+
+    def _open(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and self.free[y * self.width + x]
+
+    def _forced_straight(self, x, y, dx, dy):
+        """Whether (x, y), reached moving straight along (dx, dy), has a forced neighbour"""
+        side_x, side_y = (0, 1) if dx else (1, 0)
+        nx, ny = x + dx, y + dy
+        return ((self._open(nx + side_x, ny + side_y) and not self._open(x + side_x, y + side_y)) or
+                (self._open(nx - side_x, ny - side_y) and not self._open(x - side_x, y - side_y)))
+
+    def _forced_diagonal(self, x, y, dx, dy):
+        return ((self._open(x - dx, y + dy) and not self._open(x - dx, y)) or
+                (self._open(x + dx, y - dy) and not self._open(x, y - dy)))
+
+    def _straight_line(self, cells, dx, dy, changed=None):
+        """Fill one straight direction along a row or column; cells run downstream first.
+
+        Positions whose entry changed are added to the changed set, if given.
+        """
+        k = DIRECTION_INDEX[(dx, dy)]
+        distances, width = self.distances, self.width
+        for x, y in cells:
+            nx, ny = x + dx, y + dy
+            if not (self._open(x, y) and self._open(nx, ny)):
+                value = 0  # Blocked cells keep 0 entries
+            elif self._forced_straight(nx, ny, dx, dy):
+                value = 1
+            else:
+                value = distances[(ny * width + nx) * 8 + k]
+                value = value + 1 if value > 0 else value - 1
+            i = (y * width + x) * 8 + k
+            if changed is not None and distances[i] != value:
+                changed.add((x, y))
+            distances[i] = value
+
+    def _scan_row(self, y, changed=None):
+        row = [(x, y) for x in range(self.width)]
+        self._straight_line(reversed(row), 1, 0, changed)
+        self._straight_line(row, -1, 0, changed)
+
+    def _scan_column(self, x, changed=None):
+        column = [(x, y) for y in range(self.height)]
+        self._straight_line(reversed(column), 0, 1, changed)
+        self._straight_line(column, 0, -1, changed)
+
+    def _diagonal(self, x, y, dx, dy):
+        """Entry for the diagonal ray from (x, y), given the entries downstream of it"""
+        nx, ny = x + dx, y + dy
+        if not (self._open(x, y) and self._open(nx, ny)):
+            return 0
+        base = (ny * self.width + nx) * 8
+        distances = self.distances
+        if (self._forced_diagonal(nx, ny, dx, dy) or
+                distances[base + DIRECTION_INDEX[(dx, 0)]] > 0 or
+                distances[base + DIRECTION_INDEX[(0, dy)]] > 0):
+            return 1
+        value = distances[base + DIRECTION_INDEX[(dx, dy)]]
+        return value + 1 if value > 0 else value - 1
+
+    def update_cell(self, pos):
+        """Bring the table in line after the cell at pos was blocked or unblocked"""
+        x, y = pos
+        width, height = self.width, self.height
+        self.free[y * width + x] = self.cells[pos].status != 'blocked'
+
+        # Straight entries can only change on the rows and columns next to pos
+        changed = {(x + dx, y + dy) for dx, dy in DIRECTIONS} | {pos}
+        for row in (y - 1, y, y + 1):
+            if 0 <= row < height:
+                self._scan_row(row, changed)
+        for column in (x - 1, x, x + 1):
+            if 0 <= column < width:
+                self._scan_column(column, changed)
+
+        # Diagonal rays stepping into a changed cell (and the edited cell's
+        # own), walked upstream until they stop changing. Entries are keyed
+        # by distance along the ray, downstream first.
+        for dx, dy in DIAGONAL:
+            k = DIRECTION_INDEX[(dx, dy)]
+            heap = [(-(cx * dx + cy * dy), (cx - dx, cy - dy)) for cx, cy in changed]
+            heap.append((-(x * dx + y * dy), pos))
+            heapq.heapify(heap)
+            seen = set()
+            while heap:
+                _, (px, py) = heapq.heappop(heap)
+                if (px, py) in seen or not (0 <= px < width and 0 <= py < height):
+                    continue
+                seen.add((px, py))
+                i = (py * width + px) * 8 + k
+                value = self._diagonal(px, py, dx, dy)
+                if value != self.distances[i]:
+                    self.distances[i] = value
+                    heapq.heappush(heap, (-(px * dx + py * dy), (px - dx, py - dy)))
+
+    def jump(self, pos, dx, dy, goal_pos):
+        """Next jump point from pos in direction (dx, dy), or None"""
+        x, y = pos
+        value = self.distances[(y * self.width + x) * 8 + DIRECTION_INDEX[(dx, dy)]]
+        reach = value if value > 0 else -value
+        gx, gy = goal_pos
+
+        if not (dx and dy):
+            # The goal ends the ray if it lies on it within reach
+            steps = (gx - x) * dx if dx else (gy - y) * dy
+            if (gy == y if dx else gx == x) and 0 < steps <= reach:
+                return goal_pos
+            return (x + dx * value, y + dy * value) if value > 0 else None
+
+        # Diagonal: the first step on the goal's row or column stops the ray
+        # when a straight scan from there would reach the goal
+        best = value if value > 0 else None
+        for steps, ray in (((gy - y) * dy, (dx, 0)), ((gx - x) * dx, (0, dy))):
+            if 0 < steps <= reach and (best is None or steps < best):
+                sx, sy = x + dx * steps, y + dy * steps
+                along = (gx - sx) * dx if ray[0] else (gy - sy) * dy
+                if along == 0:
+                    best = steps  # The goal itself
+                elif along > 0:
+                    straight = self.distances[(sy * self.width + sx) * 8 + DIRECTION_INDEX[ray]]
+                    if along <= (straight if straight > 0 else -straight):
+                        best = steps
+        if best is None:
+            return None
+        return (x + dx * best, y + dy * best)
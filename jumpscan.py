@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized jump scans for Jump Point Search in pathfinder
+"""
+
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from Cell_2D import blocked_array, grid_version
+
+STRAIGHT = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+# Grid version -> JumpScanner; versions are never shared between grids
+_scanners = OrderedDict()
+MAX_SCANNERS = 4
+
+def straight_runs(free, dx, dy):
+    """(height, width) int32 straight jump entries of a walkable mask.
+
+    For a ray from a walkable cell along (dx, dy), a positive entry n
+    means the n-th cell is a jump point (it has a forced neighbour);
+    otherwise the ray crosses -n free cells before a wall or the edge.
+    Same encoding as the straight entries of a jpsplus.JumpTable.
+    """
+    height, width = free.shape
+    padded = np.zeros((height + 2, width + 2), dtype=bool)
+    padded[1:-1, 1:-1] = free
+
+    def at(ox, oy):
+        return padded[1 + oy:1 + oy + height, 1 + ox:1 + ox + width]
+
+    side_x, side_y = (0, 1) if dx else (1, 0)
+    forced = free & ((at(dx + side_x, dy + side_y) & ~at(side_x, side_y)) |
+                     (at(dx - side_x, dy - side_y) & ~at(-side_x, -side_y)))
+    stop = ~free | forced
+
+    # Turn the direction into +x, find the next stop after every cell
+    # with a reversed running minimum, then turn back
+    def forward(a):
+        a = a.T if dy else a
+        return a[:, ::-1] if dx < 0 or dy < 0 else a
+
+    def backward(a):
+        a = a[:, ::-1] if dx < 0 or dy < 0 else a
+        return a.T if dy else a
+
+    stop_f, forced_f = forward(stop), forward(forced)
+    length = stop_f.shape[1]
+    cols = np.arange(length)
+    first = np.minimum.accumulate(np.where(stop_f, cols, length)[:, ::-1], axis=1)[:, ::-1]
+    after = np.full_like(first, length)
+    after[:, :-1] = first[:, 1:]
+    steps = after - cols
+    rows = np.arange(after.shape[0])[:, np.newaxis]
+    hit = np.zeros_like(forced_f)
+    inside = after < length
+    hit[inside] = forced_f[np.broadcast_to(rows, after.shape)[inside], after[inside]]
+    runs = np.where(hit, steps, 1 - steps).astype(np.int32)
+    runs = backward(runs)
+    runs[~free] = 0
+    return runs
+
+class JumpScanner:
+    """Jump Point Search rays answered from straight runs of the current walls.
+
+    The straight jump from every cell in each of the four directions is
+    computed at once with NumPy, so a straight scan is one lookup and a
+    diagonal scan one step per diagonal cell with two lookups, instead
+    of scanning each row and column cell by cell. Only the walls go into
+    the runs: the goal is checked when a ray is followed, so jump()
+    returns exactly what PathfindingAlgorithms.jps_jump would.
+    """
+    def __init__(self, blocked):
+        height, width = blocked.shape
+        self.width = width
+        self.height = height
+        free = blocked == 0
+        padded = np.zeros((height + 2, width + 2), dtype=bool)
+        padded[1:-1, 1:-1] = free
+        self.free = bytearray(padded.tobytes())  # Padded with a wall border
+        self.runs = {d: array('i', straight_runs(free, *d).tobytes()) for d in STRAIGHT}
+
+    def jump(self, pos, dx, dy, goal_pos):
+        """Next jump point from pos in direction (dx, dy), or None"""
+        x, y = pos
+        gx, gy = goal_pos
+        width = self.width
+        if not (dx and dy):
+            value = self.runs[(dx, dy)][y * width + x]
+            reach = value if value > 0 else -value
+            steps = (gx - x) * dx if dx else (gy - y) * dy
+            if (gy == y if dx else gx == x) and 0 < steps <= reach:
+                return goal_pos
+            return (x + dx * value, y + dy * value) if value > 0 else None
+
+        free, row_runs, column_runs = self.free, self.runs[(dx, 0)], self.runs[(0, dy)]
+        padded_width = width + 2
+        p = (y + 1) * padded_width + x + 1
+        i = y * width + x
+        p_step, i_step = dy * padded_width + dx, dy * width + dx
+        back_x, back_y = -dx, -dy * padded_width
+        while True:
+            x += dx
+            y += dy
+            p += p_step
+            i += i_step
+            if not free[p]:
+                return None
+            if x == gx and y == gy:
+                return (x, y)
+            # Forced neighbours around a diagonal step
+            if ((free[p + back_x - back_y] and not free[p + back_x]) or
+                    (free[p - back_x + back_y] and not free[p + back_y])):
+                return (x, y)
+            # Straight jumps from the diagonal cell, or the goal on its row or column
+            value = row_runs[i]
+            if value > 0 or (y == gy and 0 < (gx - x) * dx <= -value):
+                return (x, y)
+            value = column_runs[i]
+            if value > 0 or (x == gx and 0 < (gy - y) * dy <= -value):
+                return (x, y)
+
+def jump_scanner(cells):
+    """JumpScanner of the grid's current walls, reused until they change.
+
+    Walls must be changed through Cell.update, which bumps the grid
+    version, for a cached scanner to be replaced.
+    """
+    version = grid_version(cells)
+    scanner = _scanners.get(version)
+    if scanner is None:
+        scanner = _scanners[version] = JumpScanner(blocked_array(cells))
+        if len(_scanners) > MAX_SCANNERS:
+            _scanners.popitem(last=False)
+    return scanner
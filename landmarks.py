@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+ALT (A*, landmarks, triangle inequality) heuristic for pathfinder
+"""
+
+import os
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from Cell_2D import blocked_array, grid_version
+from connectivity import ComponentIndex
+from flowfield import FlowField
+from heuristics import HEURISTICS, Heuristic
+
+INF = float('inf')
+
+def landmark_path(grid_path):
+    """File the landmark tables of a grid saved at grid_path are kept in"""
+    root, _ = os.path.splitext(grid_path)
+    return root + '.landmarks.npz'
+
+def walls_checksum(cells):
+    return zlib.crc32(blocked_array(cells).tobytes())
+
+def select_landmarks(cells, width, height, count):
+    """Pick up to count landmarks by farthest-point selection.
+
+    The first landmark is the cell farthest from a cell of the largest
+    component; each next one is the cell farthest from every landmark so
+    far. Other components get no landmarks. Returns
+    (positions, distances) with distances a (count, height, width) array
+    of exact path costs from each landmark.
+    """
+    labels = ComponentIndex(cells, width, height)
+    sizes = Counter(labels.component(pos) for pos in cells)
+    sizes.pop(None, None)  # Blocked cells
+    if not sizes:
+        return [], np.empty((0, height, width))
+    largest = sizes.most_common(1)[0][0]
+    seed = next(pos for pos in cells if labels.component(pos) == largest)
+    origin = FlowField(cells, seed, width, height).distance
+    spread = np.where(np.isfinite(origin), origin, -1)
+
+    positions, distances = [], []
+    nearest = np.full((height, width), np.inf)
+    while len(positions) < count:
+        y, x = np.unravel_index(np.argmax(spread), spread.shape)
+        if spread[y, x] <= 0:
+            break  # Every reachable cell is a landmark already
+        positions.append((int(x), int(y)))
+        distance = FlowField(cells, positions[-1], width, height).distance
+        distances.append(distance)
+        nearest = np.minimum(nearest, distance)
+        spread = np.where(np.isfinite(nearest), nearest, -1)
+    return positions, np.array(distances).reshape(-1, height, width)
+
+class Landmarks(Heuristic):
+    """ALT heuristic: triangle-inequality bounds from exact landmark distances.
+
+    For a landmark L, |d(L, n) - d(L, goal)| never overestimates the cost
+    from n to goal. The estimate is the largest such bound over all
+    landmarks, or the octile distance where that is larger, so it stays
+    consistent. Unlike the geometric heuristics it knows about walls,
+    which pays off most in mazes. Searches get a LandmarkBounds, which
+    bounds only the cells they ask about. The distances are only valid
+    for the walls they were computed on: stale() tells when to rebuild.
+    """
+    def __init__(self, cells, width, height, count=8, positions=None, distances=None):
+        super().__init__('ALT', "ALT", HEURISTICS['Octile'].cost)
+        self.cells = cells
+        self.width = width
+        self.height = height
+        if positions is None:
+            positions, distances = select_landmarks(cells, width, height, count)
+        self.positions = positions
+        self.distances = np.ascontiguousarray(distances, dtype=np.float64)  # (landmarks, height, width)
+        self.version = grid_version(cells)
+
+    def stale(self):
+        """True if cells were blocked or unblocked after the tables were built"""
+        return grid_version(self.cells) != self.version
+
+    def __call__(self, pos, goal_pos):
+        return self.lookup(self.width, self.height)(pos, goal_pos)
+
+    def lookup(self, width, height):
+        return LandmarkBounds(self)
+
+    def table(self, goal_pos, width, height):
+        """(height, width) array of the estimate from every cell to goal_pos"""
+        octile = super().table(goal_pos, width, height)
+        at_goal = self.distances[:, goal_pos[1], goal_pos[0]]
+        use = np.isfinite(at_goal)  # Landmarks that can reach the goal
+        if not use.any():
+            return octile
+        # NaN where a landmark can't reach a cell, so np.fmax skips those bounds
+        bounds = np.abs(self.distances[use] - at_goal[use][:, np.newaxis, np.newaxis])
+        bounds[~np.isfinite(bounds)] = np.nan
+        return np.fmax(octile, np.fmax.reduce(bounds, axis=0))
+
+    def save(self, path):
+        """Save the tables, tagged with the walls they were computed on"""
+        np.savez_compressed(path, positions=np.array(self.positions, dtype=np.int32).reshape(-1, 2),
+                            distances=self.distances.astype(np.float32),
+                            checksum=walls_checksum(self.cells))
+
+    @classmethod
+    def load(cls, path, cells, width, height):
+        """Tables saved by save(), or None if missing or saved for other walls"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data['checksum']) != walls_checksum(cells) or \
+                    data['distances'].shape[1:] != (height, width):
+                return None
+            positions = [tuple(pos) for pos in data['positions'].tolist()]
+            distances = data['distances'].astype(np.float64)
+        return cls(cells, width, height, positions=positions, distances=distances)
+
+class LandmarkBounds:
+    """heuristic(pos, goal_pos) of a Landmarks, computed cell by cell.
+
+    A whole-grid goal table (landmarks x cells) costs more than a short
+    search, which only asks about the cells next to the ones it expands.
+    For each goal the landmarks that reach it are found once; each call
+    then reads one distance per landmark.
+    """
+    def __init__(self, landmarks):
+        self.width = landmarks.width
+        # Flat views of each landmark's distances; indexing one gives a float
+        self.columns = [memoryview(distance.ravel()) for distance in landmarks.distances]
+        self.octile = HEURISTICS['Octile'].cost
+        self._goals = {}  # goal_pos -> [(column, distance at the goal)]
+
+    def __call__(self, pos, goal_pos):
+        pairs = self._goals.get(goal_pos)
+        if pairs is None:
+            at = goal_pos[1] * self.width + goal_pos[0]
+            pairs = self._goals[goal_pos] = [(column, column[at]) for column in self.columns
+                                              if column[at] != INF]
+        dx, dy = abs(pos[0] - goal_pos[0]), abs(pos[1] - goal_pos[1])
+        bound = self.octile(dx, dy)
+        i = pos[1] * self.width + pos[0]
+        for column, at_goal in pairs:
+            distance = column[i]
+            if distance != INF:
+                distance = abs(distance - at_goal)
+                if distance > bound:
+                    bound = distance
+        return bound
@@ -5,128 +5,33 @@ Pathfinding Visualizer
 """
 
 import pygame
+import os
 import sys
 import random
 import time
 import math
-from collections import deque
+import heapq
+import itertools
+from collections import OrderedDict, deque, namedtuple
 
 # Import the Cell class
-try:
-    from Cell_2D import Cell, make_grid, decorate_grid
-except:
-    # Fallback Cell class
-    class Cell:
-        def __init__(self, pos, status, constants, istarget=False):
-            self.pos = pos
-            self.status = status
-            self.istarget = istarget
-            self.tile_size = constants['TILESIZE']
-            self.colors = constants['COLORS']
-            margin = constants['MARGIN']
-            realx = pos[0] * constants['TILESIZE']
-            realy = pos[1] * constants['TILESIZE']
-            self.rect = pygame.Rect(realx + margin, realy + margin, 
-                                   self.tile_size - 2*margin, self.tile_size - 2*margin)
-            self.neighbours = []
-            self.parent = None
-            self.f_cost = float('inf')
-            self.h_cost = float('inf')
-            self.g_cost = float('inf')
-            self.visited_time = 0
-        
-        def add_neighbours(self, cell_list):
-            coords = self.get_neighbour_coords()
-            self.neighbours = []
-            for c in coords:
-                if c in cell_list:
-                    self.neighbours.append(cell_list[c])
-        
-        def get_neighbour_coords(self):
-            vectors = []
-            for dx in (-1, 0, 1):
-                for dy in (-1, 0, 1):
-                    if not (dx == 0 == dy):
-                        neighbour = (self.pos[0] + dx, self.pos[1] + dy)
-                        if self.in_bounds(neighbour):
-                            vectors.append(neighbour)
-            return vectors
-        
-        def in_bounds(self, pos):
-            return 0 <= pos[0] < 20 and 0 <= pos[1] < 20
-        
-        def update(self, new_status, surf):
-            if self.status != new_status:
-                self.status = new_status
-                self.draw_cell(surf)
-        
-        def draw_cell(self, surf):
-            if self.istarget:
-                col = self.colors['TARGET_COL']
-            elif self.status == 'blocked':
-                col = self.colors['BLOCK_COL']
-            elif self.status == 'start':
-                col = self.colors['START_COL']
-            elif self.status == 'path':
-                col = self.colors['PATH_COL']
-            elif self.status == 'active':
-                col = self.colors['ACTIVE_COL']
-            elif self.status == 'closed':
-                col = self.colors['CLOSED_COL']
-            else:
-                col = self.colors['EMPTY_COL']
-            
-            pygame.draw.rect(surf, col, self.rect)
-        
-        def get_h(self, goal_pos):
-            dx = abs(goal_pos[0] - self.pos[0])
-            dy = abs(goal_pos[1] - self.pos[1])
-            self.h_cost = 10 * (dx + dy)
-        
-        def get_distance_to(self, other_cell):
-            dx = abs(other_cell.pos[0] - self.pos[0])
-            dy = abs(other_cell.pos[1] - self.pos[1])
-            if dx == 1 and dy == 1:
-                return 14
-            return 10
-        
-        def get_g(self, neighbour):
-            distance = self.get_distance_to(neighbour)
-            new_g = neighbour.g_cost + distance
-            if new_g < self.g_cost:
-                self.g_cost = new_g
-                return True
-            return False
-        
-        def get_f(self):
-            self.f_cost = self.g_cost + self.h_cost
-        
-        def reset(self):
-            self.parent = None
-            self.f_cost = float('inf')
-            self.h_cost = float('inf')
-            self.g_cost = float('inf')
-            self.visited_time = 0
-    
-    def make_grid(constants, surface=None):
-        cell_list = {}
-        for x in range(constants['X']):
-            for y in range(constants['Y']):
-                cell_list[(x, y)] = Cell((x, y), 'empty', constants)
-        
-        for cell in cell_list.values():
-            cell.add_neighbours(cell_list)
-            if surface:
-                cell.draw_cell(surface)
-        
-        return cell_list
-    
-    def decorate_grid(surface, cell_list, obstacle_list):
-        if obstacle_list:
-            for pos in obstacle_list:
-                if pos in cell_list:
-                    cell_list[pos].update('blocked', surface)
-        return cell_list
+from Cell_2D import Cell, make_grid, decorate_grid
+from Cell_2D import DIRECTIONS, MOVES, save_grid, load_grid
+from grid_array import make_array_grid
+from heuristics import HEURISTICS, DEFAULT_HEURISTIC, goal_lookup
+from hierarchical import ClusterGraph
+from connectivity import ComponentIndex
+from incremental import DStarLite
+from cache import PathCache
+from flowfield import FlowField
+from landmarks import Landmarks, landmark_path
+from jpsplus import JumpTable
+from jumpscan import jump_scanner
+from goalbounds import GoalBounds, bounds_path
+from wavefront import Wavefront
+from gridrender import ArrayRenderer
+from scheduler import SPEED_LEVELS, StepScheduler
+from worker import SearchWorker
 
 #------------- CONSTANTS ---------------
 colordict = {
@@ -145,7 +50,8 @@ colordict = {
     'BUTTON_ACTIVE': (150, 200, 255),
     'TAB_ACTIVE': (70, 100, 180),
     'TAB_INACTIVE': (60, 80, 160),
-    'GRID_LINE': (60, 60, 70)
+    'GRID_LINE': (60, 60, 70),
+    'FLOW_COL': (120, 120, 150)
 }
 
 # Algorithms organized by category
@@ -154,13 +60,18 @@ ALGORITHMS = {
         "A* Search",
         "Dijkstra's Algorithm",
         "Breadth-First Search",
+        "Wavefront BFS",
         "Depth-First Search",
         "Greedy Best-First"
     ],
     "Advanced": [
         "Bidirectional Search",
         "Jump Point Search",
-        "IDA* Search"
+        "JPS+ Search",
+        "IDA* Search",
+        "Dial's Algorithm",
+        "HPA* Search",
+        "D* Lite"
     ],
     "Heuristic": [
         "Swarm Algorithm",
@@ -182,22 +93,71 @@ MAZE_TYPES = [
     "Eller's Algorithm"
 ]
 
+# Heuristic choices in the sidebar: the registry plus ALT, whose tables depend on the grid
+HEURISTIC_CHOICES = list(HEURISTICS) + ['ALT']
+
 constants = {
     'TILESIZE': 20,
     'MARGIN': 1,
     'X': 40,
     'Y': 30,
     'FPS': 60,
-    'SEARCH_SPEED': 30,
+    'SEARCH_SPEED': 2,  # Index into scheduler.SPEED_LEVELS (30 steps/s)
+    'SEARCH_WORKER': False,  # Run searches in a background process (W toggles)
     'COLORS': colordict,
     'GOALPOS': (38, 28),
     'STARTPOS': (2, 2),
     'SIDEBAR_WIDTH': 250,
-    'TAB_HEIGHT': 30
+    'TAB_HEIGHT': 30,
+    'GRID_BACKEND': 'cells',  # 'cells' (dict of Cell) or 'array' (NumPy ArrayGrid)
+    'GRID_RENDERER': 'surfarray',  # 'surfarray' (ArrayRenderer) or 'rects' (a rect per cell)
+    'IDA_TABLE_SIZE': 4096,  # IDA* transposition table cap (0 = path memory only)
+    'HPA_CLUSTER_SIZE': 10,  # Side of an HPA* cluster in cells
+    'PATH_CACHE_BYTES': 4 * 1024 * 1024,  # Memory budget of the path query cache
+    'LANDMARKS': 8,  # Landmarks of the ALT heuristic
+    'GRID_FILE': 'grid.npz',  # Save/load target; ALT tables go next to it
+    'TEXT_CACHE_SIZE': 512  # Rendered text surfaces kept for reuse
 }
 
 #------------ UI COMPONENTS ------------
 
+class TextCache:
+    """Fonts and rendered text, reused across frames.
+
+    Fonts are created once per (name, size, bold). Rendered surfaces are
+    kept per (text, font, color); past max_entries the least recently
+    used one is dropped.
+    """
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+    
+    def font(self, name, size, bold=False):
+        key = (name, size, bold)
+        if key not in self._fonts:
+            self._fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+        return self._fonts[key]
+    
+    def render(self, text, font, color):
+        key = (text, font, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+    
+    def clear(self):
+        """Forget everything (fonts die with pygame.quit)"""
+        self._fonts.clear()
+        self._surfaces.clear()
+
+text_cache = TextCache(constants['TEXT_CACHE_SIZE'])
+
 class Button:
     def __init__(self, x, y, w, h, text, is_toggle=False):
         self.rect = pygame.Rect(x, y, w, h)
@@ -206,25 +166,14 @@ class Button:
         self.hover_color = constants['COLORS']['BUTTON_HOVER']
         self.active_color = constants['COLORS']['BUTTON_ACTIVE']
         self.current_color = self.color
-        self.font = pygame.font.SysFont('Arial', 12)
+        self.font = text_cache.font('Arial', 12)
         self.is_toggle = is_toggle
         self.active = False
         self.hovered = False
+        self.lines = self.layout()
     
-    def draw(self, surface):
-        # Determine color
-        if self.active and self.is_toggle:
-            color = self.active_color
-        elif self.hovered:
-            color = self.hover_color
-        else:
-            color = self.color
-        
-        # Draw button
-        pygame.draw.rect(surface, color, self.rect, border_radius=3)
-        pygame.draw.rect(surface, constants['COLORS']['UI_TEXT'], self.rect, 1, border_radius=3)
-        
-        # Draw text (with word wrap)
+    def layout(self):
+        """Rendered lines of the word-wrapped text, each with the rect it is drawn at"""
         words = self.text.split()
         lines = []
         current_line = []
@@ -243,13 +192,31 @@ class Button:
         if current_line:
             lines.append(' '.join(current_line))
         
-        # Draw each line
         total_height = len(lines) * self.font.get_height()
         start_y = self.rect.centery - total_height // 2
         
+        rendered = []
         for i, line in enumerate(lines):
             text_surf = self.font.render(line, True, constants['COLORS']['UI_TEXT'])
             text_rect = text_surf.get_rect(center=(self.rect.centerx, start_y + i * self.font.get_height()))
+            rendered.append((text_surf, text_rect))
+        return rendered
+    
+    def draw(self, surface):
+        # Determine color
+        if self.active and self.is_toggle:
+            color = self.active_color
+        elif self.hovered:
+            color = self.hover_color
+        else:
+            color = self.color
+        
+        # Draw button
+        pygame.draw.rect(surface, color, self.rect, border_radius=3)
+        pygame.draw.rect(surface, constants['COLORS']['UI_TEXT'], self.rect, 1, border_radius=3)
+        
+        # Draw text (wrapped once, in layout)
+        for text_surf, text_rect in self.lines:
             surface.blit(text_surf, text_rect)
     
     def update(self, mouse_pos, clicked):
@@ -272,7 +239,8 @@ class TabButton:
         self.color = constants['COLORS']['TAB_INACTIVE']
         self.active_color = constants['COLORS']['TAB_ACTIVE']
         self.current_color = self.color
-        self.font = pygame.font.SysFont('Arial', 14, bold=True)
+        self.font = text_cache.font('Arial', 14, bold=True)
+        self.text_surf = self.font.render(self.text, True, constants['COLORS']['UI_TEXT'])
         self.active = False
         self.hovered = False
     
@@ -281,9 +249,7 @@ class TabButton:
         pygame.draw.rect(surface, color, self.rect)
         pygame.draw.rect(surface, constants['COLORS']['UI_TEXT'], self.rect, 1)
         
-        text_surf = self.font.render(self.text, True, constants['COLORS']['UI_TEXT'])
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        surface.blit(text_surf, text_rect)
+        surface.blit(self.text_surf, self.text_surf.get_rect(center=self.rect.center))
     
     def update(self, mouse_pos, clicked):
         self.hovered = self.rect.collidepoint(mouse_pos)
@@ -296,17 +262,205 @@ class TabButton:
     def set_active(self, active):
         self.active = active
 
+#------------ SEARCH DATA STRUCTURES ------------
+
+class OpenSet:
+    """Binary-heap priority queue of cells with lazy decrease-key.
+
+    Cells are ordered by ``key(cell)`` evaluated when they are pushed; ties
+    are broken by push order, like ``min()`` over the old open list.
+    Pushing a cell that is already queued re-prioritises it: the older heap
+    entry becomes stale and is skipped when it reaches the top.
+    """
+    def __init__(self, cells=(), key=lambda c: (c.f_cost, c.h_cost)):
+        self.key = key
+        self._heap = []
+        self._entries = {}  # cell -> counter of its live heap entry
+        self._counter = itertools.count()
+        for cell in cells:
+            self.push(cell)
+
+    def push(self, cell):
+        """Insert a cell, or update its priority if already queued"""
+        count = next(self._counter)
+        self._entries[cell] = count
+        heapq.heappush(self._heap, (self.key(cell), count, cell))
+
+    def pop(self):
+        """Remove and return the cell with the lowest priority"""
+        self._discard_stale()
+        _, _, cell = heapq.heappop(self._heap)
+        del self._entries[cell]
+        return cell
+
+    def peek(self):
+        """Return the cell with the lowest priority without removing it"""
+        self._discard_stale()
+        return self._heap[0][2]
+
+    def _discard_stale(self):
+        heap = self._heap
+        while heap and self._entries.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+
+    def __contains__(self, cell):
+        return cell in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+class BucketQueue:
+    """Dial's bucket queue for small non-negative integer priorities.
+
+    Drop-in for OpenSet when every key pushed lies within ``max_step`` of
+    the last key popped, as holds for Dijkstra with edge costs 10 and 14.
+    Keys live in a ring of ``max_step + 1`` FIFO buckets, so push is O(1)
+    and pop scans at most the ring. Re-pushing a queued cell leaves a
+    stale entry behind, skipped when it is reached.
+    """
+    def __init__(self, cells=(), key=lambda c: int(c.g_cost), max_step=14):
+        self.key = key
+        self._buckets = [deque() for _ in range(max_step + 1)]
+        self._entries = {}  # cell -> counter of its live bucket entry
+        self._counter = itertools.count()
+        self._current = None  # Key of the bucket being drained
+        for cell in cells:
+            self.push(cell)
+
+    def push(self, cell):
+        """Insert a cell, or update its priority if already queued"""
+        key = self.key(cell)
+        if self._current is None:
+            self._current = key
+        elif not self._current <= key <= self._current + len(self._buckets) - 1:
+            raise ValueError(f"key {key} outside bucket range starting at {self._current}")
+        count = next(self._counter)
+        self._entries[cell] = count
+        self._buckets[key % len(self._buckets)].append((count, cell))
+
+    def pop(self):
+        """Remove and return a cell with the lowest key"""
+        buckets = self._buckets
+        while True:
+            bucket = buckets[self._current % len(buckets)]
+            while bucket:
+                count, cell = bucket.popleft()
+                if self._entries.get(cell) == count:
+                    del self._entries[cell]
+                    return cell
+            if not self._entries:
+                raise IndexError("pop from an empty BucketQueue")
+            self._current += 1
+
+    def __contains__(self, cell):
+        return cell in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+class CellSet:
+    """Insertion-ordered set of cells with constant-time membership.
+
+    Used for closed/visited sets: ``in`` is a hash lookup, while iteration
+    still replays cells in the order they were expanded.
+    """
+    def __init__(self, cells=()):
+        self._cells = dict.fromkeys(cells)
+
+    def append(self, cell):
+        self._cells[cell] = None
+
+    add = append
+
+    def discard(self, cell):
+        self._cells.pop(cell, None)
+
+    def __contains__(self, cell):
+        return cell in self._cells
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __iter__(self):
+        return iter(self._cells)
+
+class Frontier:
+    """Deque of cells (BFS queue or DFS stack) with constant-time membership"""
+    def __init__(self, cells=()):
+        self._items = deque(cells)
+        self._members = set(self._items)
+
+    def append(self, cell):
+        self._items.append(cell)
+        self._members.add(cell)
+
+    def pop(self):
+        cell = self._items.pop()
+        self._members.discard(cell)
+        return cell
+
+    def popleft(self):
+        cell = self._items.popleft()
+        self._members.discard(cell)
+        return cell
+
+    def clear(self):
+        self._items.clear()
+        self._members.clear()
+
+    def __contains__(self, cell):
+        return cell in self._members
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+class SearchFront:
+    """One direction of a bidirectional search.
+
+    Keeps its own g, f and parent maps instead of writing Cell.g_cost and
+    Cell.parent, so the two directions never overwrite each other.
+    f = g + potential(pos); see SearchSession.start for the potentials.
+    """
+    def __init__(self, root, potential):
+        self.potential = potential
+        self.g = {root: 0}
+        self.f = {root: potential(root.pos)}
+        self.parent = {root: None}
+        self.open = OpenSet([root], key=lambda c: (self.f[c], -self.g[c]))
+        self.closed = CellSet()
+        self.expanded = 0
+
+    def top_f(self):
+        """Lowest f on the open set"""
+        return self.f[self.open.peek()] if self.open else float('inf')
+
+    def chain(self, cell):
+        """Cells from cell back to this front's root"""
+        cells = []
+        while cell is not None:
+            cells.append(cell)
+            cell = self.parent[cell]
+        return cells
+
 #------------ ALGORITHM IMPLEMENTATIONS ------------
 
 class PathfindingAlgorithms:
     @staticmethod
-    def astar_step(open_set, closed_set, goal_pos, cells, surface):
-        """A* Algorithm"""
+    def astar_step(open_set, closed_set, goal_pos, cells, surface, heuristic=None, goal_bounds=None):
+        """A* Algorithm (steps outside the GoalBounds of goal_pos are skipped, if given)"""
         if not open_set:
             return open_set, closed_set, None, True, False
         
-        current = min(open_set, key=lambda c: (c.f_cost, c.h_cost))
-        open_set.remove(current)
+        current = open_set.pop()
         closed_set.append(current)
         
         if current.status != 'start':
@@ -318,18 +472,20 @@ class PathfindingAlgorithms:
         for neighbor in current.neighbours:
             if neighbor.status == 'blocked' or neighbor in closed_set:
                 continue
+            if goal_bounds is not None and not goal_bounds.allows(current.pos, neighbor.pos, goal_pos):
+                continue
             
             new_g = current.g_cost + current.get_distance_to(neighbor)
             
             if new_g < neighbor.g_cost or neighbor not in open_set:
                 neighbor.parent = current
                 neighbor.g_cost = new_g
-                neighbor.get_h(goal_pos)
+                neighbor.get_h(goal_pos, heuristic)
                 neighbor.get_f()
                 
                 if neighbor not in open_set:
                     neighbor.update('active', surface)
-                    open_set.append(neighbor)
+                open_set.push(neighbor)
         
         return open_set, closed_set, current, False, False
     
@@ -339,8 +495,7 @@ class PathfindingAlgorithms:
         if not open_set:
             return open_set, closed_set, None, True, False
         
-        open_set.sort(key=lambda c: c.g_cost)
-        current = open_set.pop(0)
+        current = open_set.pop()
         closed_set.append(current)
         
         if current.status != 'start':
@@ -353,7 +508,7 @@ class PathfindingAlgorithms:
             if neighbor.status == 'blocked' or neighbor in closed_set:
                 continue
             
-            new_g = current.g_cost + 10
+            new_g = current.g_cost + current.get_distance_to(neighbor)
             
             if new_g < neighbor.g_cost or neighbor not in open_set:
                 neighbor.parent = current
@@ -361,10 +516,15 @@ class PathfindingAlgorithms:
                 
                 if neighbor not in open_set:
                     neighbor.update('active', surface)
-                    open_set.append(neighbor)
+                open_set.push(neighbor)
         
         return open_set, closed_set, current, False, False
     
+    @staticmethod
+    def dial_step(buckets, closed_set, goal_pos, cells, surface):
+        """Dial's Algorithm (Dijkstra on a BucketQueue)"""
+        return PathfindingAlgorithms.dijkstra_step(buckets, closed_set, goal_pos, cells, surface)
+    
     @staticmethod
     def bfs_step(queue, visited, goal_pos, cells, surface):
         """Breadth-First Search"""
@@ -392,6 +552,27 @@ class PathfindingAlgorithms:
         
         return queue, visited, current, False, False
     
+    @staticmethod
+    def wavefront_step(wave, goal_pos, cells, surface):
+        """Breadth-First Search one whole layer at a time (vectorized)"""
+        if wave.layer[goal_pos[1], goal_pos[0]] < 0:
+            if wave.done:
+                return wave, None, True, False
+            new = wave.step()
+            if surface is not None:
+                for pos in wave.positions(new):
+                    cell = cells[pos]
+                    if cell.status != 'start':
+                        cell.update('closed', surface)
+            if wave.layer[goal_pos[1], goal_pos[0]] < 0:
+                return wave, None, wave.done, False
+        
+        parent = None
+        for pos in wave.path(goal_pos):
+            cells[pos].parent = parent
+            parent = cells[pos]
+        return wave, parent, True, True
+    
     @staticmethod
     def dfs_step(stack, visited, goal_pos, cells, surface):
         """Depth-First Search"""
@@ -420,13 +601,12 @@ class PathfindingAlgorithms:
         return stack, visited, current, False, False
     
     @staticmethod
-    def greedy_step(open_set, closed_set, goal_pos, cells, surface):
+    def greedy_step(open_set, closed_set, goal_pos, cells, surface, heuristic=None):
         """Greedy Best-First Search"""
         if not open_set:
             return open_set, closed_set, None, True, False
         
-        current = min(open_set, key=lambda c: c.h_cost)
-        open_set.remove(current)
+        current = open_set.pop()
         closed_set.append(current)
         
         if current.status != 'start':
@@ -442,170 +622,377 @@ class PathfindingAlgorithms:
                 continue
             
             neighbor.parent = current
-            neighbor.get_h(goal_pos)
+            neighbor.get_h(goal_pos, heuristic)
             neighbor.update('active', surface)
-            open_set.append(neighbor)
+            open_set.push(neighbor)
         
         return open_set, closed_set, current, False, False
     
     @staticmethod
-    def bidirectional_step(open_set_start, open_set_goal, closed_set_start, closed_set_goal, 
-                          goal_pos, cells, surface):
-        """Bidirectional Search - FIXED VERSION"""
-        # Check if either open set is empty
-        if not open_set_start or not open_set_goal:
-            return open_set_start, open_set_goal, closed_set_start, closed_set_goal, None, None, True, False
-        
-        meeting_cell = None
-        
-        # Search from start
-        if open_set_start:
-            current_start = min(open_set_start, key=lambda c: c.f_cost)
-            open_set_start.remove(current_start)
-            closed_set_start.append(current_start)
-            
-            if current_start.status != 'start':
-                current_start.update('closed', surface)
-            
-            # Check if meeting point found
-            if current_start in closed_set_goal:
-                meeting_cell = current_start
-                return open_set_start, open_set_goal, closed_set_start, closed_set_goal, current_start, meeting_cell, True, True
+    def bidirectional_step(front_start, front_goal, meeting, cells, surface):
+        """Bidirectional A* Search (meeting holds the best (cost, cell) joining the fronts)"""
+        if not front_start.open or not front_goal.open:
+            found = meeting is not None
+            if found:
+                PathfindingAlgorithms.bidirectional_link(meeting[1], front_start, front_goal)
+            return front_start, front_goal, None, meeting, True, found
+        
+        if meeting is not None and front_start.top_f() + front_goal.top_f() >= meeting[0]:
+            PathfindingAlgorithms.bidirectional_link(meeting[1], front_start, front_goal)
+            return front_start, front_goal, None, meeting, True, True
+        
+        if len(front_start.open) <= len(front_goal.open):
+            front, other = front_start, front_goal
+        else:
+            front, other = front_goal, front_start
+        
+        current = front.open.pop()
+        front.closed.append(current)
+        front.expanded += 1
+        
+        if current.status != 'start' and not current.istarget:
+            current.update('closed', surface)
+        
+        current_g = front.g[current]
+        for neighbor in current.neighbours:
+            if neighbor.status == 'blocked':
+                continue
             
-            for neighbor in current_start.neighbours:
-                if neighbor.status == 'blocked' or neighbor in closed_set_start:
-                    continue
-                
-                new_g = current_start.g_cost + current_start.get_distance_to(neighbor)
-                if new_g < neighbor.g_cost or neighbor not in open_set_start:
-                    neighbor.parent = current_start
-                    neighbor.g_cost = new_g
-                    neighbor.get_h(goal_pos)
-                    neighbor.get_f()
-                    
-                    if neighbor not in open_set_start:
-                        neighbor.update('active', surface)
-                        open_set_start.append(neighbor)
-        
-        # Search from goal
-        if open_set_goal:
-            current_goal = min(open_set_goal, key=lambda c: c.f_cost)
-            open_set_goal.remove(current_goal)
-            closed_set_goal.append(current_goal)
+            new_g = current_g + current.get_distance_to(neighbor)
+            if new_g >= front.g.get(neighbor, float('inf')):
+                continue
             
-            if current_goal.status != 'target':
-                current_goal.update('closed', surface)
+            front.g[neighbor] = new_g
+            front.f[neighbor] = new_g + front.potential(neighbor.pos)
+            front.parent[neighbor] = current
+            front.closed.discard(neighbor)  # Reopen if it was closed
             
-            # Check if meeting point found
-            if current_goal in closed_set_start:
-                meeting_cell = current_goal
-                return open_set_start, open_set_goal, closed_set_start, closed_set_goal, current_goal, meeting_cell, True, True
+            if neighbor not in front.open and neighbor.status != 'start' and not neighbor.istarget:
+                neighbor.update('active', surface)
+            front.open.push(neighbor)
             
-            for neighbor in current_goal.neighbours:
-                if neighbor.status == 'blocked' or neighbor in closed_set_goal:
-                    continue
-                
-                new_g = current_goal.g_cost + current_goal.get_distance_to(neighbor)
-                if new_g < neighbor.g_cost or neighbor not in open_set_goal:
-                    neighbor.parent = current_goal
-                    neighbor.g_cost = new_g
-                    # For goal search, heuristic is to start
-                    neighbor.get_h(cells[goal_pos].pos)  # This should be start pos, but we need start pos
-                    neighbor.get_f()
-                    
-                    if neighbor not in open_set_goal:
-                        neighbor.update('active', surface)
-                        open_set_goal.append(neighbor)
+            if neighbor in other.g:
+                cost = new_g + other.g[neighbor]
+                if meeting is None or cost < meeting[0]:
+                    meeting = (cost, neighbor)
         
-        return open_set_start, open_set_goal, closed_set_start, closed_set_goal, None, meeting_cell, False, False
+        return front_start, front_goal, current, meeting, False, False
+    
+    @staticmethod
+    def bidirectional_link(meeting_cell, front_start, front_goal):
+        """Point Cell.parent from the goal back to the start through meeting_cell"""
+        path = front_start.chain(meeting_cell)[::-1] + front_goal.chain(meeting_cell)[1:]
+        PathfindingAlgorithms.link_path(path)
+    
+    @staticmethod
+    def link_path(path):
+        """Set Cell.parent along a list of cells, first to last"""
+        path[0].parent = None
+        for previous, cell in zip(path, path[1:]):
+            cell.parent = previous
     
     @staticmethod
-    def jps_step(open_set, closed_set, goal_pos, cells, surface):
-        """Jump Point Search (simplified)"""
+    def dstar_lite_step(planner, cells, surface):
+        """D* Lite: one repair step of an incremental DStarLite planner.
+
+        The planner keeps its g and rhs values between calls, so after
+        cells change only the inconsistent ones are expanded again.
+        """
+        pos = planner.step()
+        if pos is None:
+            path = planner.path()
+            if not path:
+                return planner, None, True, False
+            PathfindingAlgorithms.link_path([cells[p] for p in path])
+            return planner, cells[planner.goal], True, True
+        
+        current = cells[pos]
+        if current.status not in ('start', 'blocked') and not current.istarget:
+            current.update('closed', surface)
+        return planner, current, False, False
+    
+    @staticmethod
+    def hpa_step(open_set, closed_set, goal_pos, cells, surface, query, heuristic=None):
+        """HPA* Search: A* over cluster entrances, then local refinement.
+
+        Expands abstract nodes (entrances plus start and goal) using the
+        edges of a HierarchicalQuery. Once the goal is reached the abstract
+        path is refined into cells and Cell.parent linked along it.
+        """
         if not open_set:
             return open_set, closed_set, None, True, False
         
-        current = min(open_set, key=lambda c: (c.f_cost, c.h_cost))
-        open_set.remove(current)
+        current = open_set.pop()
         closed_set.append(current)
         
         if current.status != 'start':
             current.update('closed', surface)
         
         if current.istarget:
+            nodes = []
+            cell = current
+            while cell is not None:
+                nodes.append(cell.pos)
+                cell = cell.parent
+            path = query.refine(nodes[::-1])
+            PathfindingAlgorithms.link_path([cells[pos] for pos in path])
             return open_set, closed_set, current, True, True
         
-        # Simplified jump point logic
-        for neighbor in current.neighbours:
-            if neighbor.status == 'blocked' or neighbor in closed_set:
+        for pos, cost in query.edges(current.pos):
+            neighbor = cells[pos]
+            if neighbor in closed_set:
                 continue
             
-            new_g = current.g_cost + current.get_distance_to(neighbor)
+            new_g = current.g_cost + cost
             
             if new_g < neighbor.g_cost or neighbor not in open_set:
                 neighbor.parent = current
                 neighbor.g_cost = new_g
-                neighbor.get_h(goal_pos)
+                neighbor.get_h(goal_pos, heuristic)
                 neighbor.get_f()
                 
                 if neighbor not in open_set:
                     neighbor.update('active', surface)
-                    open_set.append(neighbor)
+                open_set.push(neighbor)
         
         return open_set, closed_set, current, False, False
     
     @staticmethod
-    def idastar_step(open_set, closed_set, goal_pos, cells, surface, threshold, next_threshold):
-        """IDA* Search"""
+    def jps_step(open_set, closed_set, goal_pos, cells, surface, heuristic=None, jump_table=None):
+        """Jump Point Search.
+
+        Only jump points enter the open set: from each expanded node the
+        search scans straight and diagonal rays, skipping cells that an
+        optimal path could equally reach without passing through them, and
+        stops at the goal or at cells with forced neighbours. Diagonal moves
+        may cut corners, matching Cell.get_neighbour_coords. Straight scans
+        are read from a JumpScanner of the current walls; with a JumpTable
+        of cells (JPS+) diagonal scans become table lookups too.
+        """
+        jump = (jump_table if jump_table is not None else jump_scanner(cells)).jump
         if not open_set:
-            return open_set, closed_set, None, True, False, threshold, next_threshold
-        
-        current = min(open_set, key=lambda c: c.f_cost)
-        
-        if current.f_cost > threshold:
-            next_threshold = min(next_threshold, current.f_cost)
-            return open_set, closed_set, current, False, False, threshold, next_threshold
+            return open_set, closed_set, None, True, False
         
-        open_set.remove(current)
+        current = open_set.pop()
         closed_set.append(current)
         
         if current.status != 'start':
             current.update('closed', surface)
         
         if current.istarget:
-            return open_set, closed_set, current, True, True, threshold, next_threshold
+            PathfindingAlgorithms.jps_fill_path(current, cells)
+            return open_set, closed_set, current, True, True
         
-        for neighbor in current.neighbours:
-            if neighbor.status == 'blocked' or neighbor in closed_set:
+        for dx, dy in PathfindingAlgorithms.jps_directions(current, cells):
+            jump_pos = jump(current.pos, dx, dy, goal_pos)
+            if jump_pos is None:
                 continue
             
-            new_g = current.g_cost + current.get_distance_to(neighbor)
+            jump_point = cells[jump_pos]
+            if jump_point in closed_set:
+                continue
             
-            if new_g < neighbor.g_cost or neighbor not in open_set:
-                neighbor.parent = current
-                neighbor.g_cost = new_g
-                neighbor.get_h(goal_pos)
-                neighbor.get_f()
+            new_g = current.g_cost + PathfindingAlgorithms.octile_cost(current.pos, jump_pos)
+            
+            if new_g < jump_point.g_cost or jump_point not in open_set:
+                jump_point.parent = current
+                jump_point.g_cost = new_g
+                jump_point.get_h(goal_pos, heuristic)
+                jump_point.get_f()
                 
-                if neighbor not in open_set:
-                    neighbor.update('active', surface)
-                    open_set.append(neighbor)
+                if jump_point not in open_set:
+                    jump_point.update('active', surface)
+                open_set.push(jump_point)
+        
+        return open_set, closed_set, current, False, False
+    
+    @staticmethod
+    def walkable(cells, pos):
+        """True if pos is inside the grid and not blocked"""
+        cell = cells.get(pos)
+        return cell is not None and cell.status != 'blocked'
+    
+    @staticmethod
+    def octile_cost(a, b):
+        """Cost of a straight or diagonal run between two cells (10/14 per step)"""
+        dx = abs(a[0] - b[0])
+        dy = abs(a[1] - b[1])
+        return 14 * min(dx, dy) + 10 * abs(dx - dy)
+    
+    @staticmethod
+    def jps_directions(cell, cells):
+        """Directions worth scanning from a jump point (natural + forced neighbours)"""
+        if cell.parent is None:
+            return DIRECTIONS
+        
+        walkable = PathfindingAlgorithms.walkable
+        x, y = cell.pos
+        px, py = cell.parent.pos
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        
+        if dx and dy:
+            directions = [(0, dy), (dx, 0), (dx, dy)]
+            if not walkable(cells, (x - dx, y)):
+                directions.append((-dx, dy))
+            if not walkable(cells, (x, y - dy)):
+                directions.append((dx, -dy))
+        elif dx:
+            directions = [(dx, 0)]
+            if not walkable(cells, (x, y + 1)):
+                directions.append((dx, 1))
+            if not walkable(cells, (x, y - 1)):
+                directions.append((dx, -1))
+        else:
+            directions = [(0, dy)]
+            if not walkable(cells, (x + 1, y)):
+                directions.append((1, dy))
+            if not walkable(cells, (x - 1, y)):
+                directions.append((-1, dy))
+        return directions
+    
+    @staticmethod
+    def jps_jump(pos, dx, dy, goal_pos, cells):
+        """Scan from pos in direction (dx, dy); return the next jump point or None.
+
+        The cell-by-cell definition JumpScanner and JumpTable must agree with.
+
+        The recursive definition (a diagonal step is a jump point when a
+        straight jump from it finds one) is unrolled into loops so long rays
+        don't hit the recursion limit.
+        """
+        get = cells.get
+        
+        def free(x, y):
+            cell = get((x, y))
+            return cell is not None and cell.status != 'blocked'
+        
+        x, y = pos
+        if dx and dy:
+            while True:
+                x += dx
+                y += dy
+                if not free(x, y):
+                    return None
+                if (x, y) == goal_pos:
+                    return (x, y)
+                # Forced neighbours around a diagonal step
+                if ((free(x - dx, y + dy) and not free(x - dx, y)) or
+                        (free(x + dx, y - dy) and not free(x, y - dy))):
+                    return (x, y)
+                # Straight jumps from the diagonal cell
+                if (PathfindingAlgorithms.jps_jump((x, y), dx, 0, goal_pos, cells) is not None or
+                        PathfindingAlgorithms.jps_jump((x, y), 0, dy, goal_pos, cells) is not None):
+                    return (x, y)
+        
+        # Straight scan; each cell's side cells are reused as the previous
+        # cell's look-ahead, so a step costs three lookups instead of five
+        side_x, side_y = (0, 1) if dx else (1, 0)
+        x += dx
+        y += dy
+        if not free(x, y):
+            return None
+        left = free(x + side_x, y + side_y)
+        right = free(x - side_x, y - side_y)
+        while True:
+            if (x, y) == goal_pos:
+                return (x, y)
+            next_x, next_y = x + dx, y + dy
+            next_left = free(next_x + side_x, next_y + side_y)
+            next_right = free(next_x - side_x, next_y - side_y)
+            # Forced neighbour: a wall beside this cell ends at the next step
+            if (next_left and not left) or (next_right and not right):
+                return (x, y)
+            if not free(next_x, next_y):
+                return None
+            x, y = next_x, next_y
+            left, right = next_left, next_right
+    
+    @staticmethod
+    def jps_fill_path(goal_cell, cells):
+        """Link the cells between consecutive jump points so parents form a full path"""
+        node = goal_cell
+        while node.parent is not None:
+            parent = node.parent
+            x, y = node.pos
+            dx = (parent.pos[0] > x) - (parent.pos[0] < x)
+            dy = (parent.pos[1] > y) - (parent.pos[1] < y)
+            child = node
+            while (x + dx, y + dy) != parent.pos:
+                x += dx
+                y += dy
+                middle = cells[(x, y)]
+                child.parent = middle
+                child = middle
+            child.parent = parent
+            node = parent
+    
+    @staticmethod
+    def idastar_step(stack, on_path, goal_pos, cells, surface, threshold, next_threshold,
+                     heuristic=None, transpositions=None, max_transpositions=0):
+        """IDA* Search (depth-first, one child or backtrack per step)"""
+        if not stack:
+            return stack, on_path, None, True, False, threshold, next_threshold
+        
+        cell, g, successors = stack[-1]
+        if cell.istarget:
+            return stack, on_path, cell, True, True, threshold, next_threshold
+        
+        for neighbor in successors:
+            if neighbor.status == 'blocked' or neighbor in on_path:
+                continue
+            
+            new_g = g + cell.get_distance_to(neighbor)
+            f = new_g + neighbor.get_h(goal_pos, heuristic)
+            if f > threshold:
+                next_threshold = min(next_threshold, f)
+                continue
+            
+            if transpositions is not None:
+                if transpositions.get(neighbor.pos, float('inf')) <= new_g:
+                    continue
+                if len(transpositions) < max_transpositions or neighbor.pos in transpositions:
+                    transpositions[neighbor.pos] = new_g
+            
+            neighbor.parent = cell
+            neighbor.g_cost = new_g
+            neighbor.f_cost = f
+            stack.append((neighbor, new_g, iter(neighbor.neighbours)))
+            on_path.add(neighbor)
+            
+            if neighbor.istarget:
+                return stack, on_path, neighbor, True, True, threshold, next_threshold
+            
+            neighbor.update('active', surface)
+            return stack, on_path, neighbor, False, False, threshold, next_threshold
         
-        return open_set, closed_set, current, False, False, threshold, next_threshold
+        # All children tried: backtrack
+        stack.pop()
+        on_path.discard(cell)
+        if cell.status != 'start':
+            cell.update('closed', surface)
+        
+        if not stack:
+            if next_threshold == float('inf'):
+                # Nothing was cut off, so the goal is unreachable
+                return stack, on_path, None, True, False, threshold, next_threshold
+            
+            # Next iteration from the root with the raised threshold
+            threshold, next_threshold = next_threshold, float('inf')
+            if transpositions is not None:
+                transpositions.clear()
+            stack.append((cell, 0, iter(cell.neighbours)))
+            on_path.add(cell)
+        
+        return stack, on_path, None, False, False, threshold, next_threshold
     
     @staticmethod
-    def swarm_step(open_set, closed_set, goal_pos, cells, surface, pheromones):
+    def swarm_step(open_set, closed_set, goal_pos, cells, surface, pheromones, heuristic=None):
         """Swarm Algorithm (simplified)"""
         if not open_set:
             return open_set, closed_set, None, True, False
         
-        # Add pheromone influence to cost
-        for cell in open_set:
-            pheromone = pheromones.get(cell.pos, 1.0)
-            cell.f_cost = (cell.g_cost + cell.h_cost) * pheromone
-        
-        current = min(open_set, key=lambda c: c.f_cost)
-        open_set.remove(current)
+        current = open_set.pop()
         closed_set.append(current)
         
         if current.status != 'start':
@@ -626,15 +1013,377 @@ class PathfindingAlgorithms:
             if new_g < neighbor.g_cost or neighbor not in open_set:
                 neighbor.parent = current
                 neighbor.g_cost = new_g
-                neighbor.get_h(goal_pos)
+                neighbor.get_h(goal_pos, heuristic)
                 neighbor.get_f()
+                # Add pheromone influence to cost
+                neighbor.f_cost *= pheromones.get(neighbor.pos, 1.0)
                 
                 if neighbor not in open_set:
                     neighbor.update('active', surface)
-                    open_set.append(neighbor)
+                open_set.push(neighbor)
         
         return open_set, closed_set, current, False, False
 
+#------------ SEARCH SESSION ------------
+
+SearchResult = namedtuple('SearchResult', ['path', 'cost', 'expanded', 'time'])
+
+class SearchSession:
+    """One search run, a step() per expansion, drawn only if surface is given (options as solve())"""
+    def __init__(self, cells, start_pos, goal_pos, algorithm="A* Search",
+                 heuristic=None, surface=None, ida_table_size=0, hierarchy=None,
+                 components=None, jump_table=None, goal_bounds=None):
+        self.cells = cells
+        self.start_pos = start_pos
+        self.goal_pos = goal_pos
+        self.algorithm = algorithm
+        table = cells[start_pos].table
+        self.heuristic = goal_lookup(heuristic, table.X, table.Y)
+        self.surface = surface
+        
+        self.finished = False
+        self.path_found = False
+        self.end_cell = None
+        
+        self.open_set = OpenSet()
+        self.closed_set = CellSet()
+        self.queue = Frontier()
+        self.stack = Frontier()
+        self.visited = CellSet()
+        self.front_start = None
+        self.front_goal = None
+        self.meeting = None
+        self.pheromones = {}
+        self.ida_stack = []
+        self.ida_on_path = CellSet()
+        self.ida_threshold = 0
+        self.ida_next_threshold = float('inf')
+        self.ida_expanded = 0
+        self.ida_transpositions = {} if ida_table_size else None
+        self.ida_table_size = ida_table_size
+        self.hierarchy = hierarchy
+        self.hpa_query = None
+        self.components = components
+        self.jump_table = jump_table
+        self.goal_bounds = goal_bounds
+        self.planner = None
+        self.wave = None
+        
+        self.start()
+    
+    def start(self):
+        """Seed the frontier of the selected algorithm"""
+        algo_name = self.algorithm
+        start_cell = self.cells[self.start_pos]
+        start_cell.parent = None
+        
+        if self.components is not None and not self.components.connected(self.start_pos, self.goal_pos):
+            self.finished = True  # Unreachable: nothing to search
+            return
+        
+        if "IDA*" in algo_name:
+            start_cell.g_cost = 0
+            start_cell.get_h(self.goal_pos, self.heuristic)
+            start_cell.get_f()
+            self.ida_stack = [(start_cell, 0, iter(start_cell.neighbours))]
+            self.ida_on_path = CellSet([start_cell])
+            self.ida_threshold = start_cell.h_cost
+            self.ida_next_threshold = float('inf')
+            
+        elif "D* Lite" in algo_name:
+            self.planner = DStarLite(self.cells, self.start_pos, self.goal_pos, self.heuristic)
+            
+        elif "HPA*" in algo_name:
+            if self.hierarchy is None:
+                table = start_cell.table
+                self.hierarchy = ClusterGraph(self.cells, table.X, table.Y, constants['HPA_CLUSTER_SIZE'])
+            self.hpa_query = self.hierarchy.query(self.start_pos, self.goal_pos)
+            start_cell.g_cost = 0
+            start_cell.get_h(self.goal_pos, self.heuristic)
+            start_cell.get_f()
+            self.open_set = OpenSet([start_cell])
+            
+        elif "A*" in algo_name:
+            start_cell.g_cost = 0
+            start_cell.get_h(self.goal_pos, self.heuristic)
+            start_cell.get_f()
+            self.open_set = OpenSet([start_cell])
+            
+        elif "Dijkstra" in algo_name:
+            start_cell.g_cost = 0
+            self.open_set = OpenSet([start_cell], key=lambda c: c.g_cost)
+            
+        elif "Dial" in algo_name:
+            start_cell.g_cost = 0
+            self.open_set = BucketQueue([start_cell])
+            
+        elif "Breadth-First" in algo_name:
+            self.queue = Frontier([start_cell])
+            
+        elif "Wavefront" in algo_name:
+            table = start_cell.table
+            self.wave = Wavefront(self.cells, self.start_pos, table.X, table.Y)
+            
+        elif "Depth-First" in algo_name:
+            self.stack = Frontier([start_cell])
+            
+        elif "Greedy" in algo_name:
+            start_cell.get_h(self.goal_pos, self.heuristic)
+            self.open_set = OpenSet([start_cell], key=lambda c: c.h_cost)
+            
+        elif "Bidirectional" in algo_name:
+            # Average potentials: each front is guided by half of "closer to
+            # my target" minus "further from my root". Both fronts then see
+            # the same reduced edge costs, which is what makes the
+            # fF + fB >= best stop rule in bidirectional_step exact.
+            # Needs a consistent heuristic (not Manhattan) to be optimal.
+            h = self.heuristic
+            start_pos, goal_pos = self.start_pos, self.goal_pos
+            goal_cell = self.cells[goal_pos]
+            self.front_start = SearchFront(
+                start_cell, lambda pos: (h(pos, goal_pos) - h(pos, start_pos)) / 2)
+            self.front_goal = SearchFront(
+                goal_cell, lambda pos: (h(pos, start_pos) - h(pos, goal_pos)) / 2)
+            if start_cell == goal_cell:
+                self.meeting = (0, start_cell)
+            
+        elif "Jump Point" in algo_name or "JPS+" in algo_name:
+            if "JPS+" in algo_name and self.jump_table is None:
+                table = start_cell.table
+                self.jump_table = JumpTable(self.cells, table.X, table.Y)
+            start_cell.g_cost = 0
+            start_cell.get_h(self.goal_pos, self.heuristic)
+            start_cell.get_f()
+            self.open_set = OpenSet([start_cell])
+            
+        elif "Swarm" in algo_name:
+            start_cell.g_cost = 0
+            start_cell.get_h(self.goal_pos, self.heuristic)
+            start_cell.get_f()
+            self.open_set = OpenSet([start_cell], key=lambda c: c.f_cost)
+            self.pheromones = {}
+    
+    def step(self):
+        """Perform one expansion; returns True once the search has finished"""
+        if self.finished:
+            return True
+        
+        algo_name = self.algorithm
+        cells, goal_pos, surface, heuristic = self.cells, self.goal_pos, self.surface, self.heuristic
+        
+        if "IDA*" in algo_name:
+            (self.ida_stack, self.ida_on_path, current, self.finished, self.path_found,
+             self.ida_threshold, self.ida_next_threshold) = \
+                PathfindingAlgorithms.idastar_step(
+                    self.ida_stack, self.ida_on_path, goal_pos, cells, surface,
+                    self.ida_threshold, self.ida_next_threshold, heuristic,
+                    self.ida_transpositions, self.ida_table_size
+                )
+            if current is not None:
+                self.ida_expanded += 1
+        elif "D* Lite" in algo_name:
+            self.planner, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.dstar_lite_step(self.planner, cells, surface)
+        elif "HPA*" in algo_name:
+            self.open_set, self.closed_set, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.hpa_step(
+                    self.open_set, self.closed_set, goal_pos, cells, surface,
+                    self.hpa_query, heuristic
+                )
+        elif "A*" in algo_name:
+            self.open_set, self.closed_set, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.astar_step(
+                    self.open_set, self.closed_set, goal_pos, cells, surface, heuristic,
+                    self.goal_bounds
+                )
+        elif "Dijkstra" in algo_name:
+            self.open_set, self.closed_set, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.dijkstra_step(
+                    self.open_set, self.closed_set, goal_pos, cells, surface
+                )
+        elif "Dial" in algo_name:
+            self.open_set, self.closed_set, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.dial_step(
+                    self.open_set, self.closed_set, goal_pos, cells, surface
+                )
+        elif "Breadth-First" in algo_name:
+            self.queue, self.visited, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.bfs_step(
+                    self.queue, self.visited, goal_pos, cells, surface
+                )
+        elif "Wavefront" in algo_name:
+            self.wave, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.wavefront_step(self.wave, goal_pos, cells, surface)
+        elif "Depth-First" in algo_name:
+            self.stack, self.visited, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.dfs_step(
+                    self.stack, self.visited, goal_pos, cells, surface
+                )
+        elif "Greedy" in algo_name:
+            self.open_set, self.closed_set, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.greedy_step(
+                    self.open_set, self.closed_set, goal_pos, cells, surface, heuristic
+                )
+        elif "Bidirectional" in algo_name:
+            (self.front_start, self.front_goal, current, self.meeting,
+             self.finished, self.path_found) = \
+                PathfindingAlgorithms.bidirectional_step(
+                    self.front_start, self.front_goal, self.meeting, cells, surface
+                )
+            # The path is linked through Cell.parent back from the goal
+            current = cells[goal_pos]
+        elif "Jump Point" in algo_name or "JPS+" in algo_name:
+            self.open_set, self.closed_set, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.jps_step(
+                    self.open_set, self.closed_set, goal_pos, cells, surface, heuristic,
+                    self.jump_table
+                )
+        elif "Swarm" in algo_name:
+            self.open_set, self.closed_set, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.swarm_step(
+                    self.open_set, self.closed_set, goal_pos, cells, surface,
+                    self.pheromones, heuristic
+                )
+        else:
+            # Default to A*
+            self.open_set, self.closed_set, current, self.finished, self.path_found = \
+                PathfindingAlgorithms.astar_step(
+                    self.open_set, self.closed_set, goal_pos, cells, surface, heuristic
+                )
+        
+        if self.finished and self.path_found:
+            self.end_cell = current
+        return self.finished
+    
+    def replan(self, pos):
+        """Repair the plan after the cell at pos was blocked or unblocked.
+
+        Returns False if the algorithm cannot replan incrementally.
+        """
+        if self.planner is None:
+            return False
+        self.planner.update_cell(pos)
+        self.finished = self.path_found = False
+        self.end_cell = None
+        return True
+    
+    def move_start(self, pos):
+        """Plan from a new start without searching again.
+
+        Returns False if the algorithm cannot keep its search.
+        """
+        if self.planner is None:
+            return False
+        self.start_pos = pos
+        self.planner.move_start(pos)
+        self.finished = self.path_found = False
+        self.end_cell = None
+        return True
+    
+    def run(self):
+        """Step until the search finishes"""
+        while not self.step():
+            pass
+        return self.path_found
+    
+    @property
+    def expanded(self):
+        """Number of cells expanded so far"""
+        if "Breadth-First" in self.algorithm or "Depth-First" in self.algorithm:
+            return len(self.visited)
+        if "Bidirectional" in self.algorithm:
+            return sum(front.expanded for front in (self.front_start, self.front_goal) if front)
+        if "IDA*" in self.algorithm:
+            return self.ida_expanded
+        if "Wavefront" in self.algorithm:
+            return int(self.wave.reached.sum()) if self.wave else 0
+        if "D* Lite" in self.algorithm:
+            return self.planner.expanded if self.planner else 0
+        if "HPA*" in self.algorithm:
+            # Abstract nodes plus cells settled by the local searches
+            return len(self.closed_set) + (self.hpa_query.expanded if self.hpa_query else 0)
+        return len(self.closed_set)
+    
+    def path(self):
+        """Positions from start to the reached cell, or [] if no path was found"""
+        if not self.path_found or self.end_cell is None:
+            return []
+        
+        path = []
+        current = self.end_cell
+        while current is not None and len(path) <= len(self.cells):
+            path.append(current.pos)
+            if current.pos == self.start_pos:
+                break
+            current = current.parent
+        path.reverse()
+        return path
+    
+    def cost(self):
+        """Total move cost of path() (10 per straight step, 14 per diagonal)"""
+        path = self.path()
+        if not path:
+            return float('inf')
+        return sum(self.cells[a].get_distance_to(self.cells[b]) for a, b in zip(path, path[1:]))
+    
+    def touched(self):
+        """Every cell this session has put on a frontier or closed"""
+        if "IDA*" in self.algorithm:
+            # IDA* keeps no closed list, so any cell may have been visited
+            return self.cells.values()
+        extra = [front.g for front in (self.front_start, self.front_goal) if front]
+        if self.planner:
+            extra.append(self.cells[pos] for pos in self.planner.g)
+        if self.wave is not None:
+            extra.append(self.cells[pos] for pos in self.wave.positions(self.wave.reached))
+        return itertools.chain(self.open_set, self.closed_set, self.queue, self.stack,
+                               self.visited, *extra)
+
+def solve(grid, start, goal, algorithm="A* Search", heuristic=None, cache=None, **options):
+    """Run an algorithm to completion without drawing.
+
+    grid is a cell dict from make_grid(constants) (no surface needed) and
+    heuristic a HEURISTICS name or heuristic(pos, goal_pos) function (None
+    is octile); options go to SearchSession (e.g. ida_table_size, a
+    prebuilt hierarchy for HPA* or jump_table for JPS+, goal_bounds for A*, or a ComponentIndex as components to
+    report an unreachable goal without searching). Cells touched by the search are reset
+    afterwards, so the same grid can serve many queries. Returns a
+    SearchResult(path, cost, expanded, time).
+    
+    With a PathCache as cache, a query already answered on the same walls
+    returns the stored result without searching. Walls must then be
+    changed through Cell.update, which bumps the grid version.
+    """
+    if cache is not None:
+        key = cache.key(grid, algorithm, heuristic, start, goal)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    start_cell, goal_cell = grid[start], grid[goal]
+    saved = [(cell, cell.status, cell.istarget) for cell in (start_cell, goal_cell)]
+    goal_cell.istarget = True
+    
+    t0 = time.perf_counter()
+    session = SearchSession(grid, start, goal, algorithm, heuristic, **options)
+    session.run()
+    elapsed = time.perf_counter() - t0
+    
+    result = SearchResult(session.path(), session.cost(), session.expanded, elapsed)
+    
+    for cell in itertools.chain(session.touched(), (grid[pos] for pos in result.path)):
+        cell.reset()
+        if cell.status in ('active', 'closed', 'path'):
+            cell.status = 'empty'
+    for cell, status, istarget in saved:
+        cell.reset()
+        cell.status = status
+        cell.istarget = istarget
+    
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
 #------------ MAZE GENERATION ------------
 
 class MazeGenerator:
@@ -817,6 +1566,7 @@ class PathfindingVisualizer:
         self.total_height = self.grid_height
         
         pygame.init()
+        text_cache.clear()
         self.screen = pygame.display.set_mode((self.total_width, self.total_height))
         pygame.display.set_caption("Ultimate Pathfinding Visualizer - Tabbed Interface")
         self.clock = pygame.time.Clock()
@@ -826,44 +1576,58 @@ class PathfindingVisualizer:
         self.sidebar_surf = pygame.Surface((self.sidebar_width, self.total_height))
         
         # Grid
-        self.cells = make_grid(constants, self.grid_surf)
+        if constants['GRID_BACKEND'] == 'array':
+            self.cells = make_array_grid(constants, self.grid_surf)
+        else:
+            self.cells = make_grid(constants, self.grid_surf)
         self.obstacles = []
         
+        # Dirty-rect rendering: cells drawn by Cell.update collect their rects
+        # in the grid table, and only those are copied to the screen
+        self.grid_table = self.cells[constants['STARTPOS']].table
+        self.grid_table.dirty = []
+        self.renderer = None
+        if constants['GRID_RENDERER'] == 'surfarray':
+            self.renderer = ArrayRenderer(self.grid_table, constants['COLORS']['BG_COL'],
+                                          constants['COLORS']['GRID_LINE'])
+        self.redraw_all = True  # Whole grid, e.g. after the surface was cleared
+        self.sidebar_dirty = True
+        
         # Positions
         self.start_pos = constants['STARTPOS']
         self.goal_pos = constants['GOALPOS']
         
         # Current selections
-        self.current_algo_category = "Basic"
         self.current_algo_category_num = 0
         self.current_algorithm = 0  # Index in current category
         self.current_maze = 0
+        self.current_heuristic = HEURISTIC_CHOICES.index(DEFAULT_HEURISTIC)
         
         # Tab system
         self.tabs = ["Algorithms", "Mazes", "Controls"]
         self.current_tab = 0  # 0: Algorithms, 1: Mazes, 2: Controls
         
         # Search state
+        self.scheduler = StepScheduler(*SPEED_LEVELS[constants['SEARCH_SPEED']][1:])
         self.searching = False
         self.paused = False
         self.finished = False
         self.path_found = False
         
-        # Algorithm state
-        self.open_set = []
-        self.closed_set = []
-        self.queue = deque()
-        self.stack = []
-        self.visited = []
-        
-        # Advanced algorithm states
-        self.open_set_start = []
-        self.open_set_goal = []
-        self.closed_set_start = []
-        self.closed_set_goal = []
-        self.pheromones = {}
-        self.ida_threshold = 0
-        self.ida_next_threshold = float('inf')
+        # Algorithm state (see SearchSession)
+        self.session = None
+        self.worker = None  # SearchWorker running the search in the background, if any
+        self.worker_error = None  # Exception name of the last failed worker, shown as the status
+        self.restart_pending = False  # Walls were edited under a worker: search again on mouse up
+        self.hierarchy = None  # HPA* cluster graph, kept in sync by notify_cell_change
+        self.jump_table = None  # JPS+ jump distances, likewise
+        self.components = ComponentIndex(self.cells, constants['X'], constants['Y'])
+        self.path_cache = PathCache(constants['PATH_CACHE_BYTES'])
+        self.cache_key = None  # Key the running search's result is stored under
+        self.flow_field = None  # FlowField to the goal, rebuilt when stale
+        self.show_flow_field = False
+        self.landmarks = None  # ALT tables, rebuilt when stale
+        self.goal_bounds = None  # A* goal bounds, loaded with a saved grid
         
         # Statistics
         self.stats = {
@@ -886,6 +1650,7 @@ class PathfindingVisualizer:
     
     def initialize_grid(self):
         """Initialize the grid"""
+        self.redraw_all = True
         self.grid_surf.fill(constants['COLORS']['BG_COL'])
         
         # Draw grid lines
@@ -898,6 +1663,10 @@ class PathfindingVisualizer:
                            (0, y * constants['TILESIZE']),
                            (self.grid_width, y * constants['TILESIZE']))
         
+        # Cells over the background; from here on only changed cells are redrawn
+        for cell in self.cells.values():
+            cell.draw_cell(self.grid_surf)
+        
         # Set start and goal
         self.cells[self.start_pos].update('start', self.grid_surf)
         self.cells[self.goal_pos].istarget = True
@@ -936,7 +1705,7 @@ class PathfindingVisualizer:
         self.category_buttons[0].active = True
         
         # Algorithm buttons for current category
-        algo_start_y = start_y + 35
+        algo_start_y = self.algo_start_y = start_y + 35
         current_category = list(ALGORITHMS.keys())[0]
         for i, algo in enumerate(ALGORITHMS[current_category]):
             btn = Button(10, algo_start_y + i * (button_height + 5), 
@@ -947,6 +1716,19 @@ class PathfindingVisualizer:
         if self.algo_buttons:
             self.algo_buttons[0].active = True
         
+        # Heuristic selector below the longest algorithm list, but above the
+        # stats panel when the window is too short for the usual gap
+        self.stats_y = self.total_height - 214
+        heuristic_y = min(algo_start_y + max(map(len, ALGORITHMS.values())) * (button_height + 5) + 55,
+                          self.stats_y - 31)
+        heuristic_width = self.sidebar_width // len(HEURISTIC_CHOICES)
+        self.heuristic_buttons = []
+        for i, name in enumerate(HEURISTIC_CHOICES):
+            label = HEURISTICS[name].label if name in HEURISTICS else name
+            btn = TabButton(i * heuristic_width, heuristic_y, heuristic_width, 25, label)
+            btn.active = (i == self.current_heuristic)
+            self.heuristic_buttons.append(btn)
+        
         # Maze buttons (will be shown when Mazes tab is active)
         maze_start_y = start_y + 10
         for i, maze in enumerate(MAZE_TYPES):
@@ -971,25 +1753,77 @@ class PathfindingVisualizer:
             'speed_up': Button(10, control_start_y + 3 * (button_height + 10),
                              button_width // 2 - 5, button_height, "Speed +"),
             'speed_down': Button(self.sidebar_width // 2 + 5, control_start_y + 3 * (button_height + 10),
-                               button_width // 2 - 5, button_height, "Speed -")
+                               button_width // 2 - 5, button_height, "Speed -"),
+            'flow_field': Button(10, control_start_y + 4 * (button_height + 10),
+                               button_width, button_height, "Show Flow Field", is_toggle=True),
+            'save': Button(10, control_start_y + 5 * (button_height + 10),
+                         button_width // 2 - 5, button_height, "Save Grid"),
+            'load': Button(self.sidebar_width // 2 + 5, control_start_y + 5 * (button_height + 10),
+                         button_width // 2 - 5, button_height, "Load Grid")
         }
     
     def draw_grid(self):
-        """Draw the grid"""
-        # Draw cells
-        for cell in self.cells.values():
-            cell.draw_cell(self.grid_surf)
-        
-        # Blit grid to screen
-        self.screen.blit(self.grid_surf, (self.sidebar_width, 0))
+        """Copy the cells redrawn since the last frame to the screen; returns the screen rects changed"""
+        dirty = self.grid_table.dirty
+        grid_rect = pygame.Rect(self.sidebar_width, 0, self.grid_width, self.grid_height)
+        # The flow field overlays the whole grid, so any change redraws all of it
+        if self.redraw_all or (dirty and self.show_flow_field):
+            self.redraw_all = False
+            dirty.clear()
+            if self.renderer is not None:
+                self.renderer.draw(self.grid_surf)
+            self.screen.blit(self.grid_surf, grid_rect)
+            if self.show_flow_field:
+                self.draw_flow_field()
+            return [grid_rect]
+        if not dirty:
+            return []
+        
+        # Many small rects cost more to present than their bounding box, and
+        # the array renderer paints any region in one go
+        if len(dirty) > 64 or self.renderer is not None:
+            rects = [dirty[0].unionall(dirty)]
+        else:
+            rects = dirty[:]
+        dirty.clear()
+        if self.renderer is not None:
+            rects = [self.renderer.draw(self.grid_surf, rects[0])]
+        for rect in rects:
+            self.screen.blit(self.grid_surf, rect.move(self.sidebar_width, 0), rect)
+        return [rect.move(self.sidebar_width, 0) for rect in rects]
+    
+    def get_flow_field(self):
+        """Flow field to the goal, recomputed only when the goal or the walls changed"""
+        field = self.flow_field
+        if field is None or field.goal != self.goal_pos or field.stale():
+            self.flow_field = FlowField(self.cells, self.goal_pos, constants['X'], constants['Y'])
+        return self.flow_field
+    
+    def draw_flow_field(self):
+        """Draw each reachable cell's next step towards the goal as a short line"""
+        field = self.get_flow_field()
+        size = constants['TILESIZE']
+        reach = size * 0.4
+        col = constants['COLORS']['FLOW_COL']
+        ys, xs = (field.direction >= 0).nonzero()
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            dx, dy, _ = MOVES[field.direction[y, x]]
+            cx = self.sidebar_width + x * size + size // 2
+            cy = y * size + size // 2
+            end = (cx + dx * reach, cy + dy * reach)
+            pygame.draw.line(self.screen, col, (cx, cy), end, 2)
+            pygame.draw.circle(self.screen, col, end, 2)
     
     def draw_sidebar(self):
-        """Draw the tabbed sidebar"""
+        """Draw the tabbed sidebar if anything on it may have changed; returns the screen rects changed"""
+        if not self.sidebar_dirty:
+            return []
+        self.sidebar_dirty = False
         self.sidebar_surf.fill(constants['COLORS']['UI_BG'])
         
         # Draw title
-        title_font = pygame.font.SysFont('Arial', 16, bold=True)
-        title = title_font.render("PATHFINDING VISUALIZER", True, constants['COLORS']['UI_TEXT'])
+        title_font = text_cache.font('Arial', 16, bold=True)
+        title = text_cache.render("PATHFINDING VISUALIZER", title_font, constants['COLORS']['UI_TEXT'])
         self.sidebar_surf.blit(title, (self.sidebar_width // 2 - title.get_width() // 2, 35))
         
         # Draw tab buttons
@@ -1011,12 +1845,10 @@ class PathfindingVisualizer:
         self.draw_instructions()
         
         # Blit sidebar to screen
-        self.screen.blit(self.sidebar_surf, (0, 0))
+        return [self.screen.blit(self.sidebar_surf, (0, 0))]
     
     def draw_algorithms_tab(self):
         """Draw the algorithms tab content"""
-        start_y = constants['TAB_HEIGHT'] + 40
-        
         # Draw category buttons
         for btn in self.category_buttons:
             btn.draw(self.sidebar_surf)
@@ -1026,15 +1858,21 @@ class PathfindingVisualizer:
             btn.draw(self.sidebar_surf)
         
         # Draw current selection info
-        font = pygame.font.SysFont('Arial', 12)
-        current_category = list(ALGORITHMS.keys())[self.current_algo_category_num]
-        # current_category = self.current_algo_category
-        print(current_category)
-        current_algo_name = ALGORITHMS[current_category][self.current_algorithm]
-        print(current_algo_name)
-        
-        info_text = font.render(f"Selected: {current_algo_name}", True, constants['COLORS']['UI_TEXT'])
-        self.sidebar_surf.blit(info_text, (10, start_y + len(self.algo_buttons) * 35 + 20))
+        font = text_cache.font('Arial', 12)
+        current_algo_name = self.get_current_algorithm_name()
+        
+        info_text = text_cache.render(f"Selected: {current_algo_name}", font, constants['COLORS']['UI_TEXT'])
+        self.sidebar_surf.blit(info_text, (10, self.algo_start_y + len(self.algo_buttons) * 35))
+        
+        # Draw heuristic selector
+        heuristic = self.get_current_heuristic_name()
+        label = f"Heuristic: {heuristic}"
+        if heuristic in HEURISTICS and not HEURISTICS[heuristic].admissible:
+            label += " (may overestimate)"
+        label_text = text_cache.render(label, font, constants['COLORS']['UI_TEXT'])
+        self.sidebar_surf.blit(label_text, (10, self.heuristic_buttons[0].rect.y - 18))
+        for btn in self.heuristic_buttons:
+            btn.draw(self.sidebar_surf)
     
     def draw_mazes_tab(self):
         """Draw the mazes tab content"""
@@ -1045,9 +1883,9 @@ class PathfindingVisualizer:
             btn.draw(self.sidebar_surf)
         
         # Draw current selection info
-        font = pygame.font.SysFont('Arial', 12)
+        font = text_cache.font('Arial', 12)
         current_maze_name = MAZE_TYPES[self.current_maze]
-        info_text = font.render(f"Selected: {current_maze_name}", True, constants['COLORS']['UI_TEXT'])
+        info_text = text_cache.render(f"Selected: {current_maze_name}", font, constants['COLORS']['UI_TEXT'])
         self.sidebar_surf.blit(info_text, (10, start_y + len(self.maze_buttons) * 35 + 20))
     
     def draw_controls_tab(self):
@@ -1059,51 +1897,79 @@ class PathfindingVisualizer:
             btn.draw(self.sidebar_surf)
         
         # Draw speed info
-        font = pygame.font.SysFont('Arial', 12)
-        speed_text = font.render(f"Speed: {constants['SEARCH_SPEED']}x", True, constants['COLORS']['UI_TEXT'])
-        self.sidebar_surf.blit(speed_text, (10, constants['TAB_HEIGHT'] + 250))
+        font = text_cache.font('Arial', 12)
+        speed_text = text_cache.render(f"Speed: {SPEED_LEVELS[constants['SEARCH_SPEED']][0]}", font,
+                                       constants['COLORS']['UI_TEXT'])
+        self.sidebar_surf.blit(speed_text, (10, constants['TAB_HEIGHT'] + 290))
     
     def draw_stats(self):
         """Draw statistics at bottom of sidebar"""
-        stats_y = self.total_height - 180
+        stats_y = self.stats_y
         
-        font = pygame.font.SysFont('Arial', 12)
+        font = text_cache.font('Arial', 12)
         stats = [
             f"Algorithm: {self.get_current_algorithm_name()}",
+            f"Heuristic: {self.get_current_heuristic_name()}",
             f"Maze: {MAZE_TYPES[self.current_maze]}",
             f"Visited: {self.stats['visited']}",
             f"Path Length: {self.stats['path_length']}",
             f"Time: {self.stats['time']:.2f}s",
-            f"Status: {'Searching' if self.searching else 'Ready'}",
+            f"Cache: {self.path_cache.hits} hits / {self.path_cache.misses} misses "
+            f"({self.path_cache.hit_rate():.0%})",
+            f"Status: {self.get_status()}",
             f"Paused: {'Yes' if self.paused else 'No'}"
         ]
         
         for i, text in enumerate(stats):
-            text_surf = font.render(text, True, constants['COLORS']['UI_TEXT'])
+            text_surf = text_cache.render(text, font, constants['COLORS']['UI_TEXT'])
             self.sidebar_surf.blit(text_surf, (10, stats_y + i * 18))
     
     def draw_instructions(self):
         """Draw instructions at very bottom"""
         instructions_y = self.total_height - 40
         
-        font = pygame.font.SysFont('Arial', 10)
+        font = text_cache.font('Arial', 10)
         instructions = [
             "Left Click: Draw/Erase | Right Click: Move Start | Space: Pause/Resume",
-            "R: Reset | C: Clear | G: Generate Maze | ESC: Quit"
+            "R: Reset | C: Clear | G: Generate Maze | F: Flow Field",
+            "S/L: Save/Load Grid | W: Worker | ESC: Quit"
         ]
         
         for i, instruction in enumerate(instructions):
-            text_surf = font.render(instruction, True, constants['COLORS']['UI_TEXT'])
+            text_surf = text_cache.render(instruction, font, constants['COLORS']['UI_TEXT'])
             self.sidebar_surf.blit(text_surf, (5, instructions_y + i * 12))
     
     def get_current_algorithm_name(self):
         """Get the name of the currently selected algorithm"""
         categories = list(ALGORITHMS.keys())
-        current_category = self.current_algo_category
-        print(current_category)
-        print(ALGORITHMS[current_category][self.current_algorithm])
+        current_category = categories[self.current_algo_category_num]
         return ALGORITHMS[current_category][self.current_algorithm]
     
+    def get_status(self):
+        """Search status line for the stats panel"""
+        if self.worker_error is not None:
+            return f'Worker failed: {self.worker_error}'
+        if self.finished and not self.path_found:
+            return 'No path'
+        if self.worker is not None:
+            return 'Searching (worker)'
+        return 'Searching' if self.searching else 'Ready'
+    
+    def get_current_heuristic_name(self):
+        """Get the name of the currently selected heuristic"""
+        return HEURISTIC_CHOICES[self.current_heuristic]
+    
+    def get_current_heuristic(self):
+        """The selected heuristic as SearchSession takes it (a name, or the ALT tables)"""
+        name = self.get_current_heuristic_name()
+        return self.get_landmarks() if name == 'ALT' else name
+    
+    def get_landmarks(self):
+        """ALT landmark tables of the grid, recomputed when the walls changed"""
+        if self.landmarks is None or self.landmarks.stale():
+            self.landmarks = Landmarks(self.cells, constants['X'], constants['Y'], constants['LANDMARKS'])
+        return self.landmarks
+    
     def handle_events(self):
         """Handle all events"""
         mouse_pos = pygame.mouse.get_pos()
@@ -1112,10 +1978,15 @@ class PathfindingVisualizer:
         # Check for mouse click
         mouse_clicked = False
         for event in pygame.event.get():
+            # Hover, clicks and keys can all change the sidebar
+            self.sidebar_dirty = True
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             
+            if event.type == pygame.VIDEOEXPOSE:
+                self.redraw_all = True
+            
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_clicked = True
                 
@@ -1132,32 +2003,36 @@ class PathfindingVisualizer:
                         if cell.status == 'blocked':
                             self.draw_mode = 'erase'
                             cell.update('empty', self.grid_surf)
+                            self.notify_cell_change(grid_pos)
                             if grid_pos in self.obstacles:
                                 self.obstacles.remove(grid_pos)
                         else:
                             self.draw_mode = 'block'
                             if cell.status not in ['start', 'target']:
                                 cell.update('blocked', self.grid_surf)
+                                self.notify_cell_change(grid_pos)
                                 if grid_pos not in self.obstacles:
                                     self.obstacles.append(grid_pos)
                     
                     elif event.button == 3:  # Right click - move start
                         if grid_pos != self.start_pos and grid_pos != self.goal_pos:
-                            if self.cells[grid_pos].status == 'empty':
-                                self.cells[self.start_pos].update('empty', self.grid_surf)
-                                self.start_pos = grid_pos
-                                self.cells[self.start_pos].update('start', self.grid_surf)
-                                self.reset_search()
+                            self.move_start(grid_pos)
             
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
                     self.drawing = False
                     self.last_drawn = None
+                    if self.restart_pending:
+                        self.restart_pending = False
+                        self.start_search()
             
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     if self.searching:
                         self.paused = not self.paused
+                        self.scheduler.start()  # Don't catch up on the pause
+                        if self.worker is not None:
+                            self.worker.pause(self.paused)
                     else:
                         self.start_search()
                 elif event.key == pygame.K_r:
@@ -1166,6 +2041,14 @@ class PathfindingVisualizer:
                     self.clear_grid()
                 elif event.key == pygame.K_g:
                     self.generate_maze()
+                elif event.key == pygame.K_f:
+                    self.toggle_flow_field()
+                elif event.key == pygame.K_s:
+                    self.save_grid()
+                elif event.key == pygame.K_l:
+                    self.load_grid()
+                elif event.key == pygame.K_w:
+                    constants['SEARCH_WORKER'] = not constants['SEARCH_WORKER']
                 elif event.key == pygame.K_ESCAPE:
                     pygame.quit()
                     sys.exit()
@@ -1208,14 +2091,56 @@ class PathfindingVisualizer:
                 if self.draw_mode == 'block':
                     if cell.status not in ['start', 'target', 'blocked']:
                         cell.update('blocked', self.grid_surf)
+                        self.notify_cell_change(grid_pos)
                         if grid_pos not in self.obstacles:
                             self.obstacles.append(grid_pos)
                 else:  # erase
                     if cell.status == 'blocked':
                         cell.update('empty', self.grid_surf)
+                        self.notify_cell_change(grid_pos)
                         if grid_pos in self.obstacles:
                             self.obstacles.remove(grid_pos)
     
+    def notify_cell_change(self, pos):
+        """Called after the cell at pos was blocked or unblocked"""
+        self.components.update_cell(pos)
+        if self.hierarchy is not None:
+            self.hierarchy.update_cell(pos)
+        if self.jump_table is not None:
+            self.jump_table.update_cell(pos)
+        if self.session is not None and self.session.planner is not None:
+            # Incremental engine: repair the plan and show the new path live
+            self.clear_path()
+            self.session.replan(pos)
+            self.finished = self.path_found = False
+            self.cache_key = self.make_cache_key()
+        elif self.worker is not None:
+            # The worker searches a snapshot of the walls, so its events would
+            # repaint this cell: drop it, and start over once the stroke ends
+            self.reset_search()
+            self.restart_pending = True
+        else:
+            self.cache_key = None  # The running search no longer matches the walls
+    
+    def move_start(self, pos):
+        """Move the start to pos; D* Lite repairs its plan from there, other searches reset"""
+        cell = self.cells[pos]
+        if self.session is not None and self.session.planner is not None:
+            if cell.status == 'blocked':
+                return
+            self.clear_path()
+            self.cells[self.start_pos].update('empty', self.grid_surf)
+            self.start_pos = pos
+            cell.update('start', self.grid_surf)
+            self.session.move_start(pos)
+            self.finished = self.path_found = False
+            self.cache_key = self.make_cache_key()
+        elif cell.status == 'empty':
+            self.cells[self.start_pos].update('empty', self.grid_surf)
+            self.start_pos = pos
+            cell.update('start', self.grid_surf)
+            self.reset_search()
+    
     def handle_algorithms_tab(self, mouse_pos, mouse_clicked):
         """Handle interactions in algorithms tab"""
         # Handle category buttons
@@ -1226,11 +2151,17 @@ class PathfindingVisualizer:
                 self.update_category_buttons()
                 # Update algorithm buttons for this category
                 self.update_algorithm_buttons_for_category(categories[i])
+                self.select_algorithm(0)  # Categories differ in length
         
         # Handle algorithm buttons
         for i, btn in enumerate(self.algo_buttons):
             if btn.update(mouse_pos, mouse_clicked):
                 self.select_algorithm(i)
+        
+        # Handle heuristic buttons
+        for i, btn in enumerate(self.heuristic_buttons):
+            if btn.update(mouse_pos, mouse_clicked):
+                self.select_heuristic(i)
     
     def handle_mazes_tab(self, mouse_pos, mouse_clicked):
         """Handle interactions in mazes tab"""
@@ -1251,9 +2182,29 @@ class PathfindingVisualizer:
                 elif name == 'reset':
                     self.reset_search()
                 elif name == 'speed_up':
-                    constants['SEARCH_SPEED'] = min(100, constants['SEARCH_SPEED'] + 10)
+                    self.change_speed(1)
                 elif name == 'speed_down':
-                    constants['SEARCH_SPEED'] = max(5, constants['SEARCH_SPEED'] - 10)
+                    self.change_speed(-1)
+                elif name == 'flow_field':
+                    self.toggle_flow_field()
+                elif name == 'save':
+                    self.save_grid()
+                elif name == 'load':
+                    self.load_grid()
+    
+    def change_speed(self, delta):
+        """Move delta steps along SPEED_LEVELS"""
+        level = min(len(SPEED_LEVELS) - 1, max(0, constants['SEARCH_SPEED'] + delta))
+        constants['SEARCH_SPEED'] = level
+        self.scheduler.set(*SPEED_LEVELS[level][1:])
+        if self.worker is not None:
+            self.worker.set_speed(*SPEED_LEVELS[level][1:])
+    
+    def toggle_flow_field(self):
+        """Show or hide the flow field overlay"""
+        self.redraw_all = True
+        self.show_flow_field = not self.show_flow_field
+        self.control_buttons['flow_field'].active = self.show_flow_field
     
     def update_tab_buttons(self):
         """Update which tab button is active"""
@@ -1263,7 +2214,7 @@ class PathfindingVisualizer:
     def update_category_buttons(self):
         """Update which category button is active"""
         for i, btn in enumerate(self.category_buttons):
-            btn.active = (i == self.current_algo_category)
+            btn.active = (i == self.current_algo_category_num)
     
     def update_algorithm_buttons_for_category(self, category):
         """Update algorithm buttons for the given category"""
@@ -1273,7 +2224,7 @@ class PathfindingVisualizer:
         # Create new buttons for this category
         button_width = self.sidebar_width - 20
         button_height = 30
-        start_y = constants['TAB_HEIGHT'] + 70
+        start_y = self.algo_start_y  # Where create_ui put the first list
         
         for i, algo in enumerate(ALGORITHMS[category]):
             btn = Button(10, start_y + i * (button_height + 5), 
@@ -1291,6 +2242,12 @@ class PathfindingVisualizer:
         for i, btn in enumerate(self.algo_buttons):
             btn.active = (i == index)
     
+    def select_heuristic(self, index):
+        """Select a heuristic"""
+        self.current_heuristic = index
+        for i, btn in enumerate(self.heuristic_buttons):
+            btn.active = (i == index)
+    
     def select_maze(self, index):
         """Select a maze type"""
         self.current_maze = index
@@ -1311,6 +2268,8 @@ class PathfindingVisualizer:
         
         # Clear old obstacles
         self.obstacles = []
+        self.hierarchy = None  # Rebuilt by the next HPA* search
+        self.jump_table = None  # and the next JPS+ search
         for cell in self.cells.values():
             if cell.status == 'blocked':
                 cell.update('empty', self.grid_surf)
@@ -1370,14 +2329,46 @@ class PathfindingVisualizer:
         for pos, cell in self.cells.items():
             if cell.status == 'blocked':
                 self.obstacles.append(pos)
+        self.components.rebuild()
+    
+    def save_grid(self):
+        """Save the walls, start and goal to GRID_FILE, with the ALT tables next to it"""
+        path = constants['GRID_FILE']
+        save_grid(self.cells, path, self.start_pos, self.goal_pos)
+        self.get_landmarks().save(landmark_path(path))
+    
+    def load_grid(self):
+        """Load a grid saved by save_grid, reusing its ALT tables and goal bounds"""
+        path = constants['GRID_FILE']
+        if not os.path.exists(path):
+            return
+        self.reset_search()
+        self.hierarchy = None  # Rebuilt by the next HPA* search
+        self.jump_table = None  # and the next JPS+ search
+        for pos in (self.start_pos, self.goal_pos):
+            self.cells[pos].istarget = False
+            self.cells[pos].update('empty', self.grid_surf)
+        
+        self.start_pos, self.goal_pos = load_grid(self.cells, path, self.grid_surf)
+        self.cells[self.start_pos].update('start', self.grid_surf)
+        self.cells[self.goal_pos].istarget = True
+        self.cells[self.goal_pos].update('target', self.grid_surf)
+        
+        self.obstacles = [pos for pos, cell in self.cells.items() if cell.status == 'blocked']
+        self.components.rebuild()
+        self.landmarks = Landmarks.load(landmark_path(path), self.cells, constants['X'], constants['Y'])
+        self.goal_bounds = GoalBounds.load(bounds_path(path), self.cells, constants['X'], constants['Y'])
     
     def clear_grid(self):
         """Clear all obstacles"""
         self.reset_search()
         self.obstacles = []
+        self.hierarchy = None  # Rebuilt by the next HPA* search
+        self.jump_table = None  # and the next JPS+ search
         for cell in self.cells.values():
             if cell.status == 'blocked':
                 cell.update('empty', self.grid_surf)
+        self.components.rebuild()
     
     def reset_search(self):
         """Reset the search"""
@@ -1387,18 +2378,12 @@ class PathfindingVisualizer:
         self.path_found = False
         
         # Reset algorithm state
-        self.open_set = []
-        self.closed_set = []
-        self.queue.clear()
-        self.stack = []
-        self.visited = []
-        self.open_set_start = []
-        self.open_set_goal = []
-        self.closed_set_start = []
-        self.closed_set_goal = []
-        self.pheromones = {}
-        self.ida_threshold = 0
-        self.ida_next_threshold = float('inf')
+        self.session = None
+        self.worker_error = None
+        self.restart_pending = False
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
         
         # Reset cells (but keep obstacles, start, and goal)
         for cell in self.cells.values():
@@ -1418,6 +2403,30 @@ class PathfindingVisualizer:
         # Reset stats
         self.stats = {'visited': 0, 'path_length': 0, 'time': 0, 'start_time': 0}
     
+    def get_hierarchy(self):
+        """The HPA* cluster graph of the grid, built on first use"""
+        if self.hierarchy is None and "HPA*" in self.get_current_algorithm_name():
+            self.hierarchy = ClusterGraph(self.cells, constants['X'], constants['Y'],
+                                          constants['HPA_CLUSTER_SIZE'])
+        return self.hierarchy
+    
+    def get_jump_table(self):
+        """The JPS+ jump table of the grid, built on first use"""
+        if self.jump_table is None and "JPS+" in self.get_current_algorithm_name():
+            self.jump_table = JumpTable(self.cells, constants['X'], constants['Y'])
+        return self.jump_table
+    
+    def get_goal_bounds(self):
+        """Goal bounds loaded with the grid, or None once the walls have changed"""
+        if self.goal_bounds is not None and self.goal_bounds.stale():
+            self.goal_bounds = None  # Too slow to recompute here: see goalbounds.py
+        return self.goal_bounds
+    
+    def make_cache_key(self):
+        """Path cache key of the current query on the current walls"""
+        return self.path_cache.key(self.cells, self.get_current_algorithm_name(),
+                                   self.get_current_heuristic(), self.start_pos, self.goal_pos)
+    
     def start_search(self):
         """Start the pathfinding search"""
         if self.searching:
@@ -1426,242 +2435,122 @@ class PathfindingVisualizer:
         self.reset_search()
         self.searching = True
         self.stats['start_time'] = time.time()
+        self.scheduler.start()
+        
+        # Same query on the same walls: show the stored path at once. D* Lite
+        # always plans, since later edits are repaired through its session.
+        algorithm, heuristic = self.get_current_algorithm_name(), self.get_current_heuristic()
+        self.cache_key = self.make_cache_key()
+        cached = None if "D* Lite" in algorithm else self.path_cache.get(self.cache_key)
+        if cached is not None:
+            self.finished = True
+            self.path_found = bool(cached.path)
+            self.stats['visited'] = cached.expanded
+            self.trace_path(cached.path)
+            return
         
-        # Get current algorithm name
-        algo_name = self.get_current_algorithm_name()
+        if constants['SEARCH_WORKER'] and "D* Lite" not in algorithm and \
+                (heuristic is None or isinstance(heuristic, str)) and \
+                self.components.connected(self.start_pos, self.goal_pos):
+            # D* Lite replans on edits here, and ALT tables stay here: those run
+            # in-process, as do unreachable goals, which finish at once
+            self.worker = SearchWorker(self.cells, self.start_pos, self.goal_pos, algorithm, heuristic,
+                                       speed=SPEED_LEVELS[constants['SEARCH_SPEED']][1:],
+                                       cluster_size=constants['HPA_CLUSTER_SIZE'],
+                                       jump_table=self.get_jump_table(),
+                                       goal_bounds=self.get_goal_bounds(),
+                                       ida_table_size=constants['IDA_TABLE_SIZE'])
+            return
         
-        # Initialize based on selected algorithm
-        if "A*" in algo_name:
-            start_cell = self.cells[self.start_pos]
-            start_cell.g_cost = 0
-            start_cell.get_h(self.goal_pos)
-            start_cell.get_f()
-            self.open_set = [start_cell]
-            
-        elif "Dijkstra" in algo_name:
-            start_cell = self.cells[self.start_pos]
-            start_cell.g_cost = 0
-            self.open_set = [start_cell]
-            
-        elif "Breadth-First" in algo_name:
-            start_cell = self.cells[self.start_pos]
-            self.queue = deque([start_cell])
-            
-        elif "Depth-First" in algo_name:
-            start_cell = self.cells[self.start_pos]
-            self.stack = [start_cell]
-            
-        elif "Greedy" in algo_name:
-            start_cell = self.cells[self.start_pos]
-            start_cell.get_h(self.goal_pos)
-            self.open_set = [start_cell]
-            
-        elif "Bidirectional" in algo_name:
-            start_cell = self.cells[self.start_pos]
-            goal_cell = self.cells[self.goal_pos]
-            start_cell.g_cost = 0
-            start_cell.get_h(self.goal_pos)
-            start_cell.get_f()
-            goal_cell.g_cost = 0
-            goal_cell.get_h(self.start_pos)
-            goal_cell.get_f()
-            self.open_set_start = [start_cell]
-            self.open_set_goal = [goal_cell]
-            
-        elif "Jump Point" in algo_name:
-            start_cell = self.cells[self.start_pos]
-            start_cell.g_cost = 0
-            start_cell.get_h(self.goal_pos)
-            start_cell.get_f()
-            self.open_set = [start_cell]
-            
-        elif "IDA*" in algo_name:
-            start_cell = self.cells[self.start_pos]
-            start_cell.g_cost = 0
-            start_cell.get_h(self.goal_pos)
-            start_cell.get_f()
-            self.open_set = [start_cell]
-            self.ida_threshold = start_cell.h_cost
-            self.ida_next_threshold = float('inf')
-            
-        elif "Swarm" in algo_name:
-            start_cell = self.cells[self.start_pos]
-            start_cell.g_cost = 0
-            start_cell.get_h(self.goal_pos)
-            start_cell.get_f()
-            self.open_set = [start_cell]
-            self.pheromones = {}
+        self.session = SearchSession(self.cells, self.start_pos, self.goal_pos,
+                                     algorithm, heuristic, surface=self.grid_surf,
+                                     ida_table_size=constants['IDA_TABLE_SIZE'],
+                                     hierarchy=self.get_hierarchy(),
+                                     jump_table=self.get_jump_table(),
+                                     goal_bounds=self.get_goal_bounds(),
+                                     components=self.components)
     
     def update_search(self):
         """Update the search algorithm"""
         if not self.searching or self.paused or self.finished:
             return
         
-        # Control speed
-        if pygame.time.get_ticks() % max(1, 60 // constants['SEARCH_SPEED']) != 0:
-            return
-        
         # Update time
         self.stats['time'] = time.time() - self.stats['start_time']
         
-        # Get current algorithm name
-        algo_name = self.get_current_algorithm_name()
+        if self.worker is not None:
+            self.update_worker()
+            return
         
-        # Execute algorithm step
-        if "A*" in algo_name:
-            self.step_astar()
-        elif "Dijkstra" in algo_name:
-            self.step_dijkstra()
-        elif "Breadth-First" in algo_name:
-            self.step_bfs()
-        elif "Depth-First" in algo_name:
-            self.step_dfs()
-        elif "Greedy" in algo_name:
-            self.step_greedy()
-        elif "Bidirectional" in algo_name:
-            self.step_bidirectional()
-        elif "Jump Point" in algo_name:
-            self.step_jps()
-        elif "IDA*" in algo_name:
-            self.step_idastar()
-        elif "Swarm" in algo_name:
-            self.step_swarm()
-        else:
-            # Default to A*
-            self.step_astar()
+        # Execute as many steps as the scheduler allows this frame
+        self.sidebar_dirty = True  # Stats change
+        self.scheduler.run(self.session.step)
+        self.finished = self.session.finished
+        self.path_found = self.session.path_found
         
         # Update stats
-        if "Breadth-First" in algo_name or "Depth-First" in algo_name:
-            self.stats['visited'] = len(self.visited)
-        elif "Bidirectional" in algo_name:
-            self.stats['visited'] = len(self.closed_set_start) + len(self.closed_set_goal)
-        else:
-            self.stats['visited'] = len(self.closed_set)
-    
-    def step_astar(self):
-        """A* algorithm step"""
-        self.open_set, self.closed_set, current, self.finished, self.path_found = \
-            PathfindingAlgorithms.astar_step(
-                self.open_set, self.closed_set, self.goal_pos, self.cells, self.grid_surf
-            )
-        
-        if self.finished and self.path_found:
-            self.trace_path()
-    
-    def step_dijkstra(self):
-        """Dijkstra's algorithm step"""
-        self.open_set, self.closed_set, current, self.finished, self.path_found = \
-            PathfindingAlgorithms.dijkstra_step(
-                self.open_set, self.closed_set, self.goal_pos, self.cells, self.grid_surf
-            )
-        
-        if self.finished and self.path_found:
-            self.trace_path()
-    
-    def step_bfs(self):
-        """BFS algorithm step"""
-        self.queue, self.visited, current, self.finished, self.path_found = \
-            PathfindingAlgorithms.bfs_step(
-                self.queue, self.visited, self.goal_pos, self.cells, self.grid_surf
-            )
-        
-        if self.finished and self.path_found:
-            self.trace_path()
-    
-    def step_dfs(self):
-        """DFS algorithm step"""
-        self.stack, self.visited, current, self.finished, self.path_found = \
-            PathfindingAlgorithms.dfs_step(
-                self.stack, self.visited, self.goal_pos, self.cells, self.grid_surf
-            )
-        
-        if self.finished and self.path_found:
-            self.trace_path()
-    
-    def step_greedy(self):
-        """Greedy Best-First step"""
-        self.open_set, self.closed_set, current, self.finished, self.path_found = \
-            PathfindingAlgorithms.greedy_step(
-                self.open_set, self.closed_set, self.goal_pos, self.cells, self.grid_surf
-            )
-        
-        if self.finished and self.path_found:
-            self.trace_path()
-    
-    def step_bidirectional(self):
-        """Bidirectional Search step - FIXED"""
-        (self.open_set_start, self.open_set_goal, self.closed_set_start, 
-         self.closed_set_goal, current, meeting_cell, self.finished, self.path_found) = \
-            PathfindingAlgorithms.bidirectional_step(
-                self.open_set_start, self.open_set_goal, self.closed_set_start,
-                self.closed_set_goal, self.goal_pos, self.cells, self.grid_surf
-            )
-        
-        if self.finished and self.path_found and meeting_cell:
-            # Trace path from meeting cell to start
-            current = meeting_cell.parent
-            while current and current.pos != self.start_pos:
-                if current.status != 'start':
-                    current.update('path', self.grid_surf)
-                current = current.parent
-    
-    def step_jps(self):
-        """Jump Point Search step"""
-        self.open_set, self.closed_set, current, self.finished, self.path_found = \
-            PathfindingAlgorithms.jps_step(
-                self.open_set, self.closed_set, self.goal_pos, self.cells, self.grid_surf
-            )
+        self.stats['visited'] = self.session.expanded
         
         if self.finished and self.path_found:
             self.trace_path()
+        if self.finished and self.cache_key is not None:
+            session = self.session
+            self.path_cache.put(self.cache_key, SearchResult(
+                session.path(), session.cost(), session.expanded, self.stats['time']))
     
-    def step_idastar(self):
-        """IDA* Search step"""
-        (self.open_set, self.closed_set, current, self.finished, self.path_found, 
-         self.ida_threshold, self.ida_next_threshold) = \
-            PathfindingAlgorithms.idastar_step(
-                self.open_set, self.closed_set, self.goal_pos, self.cells, self.grid_surf,
-                self.ida_threshold, self.ida_next_threshold
-            )
+    def update_worker(self):
+        """Apply the background search's events; show its path once it has finished"""
+        self.sidebar_dirty = True
+        worker = self.worker
+        worker.poll(self.cells, self.grid_surf)
+        self.stats['visited'] = worker.expanded
+        if not worker.finished:
+            return
         
-        if self.finished:
-            if self.path_found:
-                self.trace_path()
-            else:
-                # Restart with new threshold
-                start_cell = self.cells[self.start_pos]
-                self.open_set = [start_cell]
-                self.closed_set = []
-                self.ida_threshold = self.ida_next_threshold
-                self.ida_next_threshold = float('inf')
-    
-    def step_swarm(self):
-        """Swarm Algorithm step"""
-        self.open_set, self.closed_set, current, self.finished, self.path_found = \
-            PathfindingAlgorithms.swarm_step(
-                self.open_set, self.closed_set, self.goal_pos, self.cells, self.grid_surf,
-                self.pheromones
-            )
+        if worker.error is not None:
+            # Keep the UI running: report the failure and drop the search
+            sys.stderr.write(worker.error)
+            self.reset_search()
+            self.worker_error = worker.error.strip().splitlines()[-1].split(':')[0]
+            return
         
-        if self.finished and self.path_found:
-            self.trace_path()
+        self.worker = None  # Its process has exited
+        self.finished = True
+        self.path_found, path, cost, expanded = worker.result
+        self.trace_path(path)
+        if self.cache_key is not None:
+            self.path_cache.put(self.cache_key, SearchResult(path, cost, expanded, self.stats['time']))
     
-    def trace_path(self):
-        """Trace and draw the found path"""
+    def trace_path(self, path=None):
+        """Trace and draw the found path (the session's unless path is given)"""
         if not self.path_found:
             return
         
-        current = self.cells[self.goal_pos].parent
+        if path is None:
+            path = self.session.path()
         path_length = 0
-        
-        while current and current.pos != self.start_pos:
+        for pos in path[1:-1]:
+            current = self.cells[pos]
             if current.status != 'start':
                 current.update('path', self.grid_surf)
                 path_length += 1
-            current = current.parent
         
         self.stats['path_length'] = path_length
     
+    def clear_path(self):
+        """Turn the drawn path back into closed cells"""
+        if self.session is None:
+            return
+        for pos in self.session.path()[1:-1]:
+            cell = self.cells[pos]
+            if cell.status == 'path':
+                cell.update('closed', self.grid_surf)
+        self.stats['path_length'] = 0
+    
+    def idle(self):
+        """True when nothing will change until the next event"""
+        return not self.drawing and (not self.searching or self.paused or self.finished)
+    
     def run(self):
         """Main game loop"""
         while True:
@@ -1670,11 +2559,15 @@ class PathfindingVisualizer:
             if self.searching and not self.paused:
                 self.update_search()
             
-            self.draw_grid()
-            self.draw_sidebar()
+            rects = self.draw_grid() + self.draw_sidebar()
+            if rects:
+                pygame.display.update(rects)
             
-            pygame.display.flip()
-            self.clock.tick(constants['FPS'])
+            if self.idle():
+                # Sleep until something happens instead of redrawing at FPS
+                pygame.event.post(pygame.event.wait())
+            else:
+                self.clock.tick(constants['FPS'])
 
 #------------ MAIN ------------
 
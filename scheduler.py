@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Frame-rate independent search stepping for pathfinder
+"""
+
+import time
+
+# Speed presets the visualizer's Speed +/- buttons move through:
+# (label, mode, value) with value in steps per second or ms per frame
+SPEED_LEVELS = [
+    ("5 steps/s", 'rate', 5),
+    ("15 steps/s", 'rate', 15),
+    ("30 steps/s", 'rate', 30),
+    ("60 steps/s", 'rate', 60),
+    ("120 steps/s", 'rate', 120),
+    ("300 steps/s", 'rate', 300),
+    ("1000 steps/s", 'rate', 1000),
+    ("max (12 ms/frame)", 'budget', 12),
+    ("instant", 'instant', None)
+]
+
+class StepScheduler:
+    """How many search steps to run in a frame.
+
+    In 'rate' mode steps are paced by the clock at value steps per
+    second: a frame runs as many as have come due since the last one,
+    carrying fractions over, so the rate holds at any frame rate. In
+    'budget' mode a frame steps until value milliseconds have passed. In
+    'instant' mode the first frame runs the search to the end. Pauses
+    should be followed by start(), so the time spent paused is not made
+    up for in one burst.
+    """
+    def __init__(self, mode='rate', value=30, clock=time.perf_counter, max_lag=0.25):
+        self.mode = mode
+        self.value = value
+        self.clock = clock
+        self.max_lag = max_lag  # Seconds of steps a slow frame may catch up on
+        self.start()
+
+    def set(self, mode, value):
+        self.mode = mode
+        self.value = value
+        self.start()
+
+    def start(self):
+        """Begin pacing from now"""
+        self.last = self.clock()
+        self.credit = 0.0
+
+    def run(self, step):
+        """Call step() (True once the search has finished) for one frame; returns the steps run"""
+        if self.mode == 'instant':
+            steps = 1
+            while not step():
+                steps += 1
+            return steps
+
+        if self.mode == 'budget':
+            deadline = self.clock() + self.value / 1000
+            steps = 1
+            while not step() and self.clock() < deadline:
+                steps += 1
+            return steps
+
+        now = self.clock()
+        self.credit = min(self.credit + (now - self.last) * self.value, self.max_lag * self.value)
+        self.last = now
+        steps = 0
+        while self.credit >= 1:
+            self.credit -= 1
+            steps += 1
+            if step():
+                break
+        return steps
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Process pools over shared-memory walls for pathfinder
+"""
+
+import gc
+import os
+from contextlib import contextmanager
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+# Per-process state set up by _init_worker
+worker_state = {}
+
+def _init_worker(name, width, height, setup, args):
+    """Read the shared walls and run setup on them, once per process"""
+    block = shared_memory.SharedMemory(name=name)
+    blocked = np.ndarray((height, width), dtype=np.uint8, buffer=block.buf).copy()
+    block.close()
+    worker_state.update(setup(blocked, *args))
+    # Everything alive now (the setup's state, and whatever a forked
+    # worker inherited) lives as long as the process: keep the collector off it
+    gc.freeze()
+
+@contextmanager
+def walls_pool(blocked, setup, args=(), processes=None):
+    """Process pool whose workers start from a (height, width) walls array.
+
+    blocked (nonzero where a cell is blocked) is copied once into a
+    SharedMemory block, unlinked when the pool closes. Each worker runs
+    setup(blocked, *args), which must be a module-level function, and
+    keeps the dict it returns in worker_state, so tasks only need to
+    carry their own arguments.
+    """
+    height, width = blocked.shape
+    block = shared_memory.SharedMemory(create=True, size=width * height)
+    try:
+        np.ndarray((height, width), dtype=np.uint8, buffer=block.buf)[:] = blocked != 0
+        with Pool(processes or os.cpu_count(), _init_worker,
+                  (block.name, width, height, setup, args)) as pool:
+            yield pool
+    finally:
+        block.close()
+        block.unlink()
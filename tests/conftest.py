@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Shared grids for the pathfinder tests
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Cell_2D import make_grid  # noqa: E402
+from main import constants  # noqa: E402
+
+def random_grid(width, height, density, rng):
+    """A width x height cell grid with walls placed through Cell.update"""
+    grid = make_grid(dict(constants, X=width, Y=height))
+    for cell in grid.values():
+        if rng.random() < density:
+            cell.update('blocked', None)
+    return grid
+
+def free_cells(grid):
+    return [pos for pos, cell in grid.items() if cell.status != 'blocked']
+
+def path_cost(path):
+    """Cost of a list of positions at 10 per straight and 14 per diagonal move"""
+    return sum(14 if a[0] != b[0] and a[1] != b[1] else 10 for a, b in zip(path, path[1:]))
+
+def wall_in(grid, pos):
+    """Block every neighbour of pos, so that no path reaches it"""
+    for other in grid[pos].get_neighbour_coords():
+        grid[other].update('blocked', None)
+
+def toggle(grid, pos):
+    """Block or unblock the cell at pos, as the visualizer's mouse does"""
+    cell = grid[pos]
+    cell.update('empty' if cell.status == 'blocked' else 'blocked', None)
+
+@pytest.fixture
+def rng():
+    return random.Random(12345)
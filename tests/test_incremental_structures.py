@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Structures kept up to date on edits must match a fresh rebuild
+"""
+
+from collections import deque
+
+from cache import PathCache
+from conftest import free_cells, path_cost, random_grid, toggle
+from Cell_2D import DIRECTIONS
+from connectivity import ComponentIndex
+from hierarchical import ClusterGraph
+from incremental import DStarLite
+from jpsplus import JumpTable
+from main import solve
+
+def flood_fill_partition(grid, width, height):
+    """Walkable cells grouped into components by breadth-first search"""
+    seen = set()
+    components = []
+    for pos in free_cells(grid):
+        if pos in seen:
+            continue
+        seen.add(pos)
+        component = {pos}
+        queue = deque([pos])
+        while queue:
+            x, y = queue.popleft()
+            for dx, dy in DIRECTIONS:
+                other = (x + dx, y + dy)
+                if other in grid and other not in seen and grid[other].status != 'blocked':
+                    seen.add(other)
+                    component.add(other)
+                    queue.append(other)
+        components.append(frozenset(component))
+    return set(components)
+
+def index_partition(index, grid):
+    components = {}
+    for pos in free_cells(grid):
+        components.setdefault(index.component(pos), set()).add(pos)
+    return {frozenset(component) for component in components.values()}
+
+def test_components_match_flood_fill(rng):
+    for density in (0.2, 0.3, 0.45, 0.55):
+        grid = random_grid(24, 20, density, rng)
+        index = ComponentIndex(grid, 24, 20)
+        for _ in range(500):
+            pos = (rng.randrange(24), rng.randrange(20))
+            toggle(grid, pos)
+            index.update_cell(pos)
+            assert index_partition(index, grid) == flood_fill_partition(grid, 24, 20)
+        assert index.count() == len(flood_fill_partition(grid, 24, 20))
+
+def test_jump_table_updates_match_rebuild(rng):
+    grid = random_grid(20, 16, 0.3, rng)
+    table = JumpTable(grid, 20, 16)
+    for _ in range(150):
+        pos = (rng.randrange(20), rng.randrange(16))
+        toggle(grid, pos)
+        table.update_cell(pos)
+        assert table.distances == JumpTable(grid, 20, 16).distances
+
+def graph_state(graph):
+    crossings = {pos: dict(edges) for pos, edges in graph.crossings.items() if edges}
+    return graph.borders, crossings, graph.nodes, graph.intra
+
+def test_cluster_graph_updates_match_rebuild(rng):
+    grid = random_grid(23, 17, 0.3, rng)
+    graph = ClusterGraph(grid, 23, 17, 5)
+    for _ in range(150):
+        pos = (rng.randrange(23), rng.randrange(17))
+        toggle(grid, pos)
+        graph.update_cell(pos)
+        assert graph_state(graph) == graph_state(ClusterGraph(grid, 23, 17, 5))
+
+def test_dstar_lite_repairs_match_fresh_search(rng):
+    for _ in range(4):
+        grid = random_grid(22, 18, 0.3, rng)
+        start, goal = rng.sample(free_cells(grid), 2)
+        planner = DStarLite(grid, start, goal)
+        planner.plan()
+        for _ in range(40):
+            pos = (rng.randrange(22), rng.randrange(18))
+            if pos in (start, goal):
+                continue
+            toggle(grid, pos)
+            planner.update_cell(pos)
+            path = planner.plan()
+            expected = solve(grid, start, goal, "Dijkstra's Algorithm")
+            assert path_cost(path) == (expected.cost if expected.path else 0)
+            assert bool(path) == bool(expected.path)
+
+def test_dstar_lite_start_moves_match_fresh_search(rng):
+    for _ in range(4):
+        grid = random_grid(22, 18, 0.25, rng)
+        free = free_cells(grid)
+        start, goal = rng.sample(free, 2)
+        planner = DStarLite(grid, start, goal)
+        planner.plan()
+        for _ in range(30):
+            start = rng.choice([pos for pos in free if pos != goal])
+            planner.move_start(start)
+            pos = (rng.randrange(22), rng.randrange(18))
+            if pos not in (start, goal):
+                toggle(grid, pos)
+                planner.update_cell(pos)
+                free = free_cells(grid)
+            path = planner.plan()
+            expected = solve(grid, start, goal, "Dijkstra's Algorithm")
+            assert path_cost(path) == (expected.cost if expected.path else 0)
+            assert bool(path) == bool(expected.path)
+
+def test_path_cache_misses_after_wall_edits(rng):
+    grid = random_grid(20, 16, 0.2, rng)
+    cache = PathCache()
+    for _ in range(60):
+        start, goal = rng.sample(free_cells(grid), 2)
+        first = solve(grid, start, goal, cache=cache)
+        assert solve(grid, start, goal, cache=cache) is first
+        
+        # Block a cell on the path, then unblock it: both edits must miss
+        pos = rng.choice(first.path[1:-1] or [p for p in grid if p not in (start, goal)])
+        for _ in range(2):
+            toggle(grid, pos)
+            misses = cache.misses
+            result = solve(grid, start, goal, cache=cache)
+            assert cache.misses == misses + 1
+            assert result.cost == solve(grid, start, goal, "Dijkstra's Algorithm").cost
+        assert result.cost == first.cost
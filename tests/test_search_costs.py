@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Accelerated and memory-bounded searches must agree with Dijkstra on random grids
+"""
+
+from conftest import free_cells, path_cost, random_grid, toggle, wall_in
+from flowfield import FlowField
+from hierarchical import ClusterGraph
+from jpsplus import JumpTable
+from jumpscan import JumpScanner
+from landmarks import Landmarks
+from Cell_2D import DIRECTIONS, blocked_array
+from main import BucketQueue, PathfindingAlgorithms, solve
+
+def queries(grid, rng, count):
+    free = free_cells(grid)
+    return [tuple(rng.sample(free, 2)) for _ in range(count)]
+
+def test_jump_scans_match_cell_by_cell_scans(rng):
+    for density in (0.0, 0.2, 0.4):
+        grid = random_grid(19, 15, density, rng)
+        scanner, table = JumpScanner(blocked_array(grid)), JumpTable(grid, 19, 15)
+        free = free_cells(grid)
+        for _ in range(300):
+            pos, goal = rng.choice(free), rng.choice(free)
+            for dx, dy in DIRECTIONS:
+                expected = PathfindingAlgorithms.jps_jump(pos, dx, dy, goal, grid)
+                assert scanner.jump(pos, dx, dy, goal) == expected
+                assert table.jump(pos, dx, dy, goal) == expected
+
+def test_jps_costs_match_dijkstra(rng):
+    for density in (0.0, 0.1, 0.2, 0.3, 0.4):
+        grid = random_grid(30, 24, density, rng)
+        table = JumpTable(grid, 30, 24)
+        for start, goal in queries(grid, rng, 25):
+            expected = solve(grid, start, goal, "Dijkstra's Algorithm").cost
+            assert solve(grid, start, goal, "Jump Point Search").cost == expected
+            assert solve(grid, start, goal, "JPS+ Search", jump_table=table).cost == expected
+
+def test_hpa_finds_paths_no_shorter_than_dijkstra(rng):
+    for density in (0.1, 0.3):
+        grid = random_grid(30, 24, density, rng)
+        hierarchy = ClusterGraph(grid, 30, 24, 6)
+        for start, goal in queries(grid, rng, 25):
+            expected = solve(grid, start, goal, "Dijkstra's Algorithm")
+            result = solve(grid, start, goal, "HPA* Search", hierarchy=hierarchy)
+            assert bool(result.path) == bool(expected.path)
+            assert result.cost >= expected.cost
+
+def test_alt_costs_match_dijkstra(rng):
+    for density in (0.1, 0.3, 0.45):
+        grid = random_grid(30, 24, density, rng)
+        landmarks = Landmarks(grid, 30, 24, 4)
+        bounds = landmarks.lookup(30, 24)
+        for start, goal in queries(grid, rng, 25):
+            expected = solve(grid, start, goal, "Dijkstra's Algorithm").cost
+            assert solve(grid, start, goal, "A* Search", landmarks).cost == expected
+            table = landmarks.table(goal, 30, 24)
+            assert bounds(start, goal) == table[start[1], start[0]] <= expected
+
+def test_bidirectional_costs_match_dijkstra(rng):
+    for density in (0.0, 0.1, 0.2, 0.3, 0.4, 0.5):
+        grid = random_grid(30, 24, density, rng)
+        for start, goal in queries(grid, rng, 25):
+            expected = solve(grid, start, goal, "Dijkstra's Algorithm")
+            result = solve(grid, start, goal, "Bidirectional Search")
+            assert result.cost == expected.cost
+            assert bool(result.path) == bool(expected.path)
+            if result.path:
+                assert (result.path[0], result.path[-1]) == (start, goal)
+
+def test_bidirectional_edge_cases(rng):
+    grid = random_grid(12, 10, 0.2, rng)
+    start = free_cells(grid)[0]
+    result = solve(grid, start, start, "Bidirectional Search")
+    assert result.path == [start] and result.cost == 0
+    
+    goal = (10, 8)
+    wall_in(grid, goal)
+    grid[goal].update('empty', None)
+    start = free_cells(grid)[0]
+    result = solve(grid, start, goal, "Bidirectional Search")
+    assert result.path == [] and result.cost == float('inf')
+
+def test_flow_field_costs_match_dijkstra(rng):
+    for density in (0.0, 0.2, 0.4):
+        grid = random_grid(20, 16, density, rng)
+        free = free_cells(grid)
+        for goal in rng.sample(free, 3):
+            field = FlowField(grid, goal, 20, 16)
+            for start in rng.sample(free, 30):
+                expected = solve(grid, start, goal, "Dijkstra's Algorithm")
+                assert field.cost(start) == expected.cost
+                path = field.path(start)
+                assert bool(path) == bool(expected.path)
+                if path:
+                    assert (path[0], path[-1]) == (start, goal)
+                    assert path_cost(path) == expected.cost
+            assert not field.stale()
+            toggle(grid, next(pos for pos in grid if pos != goal))
+            assert field.stale()
+            toggle(grid, next(pos for pos in grid if pos != goal))
+
+def test_bucket_queue_pops_lowest_key(rng):
+    keys = {}
+    queue = BucketQueue(key=keys.__getitem__)
+    last = 0
+    for item in range(3000):
+        # Keys within max_step of the last pop, with some cells re-pushed lower
+        if keys and rng.random() < 0.2:
+            queued = [other for other in queue if keys[other] > last]
+            if queued:
+                item = rng.choice(queued)
+                keys[item] = rng.randint(last, keys[item] - 1)
+                queue.push(item)
+                continue
+        keys[item] = last + rng.randint(0, 14)
+        queue.push(item)
+        if rng.random() < 0.5:
+            lowest = min(keys[other] for other in queue)
+            popped = queue.pop()
+            assert keys[popped] == lowest
+            last = lowest
+    while queue:
+        popped = queue.pop()
+        assert keys[popped] >= last
+        last = keys[popped]
+
+def test_dial_costs_match_dijkstra(rng):
+    for density in (0.0, 0.2, 0.4, 0.5):
+        grid = random_grid(30, 24, density, rng)
+        for start, goal in queries(grid, rng, 25):
+            expected = solve(grid, start, goal, "Dijkstra's Algorithm")
+            result = solve(grid, start, goal, "Dial's Algorithm")
+            assert result.cost == expected.cost
+            assert bool(result.path) == bool(expected.path)
+
+def test_ida_star_costs_match_dijkstra(rng):
+    for density in (0.0, 0.2, 0.35):
+        grid = random_grid(12, 10, density, rng)
+        for start, goal in queries(grid, rng, 10):
+            expected = solve(grid, start, goal, "Dijkstra's Algorithm")
+            if not expected.path:
+                continue  # Without a table IDA* tries every path before giving up
+            for table_size in (0, 40, 1000):
+                result = solve(grid, start, goal, "IDA* Search", ida_table_size=table_size)
+                assert result.cost == expected.cost
+
+def test_ida_star_reports_unreachable_goal(rng):
+    grid = random_grid(7, 6, 0.1, rng)
+    start, goal = (0, 0), (5, 4)
+    wall_in(grid, goal)
+    grid[start].update('empty', None)
+    result = solve(grid, start, goal, "IDA* Search", ida_table_size=1000)
+    assert result.path == [] and result.cost == float('inf')
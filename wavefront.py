@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized breadth-first wavefronts for pathfinder
+"""
+
+import numpy as np
+
+from Cell_2D import blocked_array
+
+# Steps back along a path, straight ones first so paths prefer 10-cost moves
+BACK_STEPS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+def dilate(mask):
+    """mask grown by one cell in all 8 directions (a 3x3 dilation)"""
+    # The 3x3 square is a row pass then a column pass: 4 shifted ORs, not 8
+    rows = mask.copy()
+    rows[:, 1:] |= mask[:, :-1]
+    rows[:, :-1] |= mask[:, 1:]
+    grown = rows.copy()
+    grown[1:] |= rows[:-1]
+    grown[:-1] |= rows[1:]
+    return grown
+
+class Wavefront:
+    """Unit-cost breadth-first search over a boolean occupancy array.
+
+    The frontier is a (height, width) boolean array; step() grows it by
+    one layer with a handful of whole-array operations instead of one
+    Python-level expansion per cell. layer holds the BFS depth (moves
+    from start, 8-connected) of every reached cell and -1 elsewhere.
+    Walls are read from cells once, when the wavefront is created.
+    """
+    def __init__(self, cells, start, width, height):
+        self.start = start
+        self.width = width
+        self.height = height
+        self.open = blocked_array(cells) == 0
+        self.layer = np.full((height, width), -1, dtype=np.int32)
+        self.frontier = np.zeros((height, width), dtype=bool)
+        self.frontier[start[1], start[0]] = True
+        self.reached = self.frontier.copy()
+        self.layer[start[1], start[0]] = 0
+        self.depth = 0
+
+    @property
+    def done(self):
+        return not self.frontier.any()
+
+    def step(self):
+        """Grow the wavefront by one layer; returns the newly reached cells as a mask"""
+        new = dilate(self.frontier)
+        new &= self.open
+        new &= ~self.reached
+        self.depth += 1
+        self.layer[new] = self.depth
+        self.reached |= new
+        self.frontier = new
+        return new
+
+    def run(self):
+        """Grow until nothing new is reached; returns the layer array"""
+        while not self.done:
+            self.step()
+        return self.layer
+
+    @staticmethod
+    def positions(mask):
+        """(x, y) positions of the True cells of a mask"""
+        ys, xs = np.nonzero(mask)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def depth_at(self, pos):
+        return int(self.layer[pos[1], pos[0]])
+
+    def path(self, goal):
+        """Positions from start to goal, or [] if goal has not been reached"""
+        depth = self.depth_at(goal)
+        if depth < 0:
+            return []
+        layer, width, height = self.layer, self.width, self.height
+        path = [goal]
+        x, y = goal
+        while depth > 0:
+            depth -= 1
+            for dx, dy in BACK_STEPS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and layer[ny, nx] == depth:
+                    x, y = nx, ny
+                    break
+            path.append((x, y))
+        path.reverse()
+        return path
+
+def distance_map(cells, start, width, height):
+    """(height, width) array of BFS depths from start, -1 where unreachable"""
+    return Wavefront(cells, start, width, height).run()
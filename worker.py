@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Background search worker for pathfinder
+"""
+
+import multiprocessing
+import queue
+import time
+import traceback
+
+import numpy as np
+import pygame
+
+from Cell_2D import PALETTE, PALETTE_CODES, TARGET_CODE, blocked_array
+from goalbounds import GoalBounds
+from grid_array import BLOCKED, ArrayGrid
+from hierarchical import ClusterGraph
+from jpsplus import JumpTable
+from scheduler import StepScheduler
+
+# Palette code -> status, for applying events to the visualizer's cells
+CODE_STATUSES = {code: status for status, code in PALETTE_CODES.items()}
+CODE_STATUSES[TARGET_CODE] = 'target'
+
+TICK = 1 / 60  # Seconds between event batches
+
+def _search_process(blocked, start, goal, algorithm, heuristic, options, tables, speed, events, controls):
+    """Run one search on a snapshot of the walls, streaming what it repaints"""
+    from main import SearchSession, constants  # main imports this module
+    try:
+        height, width = blocked.shape
+        grid = ArrayGrid(dict(constants, X=width, Y=height),
+                         np.where(blocked.ravel() != 0, BLOCKED, 0).astype(np.uint8))
+        # Prebuilt tables arrive as their arrays and are wrapped around the snapshot
+        cluster_size, distances, boxes = tables
+        if "HPA*" in algorithm:
+            options['hierarchy'] = ClusterGraph(grid, width, height, cluster_size)
+        if distances is not None:
+            options['jump_table'] = JumpTable(grid, width, height, distances)
+        if boxes is not None:
+            options['goal_bounds'] = GoalBounds(grid, width, height, boxes=boxes)
+        grid[start].status = 'start'
+        grid[goal].status = 'target'
+        grid[goal].istarget = True
+        # Cells record palette codes instead of drawing, so the surface is
+        # never drawn on; it only turns repainting on
+        codes = np.where(blocked != 0, PALETTE.index('BLOCK_COL'), PALETTE.index('EMPTY_COL')).astype(np.uint8)
+        codes[start[1], start[0]] = PALETTE_CODES['start']
+        codes[goal[1], goal[0]] = TARGET_CODE
+        grid.table.codes = codes
+        shown = codes.ravel().copy()
+
+        session = SearchSession(grid, start, goal, algorithm, heuristic, surface=pygame.Surface((1, 1)),
+                                **options)
+        scheduler = StepScheduler(*speed)
+        paused = False
+        while True:
+            tick = time.perf_counter()
+            try:
+                while True:
+                    message = controls.get_nowait()
+                    if message[0] == 'stop':
+                        return
+                    if message[0] == 'pause':
+                        paused = message[1]
+                    elif message[0] == 'speed':
+                        scheduler.set(*message[1:])
+                    scheduler.start()
+            except queue.Empty:
+                pass
+
+            if not paused:
+                scheduler.run(session.step)
+                current = codes.ravel()
+                changed = np.flatnonzero(current != shown)
+                if len(changed):
+                    shown[changed] = current[changed]
+                    events.put(('events', changed.astype(np.int32).tobytes(), current[changed].tobytes(),
+                                session.expanded))
+                if session.finished:
+                    events.put(('done', session.path_found, session.path(), session.cost(), session.expanded))
+                    return
+            time.sleep(max(0, TICK - (time.perf_counter() - tick)))
+    except Exception:
+        events.put(('error', traceback.format_exc()))
+
+class SearchWorker:
+    """A search running in another process against a snapshot of the walls.
+
+    The process repaints its own copy of the grid and, about every TICK
+    seconds, puts the cells that changed on an event queue as two byte
+    strings: int32 flat indices and their palette codes. poll() drains
+    the queue and applies the events to the caller's cells in one batch.
+    pause(), set_speed() and stop() go to the process as control
+    messages; speed is a StepScheduler (mode, value). heuristic must be
+    picklable (a HEURISTICS name); options go to SearchSession. HPA*
+    builds its hierarchy with cluster_size clusters; a JumpTable and
+    GoalBounds of cells are sent as their arrays instead of rebuilt.
+    If the search raises, finished is set and error holds the traceback.
+    """
+    def __init__(self, cells, start, goal, algorithm, heuristic=None, speed=('rate', 30),
+                 cluster_size=10, jump_table=None, goal_bounds=None, **options):
+        self.width = next(iter(cells.values())).table.X
+        self.events = multiprocessing.Queue()
+        self.controls = multiprocessing.Queue()
+        self.expanded = 0
+        self.finished = False
+        self.result = None  # (path_found, path, cost, expanded) once finished
+        self.error = None
+        tables = (cluster_size,
+                  jump_table.distances if jump_table is not None and "JPS+" in algorithm else None,
+                  goal_bounds.boxes if goal_bounds is not None else None)
+        self.process = multiprocessing.Process(
+            target=_search_process, daemon=True,
+            args=(blocked_array(cells), start, goal, algorithm, heuristic, options, tables, speed,
+                  self.events, self.controls))
+        self.process.start()
+
+    def poll(self, cells, surface, limit=None):
+        """Apply the queued events to cells (drawing on surface); returns the number of cells changed"""
+        changed = 0
+        while limit is None or changed < limit:
+            try:
+                message = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == 'events':
+                _, indices, codes, self.expanded = message
+                for index, code in zip(np.frombuffer(indices, dtype=np.int32).tolist(), codes):
+                    cells[(index % self.width, index // self.width)].update(CODE_STATUSES[code], surface)
+                changed += len(codes)
+            elif message[0] == 'done':
+                self.result = message[1:]
+                self.expanded = message[4]
+                self.finished = True
+            else:
+                self.error = message[1]
+                self.finished = True
+        return changed
+
+    def pause(self, paused):
+        self.controls.put(('pause', paused))
+
+    def set_speed(self, mode, value):
+        self.controls.put(('speed', mode, value))
+
+    def stop(self):
+        """Ask the process to stop and wait for it"""
+        if self.process.is_alive():
+            self.controls.put(('stop',))
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.events.cancel_join_thread()